@@ -1,33 +1,47 @@
 # app/api/v1/endpoints/auth.py
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, Request, status, Depends
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlmodel import select
 from datetime import timedelta
+from uuid import UUID
+from jose import JWTError
 from app.models.users import User
 from app.database.session import get_db
 from app.schemas.users import UserRead, UserCreate
 from app.schemas.auth import Token
-from app.core.security import get_password_hash, verify_password, create_access_token, create_refresh_token
-from app.core.config import settings
+from app.core.security import create_access_token, create_refresh_token, verify_token
 from app.services.user_service import UserService
+from app.services.login_throttle import LoginThrottle, get_login_throttle
+from app.services.password_hasher import get_password_hasher
 
 auth_router = APIRouter()
 
 @auth_router.post("/login", response_model=Token)
-async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_db)):
-    result = await db.execute(
-        select(User).where(
-            (User.email == form_data.username) | (User.username == form_data.username)
-        )
-    )
-    user = result.scalar_one_or_none()
-    if not user or not verify_password(form_data.password, user.password):
+async def login_for_access_token(
+    request: Request,
+    form_data: OAuth2PasswordRequestForm = Depends(),
+    db: AsyncSession = Depends(get_db),
+    throttle: LoginThrottle = Depends(get_login_throttle),
+):
+    client_ip = request.client.host if request.client else None
+    # Counted before the lookup and bcrypt; locked-out identifiers and IPs are refused here.
+    # A failed attempt needs no further bookkeeping
+    attempted_at = await throttle.acquire(form_data.username, client_ip)
+    try:
+        user = await UserService.authenticate_user(db, form_data.username, form_data.password)
+    except Exception:
+        # Not a wrong password but a server-side failure (hasher 503, database error):
+        # it must not use up the user's attempts
+        await throttle.release(form_data.username, client_ip, attempted_at)
+        raise
+    if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    await throttle.record_success(form_data.username, client_ip, attempted_at)
     # Convert user.id (which is a UUID object) to a string using str()
     user_id_str = str(user.id)
     access_token = create_access_token(data={"sub": user_id_str})
@@ -37,34 +51,35 @@ async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(
 @auth_router.post("/register", response_model=UserRead)
 async def register(user_in: UserCreate, db: AsyncSession = Depends(get_db)):
     # Check if email already exists
-    result = await db.execute(select(User).where(User.email == user_in.email))
-    if result.scalar_one_or_none():
+    if await UserService.get_user_by_email(db, user_in.email):
         raise HTTPException(400, "Email already registered")
+    # Usernames are unique regardless of case; the default one (e-mail local part) gets a number if taken
+    if user_in.username:
+        if await UserService.username_taken(db, user_in.username):
+            raise HTTPException(400, "Username already taken")
+        username = user_in.username
+    else:
+        username = await UserService.available_username(db, user_in.email.split("@")[0])
 
-    hashed_password = get_password_hash(user_in.password)
+    hashed_password = await get_password_hasher().hash(user_in.password)
     user = User(
         email=user_in.email,
-        username=user_in.username or user_in.email.split("@")[0],
+        username=username,
         password=hashed_password,
         first_name=user_in.first_name,
         last_name=user_in.last_name,
     )
     db.add(user)
-    await db.commit()
-    await db.refresh(user)
-    return user
+    return await UserService.commit_user(db, user)
 
 
 @auth_router.post("/refresh")
 async def refresh_token(refresh_token: str, db: AsyncSession = Depends(get_db)):
     # Simple validation (you can expand with blacklist)
-    from jose import jwt, JWTError
     try:
-        payload = jwt.decode(refresh_token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        if payload.get("type") != "refresh":
-            raise HTTPException(status_code=401, detail="Invalid refresh token")
-        user_id = int(payload["sub"])
-    except JWTError:
+        payload = verify_token(refresh_token, "refresh")
+        user_id = UUID(payload["sub"])
+    except (JWTError, KeyError, TypeError, ValueError):
         raise HTTPException(status_code=401, detail="Invalid refresh token")
 
     result = await db.execute(select(User).where(User.id == user_id))
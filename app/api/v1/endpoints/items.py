@@ -1,21 +1,99 @@
-from unittest import result
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, Response, status
 from fastapi.exceptions import HTTPException
-from sqlmodel import select
+from sqlalchemy import tuple_
+from sqlmodel import select, desc
 from sqlmodel.ext.asyncio.session import AsyncSession
-from typing import List
-from app.database.session import get_db
+from typing import Any, Optional, Tuple
+from app.database.session import get_db, get_read_db
 from app.models.items import Item
-from app.schemas.items import ItemCreate, ItemRead, ItemUpdate
+from app.schemas.items import ItemCreate, ItemPage, ItemRead, ItemSort, ItemUpdate
+from app.utils.pagination import encode_cursor, decode_cursor
+from app.utils.serialization import validate_rows
 
 item_router = APIRouter()
 
-@item_router.get("/", response_model=List[ItemRead], status_code=status.HTTP_200_OK)
-async def get_items(db: AsyncSession = Depends(get_db)):
-  """ Get all items """
-  result = await db.execute(select(Item))
-  items = result.scalars().all()
-  return items
+ITEM_COLUMNS = (Item.id, Item.name, Item.description, Item.price)
+
+# Sort column and direction for each listing order; each has an (column, id) index
+SORT_ORDERS = {
+  ItemSort.name: (Item.name, False),
+  ItemSort.name_desc: (Item.name, True),
+  ItemSort.price: (Item.price, False),
+  ItemSort.price_desc: (Item.price, True),
+}
+
+@item_router.get("/", response_model=ItemPage, status_code=status.HTTP_200_OK)
+async def get_items(
+  limit: int = Query(20, ge=1, le=100),
+  cursor: Optional[str] = Query(None, description="next_cursor returned by the previous page"),
+  sort: ItemSort = Query(ItemSort.name),
+  min_price: Optional[float] = Query(None, ge=0),
+  max_price: Optional[float] = Query(None, ge=0),
+  name_prefix: Optional[str] = Query(None, min_length=1, max_length=100, description="Case-sensitive"),
+  db: AsyncSession = Depends(get_read_db)
+) -> Response:
+  """ List items, filtered by price range and name prefix, one page at a time """
+  if min_price is not None and max_price is not None and min_price > max_price:
+    raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="min_price is greater than max_price")
+
+  column, descending = SORT_ORDERS[sort]
+  statement = select(*ITEM_COLUMNS)
+  if min_price is not None:
+    statement = statement.where(Item.price >= min_price)
+  if max_price is not None:
+    statement = statement.where(Item.price <= max_price)
+  if name_prefix:
+    # The range lets an index serve the filter; LIKE keeps the match exact. The range is in
+    # code point order: SQLite's default BINARY collation, but PostgreSQL compares text with
+    # the database collation, so there it uses the byte-wise operators of text_pattern_ops
+    # (served by ix_item_name_pattern)
+    at_least, below = ("~>=~", "~<~") if db.get_bind().dialect.name == "postgresql" else (">=", "<")
+    statement = statement.where(
+      Item.name.op(at_least, is_comparison=True)(name_prefix), Item.name.startswith(name_prefix, autoescape=True)
+    )
+    upper_bound = _prefix_upper_bound(name_prefix)
+    if upper_bound is not None:
+      statement = statement.where(Item.name.op(below, is_comparison=True)(upper_bound))
+  if cursor:
+    sort_key = tuple_(column, Item.id)
+    last_key = _parse_item_cursor(cursor, sort)
+    statement = statement.where(sort_key < last_key if descending else sort_key > last_key)
+
+  order_by = (desc(column), desc(Item.id)) if descending else (column, Item.id)
+  result = await db.execute(statement.order_by(*order_by).limit(limit + 1))
+  rows = result.all()
+
+  items = validate_rows(ItemRead, rows[:limit])
+  next_cursor = None
+  if len(rows) > limit:
+    last = items[-1]
+    next_cursor = encode_cursor({"sort": sort.value, "value": getattr(last, column.key), "id": last.id})
+
+  page = ItemPage(items=items, next_cursor=next_cursor)
+  return Response(content=page.model_dump_json(), media_type="application/json")
+
+
+def _prefix_upper_bound(prefix: str) -> Optional[str]:
+  """ Smallest string greater than every string starting with prefix (code point order, i.e. UTF-8 byte order) """
+  while prefix and prefix[-1] == "\U0010ffff":
+    prefix = prefix[:-1]
+  if not prefix:
+    return None
+  return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+def _parse_item_cursor(cursor: str, sort: ItemSort) -> Tuple[Any, int]:
+  values = decode_cursor(cursor)
+  value, item_id = values.get("value"), values.get("id")
+  expected_type = str if sort in (ItemSort.name, ItemSort.name_desc) else (int, float)
+  if (
+    values.get("sort") != sort.value
+    or not isinstance(value, expected_type) or isinstance(value, bool)
+    or not isinstance(item_id, int) or isinstance(item_id, bool)
+  ):
+    raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+  return value, item_id
+
 
 @item_router.post("/", response_model=ItemRead, status_code=status.HTTP_201_CREATED)
 async def create_item(item: ItemCreate, db: AsyncSession = Depends(get_db)) -> Item:
@@ -25,4 +103,29 @@ async def create_item(item: ItemCreate, db: AsyncSession = Depends(get_db)) -> I
   db.add(db_item)
   await db.commit()
   await db.refresh(db_item)
-  return db_item
\ No newline at end of file
+  return db_item
+
+
+@item_router.get("/{item_id}", response_model=ItemRead, status_code=status.HTTP_200_OK)
+async def get_item(item_id: int, db: AsyncSession = Depends(get_read_db)) -> Item:
+  """ Get a single item """
+  item = await db.get(Item, item_id)
+  if not item:
+    raise HTTPException(status_code=404, detail="Item not found")
+  return item
+
+
+@item_router.patch("/{item_id}", response_model=ItemRead, status_code=status.HTTP_200_OK)
+async def update_item(item_id: int, item_update: ItemUpdate, db: AsyncSession = Depends(get_db)) -> Item:
+  """ Update the given fields of an item """
+  item = await db.get(Item, item_id)
+  if not item:
+    raise HTTPException(status_code=404, detail="Item not found")
+  changes = item_update.model_dump(exclude_unset=True)
+  if any(changes.get(field, "") is None for field in ("name", "price")):
+    raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="name and price cannot be null")
+  for field, value in changes.items():
+    setattr(item, field, value)
+  await db.commit()
+  await db.refresh(item)
+  return item
@@ -1,81 +1,200 @@
 from uuid import UUID
-from datetime import date
+from datetime import datetime
 
-from fastapi import APIRouter, Depends, status, HTTPException, UploadFile, File, Form
+from fastapi import APIRouter, Depends, status, HTTPException, UploadFile, File, Form, Query, Request, Response
+from sqlalchemy import true, tuple_
 from sqlmodel import select, desc
 from sqlmodel.ext.asyncio.session import AsyncSession
-from imagekitio.models.UploadFileRequestOptions import UploadFileRequestOptions
-from typing import List
+from typing import List, Optional, Tuple
 
-from app.database.session import get_db
+from app.core.auth import get_current_staff_user, get_current_superuser
+from app.core.compression import get_response_compressor
+from app.core.config import settings
+from app.database.session import get_db, get_read_db, AsyncReadSessionLocal
+from app.models.users import User
 from app.models.news import News
-from app.schemas.news import NewsCreate, NewsRead
-from app.utils.preview_text_generator import generate_excerpt
+from app.schemas.imports import ImportReport
+from app.schemas.news import NewsCreate, NewsRead, NewsPage, NewsSummary, NewsSearchResult
+from app.utils.export import ExportFormat, export_response, schema_columns
+from app.utils.fieldsets import fieldset, partial_model, partial_page_model
+from app.utils.http_cache import CachedResponse, make_etag
+from app.utils.pagination import encode_cursor, decode_cursor
+from app.utils.serialization import json_list_response, validate_rows
 
-from app.services.imagekit_config import imagekit
-import shutil
-import os
-import tempfile
+from app.services.news_cache import news_response_cache
+from app.services.news_search import search_news
+from app.services.bulk_import import NDJSON_REQUEST_BODY, import_news, ndjson_lines
+from app.services.image_pipeline import ImagePipeline, get_image_pipeline
+from app.services.storage import FileStorage, StorageTimeoutError, get_storage
 
 news_router = APIRouter()
 
+# Columns returned by the news list; content is deliberately left out
+NEWS_LIST_COLUMNS = (
+  News.id, News.title, News.preview_text,
+  News.image_url, News.image_avif_url, News.image_width, News.image_height, News.image_placeholder,
+  News.publication_date, News.created_at, News.updated_at,
+)
+
 @news_router.post("/")
 async def create_news_article(
   title: str = Form(...),
   content: str = Form(""),
+  publication_date: Optional[datetime] = Form(None, description="When the draft goes live (default: not scheduled, it stays a draft)"),
   file: UploadFile = File(""),
-  db: AsyncSession = Depends(get_db)
+  db: AsyncSession = Depends(get_db),
+  storage: FileStorage = Depends(get_storage),
+  images: ImagePipeline = Depends(get_image_pipeline)
 ):
-  temp_file_path = None
-
   try:
-    # Save the uploaded file to a temporary location
-    with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(file.filename)[1]) as temp_file:
-      temp_file_path = temp_file.name
-      shutil.copyfileobj(file.file, temp_file)
-
-    # Upload the file to ImageKit
-    upload_result = imagekit.upload_file(
-      file=open(temp_file_path, "rb"),
-      file_name=file.filename,
-      options=UploadFileRequestOptions(
-        use_unique_file_name=True,
-        tags=["backend-upload", "news-thumbnail"]
-      )
-    )
+    # Validate and re-encode the image on the worker pool, then upload the variants
+    stored_image = await images.process_and_store(file, storage, tags=["backend-upload", "news-thumbnail"])
 
-    if upload_result.response_metadata.http_status_code == 200:
-      # Create a news article with the uploaded image url
-      news_article_data = NewsCreate(
-        title=title,
-        content=content,
-        image_url=upload_result.url,
-      )
-      # Convert the request schema (Pydantic) into a mapped SQLModel instance
-      db_news_article = News(**news_article_data.model_dump())
-      db.add(db_news_article)
-      await db.commit()
-      await db.refresh(db_news_article)
-      return db_news_article
+    # Create a news article with the uploaded image url
+    news_article_data = NewsCreate(
+      title=title,
+      content=content,
+      image_url=stored_image.url,
+      image_avif_url=stored_image.avif_url,
+      image_width=stored_image.width,
+      image_height=stored_image.height,
+      image_placeholder=stored_image.placeholder,
+      publication_date=publication_date,
+    )
+    # Convert the request schema (Pydantic) into a mapped SQLModel instance; unset fields keep the model defaults
+    db_news_article = News(**news_article_data.model_dump(exclude_none=True))
+    db.add(db_news_article)
+    await db.commit()
+    await db.refresh(db_news_article)
+    return db_news_article
 
+  except HTTPException:
+    raise
+  except StorageTimeoutError:
+    raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail="Image upload timed out")
   except Exception as e:
     raise HTTPException(status_code=500, detail=f"Failed to upload image or create news: {str(e)}")
   finally:
-    # Clean up the temp file
-    if temp_file_path and os.path.exists(temp_file_path):
-      os.unlink(temp_file_path)
-    file.file.close()
+    await file.close()
+
+
+@news_router.get("/", response_model=NewsPage, status_code=status.HTTP_200_OK)
+async def get_all_news(
+  request: Request,
+  limit: int = Query(20, ge=1, le=100),
+  cursor: Optional[str] = Query(None, description="next_cursor returned by the previous page"),
+  fields: Optional[Tuple[str, ...]] = Depends(fieldset(NewsSummary)),
+  db: AsyncSession = Depends(get_read_db)
+) -> Response:
+  """ Get news articles, newest first, one page at a time; ?fields= limits the columns read and returned """
+  cache_key = ("list", limit, cursor, fields)
+  cached = news_response_cache.get(cache_key)
+  if cached is None:
+    generation = news_response_cache.fill_generation()
+    cached = await _build_news_page(db, limit, cursor, fields)
+    news_response_cache.set(cache_key, cached, generation)
+  return cached.to_response(request, get_response_compressor())
+
+
+@news_router.get("/feed", response_model=NewsPage, status_code=status.HTTP_200_OK)
+async def get_news_feed(
+  request: Request,
+  limit: int = Query(20, ge=1, le=100),
+  cursor: Optional[str] = Query(None, description="next_cursor returned by the previous page"),
+  fields: Optional[Tuple[str, ...]] = Depends(fieldset(NewsSummary)),
+  db: AsyncSession = Depends(get_read_db)
+) -> Response:
+  """ Public feed: published articles only, latest publication first, one page at a time """
+  cache_key = ("feed", limit, cursor, fields)
+  cached = news_response_cache.get(cache_key)
+  if cached is None:
+    generation = news_response_cache.fill_generation()
+    cached = await _build_news_page(db, limit, cursor, fields, feed=True)
+    news_response_cache.set(cache_key, cached, generation)
+  return cached.to_response(request, get_response_compressor())
+
+
+async def _build_news_page(
+  db: AsyncSession, limit: int, cursor: Optional[str], fields: Optional[Tuple[str, ...]] = None, feed: bool = False
+) -> CachedResponse:
+  # The list pages through every article by creation; the feed through published ones by publication
+  sort_field = "publication_date" if feed else "created_at"
+  sort_column = getattr(News, sort_field)
+  if fields:
+    # The cursor and the ETag need these whatever fieldset was asked for
+    key_fields = ("id", sort_field, "updated_at")
+    item_model = partial_model(NewsSummary, fields)
+    page_model = partial_page_model(NewsPage, item_model)
+    columns = [getattr(News, name) for name in NewsSummary.model_fields if name in fields or name in key_fields]
+  else:
+    item_model, page_model, columns = NewsSummary, NewsPage, NEWS_LIST_COLUMNS
+  statement = (
+    select(*columns)
+    .order_by(desc(sort_column), desc(News.id))
+    .limit(limit + 1)
+  )
+  if feed:
+    # IS_PUBLISHED with a literal true, so ix_news_published_feed (partial) serves the query
+    statement = statement.where(News.is_published == true(), sort_column.is_not(None))
+  if cursor:
+    sort_value, news_id = _parse_news_cursor(cursor, sort_field)
+    statement = statement.where(tuple_(sort_column, News.id) < (sort_value, news_id))
+
+  result = await db.execute(statement)
+  rows = result.all()
+  page_rows = rows[:limit]
+
+  # Items only carry the requested fields, so the cursor and validators come from the rows
+  next_cursor = None
+  if len(rows) > limit:
+    last = page_rows[-1]
+    next_cursor = encode_cursor({sort_field: getattr(last, sort_field).isoformat(), "id": str(last.id)})
 
+  page = page_model(items=validate_rows(item_model, page_rows), next_cursor=next_cursor)
+  etag = make_etag([fields, next_cursor, *((row.id, row.updated_at) for row in page_rows)])
+  last_modified = max((row.updated_at for row in page_rows), default=None)
+  return CachedResponse(page, etag, last_modified)
 
-@news_router.get("/", response_model=List[NewsRead], status_code=status.HTTP_200_OK)
-async def get_all_news(db: AsyncSession = Depends(get_db)):
-  """ Get all news articles """
-  result = await db.execute(select(News).order_by(desc(News.created_at)))
-  news_articles = result.scalars().all()
-  for article in news_articles:
-    if not article.preview_text:
-      article.preview_text = generate_excerpt(article.content)
-  return news_articles
+
+def _parse_news_cursor(cursor: str, sort_field: str = "created_at") -> tuple[datetime, UUID]:
+  values = decode_cursor(cursor)
+  try:
+    return datetime.fromisoformat(values[sort_field]), UUID(values["id"])
+  except (KeyError, TypeError, ValueError):
+    raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+@news_router.get("/search", response_model=List[NewsSearchResult], status_code=status.HTTP_200_OK)
+async def search_news_articles(
+  q: str = Query(..., min_length=1, max_length=200, description="Words to look for in title and content"),
+  limit: int = Query(20, ge=1, le=100),
+  offset: int = Query(0, ge=0, le=1000),
+  db: AsyncSession = Depends(get_read_db)
+):
+  """ Full-text search over news articles, best match first """
+  rows = await search_news(db, q, NEWS_LIST_COLUMNS, limit, offset)
+  return json_list_response(NewsSearchResult, rows)
+
+
+@news_router.get("/export", status_code=status.HTTP_200_OK)
+async def export_news(
+  format: ExportFormat = Query(ExportFormat.ndjson),
+  current_user: User = Depends(get_current_staff_user)
+):
+  """ Stream every news article as NDJSON (default) or CSV """
+  statement = select(*schema_columns(News, NewsRead)).order_by(News.created_at, News.id)
+  return export_response(AsyncReadSessionLocal, statement, NewsRead, format, "news", settings.EXPORT_CHUNK_SIZE)
+
+
+@news_router.post("/import", response_model=ImportReport, status_code=status.HTTP_200_OK, openapi_extra=NDJSON_REQUEST_BODY)
+async def import_news_articles(
+  request: Request,
+  batch_size: int = Query(settings.IMPORT_BATCH_SIZE, ge=1, le=5000, description="Rows per transaction"),
+  db: AsyncSession = Depends(get_db),
+  current_user: User = Depends(get_current_superuser)
+):
+  """ Bulk-create news from an NDJSON body (one NewsImport object per line); invalid lines are reported, not fatal """
+  return await import_news(db, ndjson_lines(request.stream()), batch_size)
 
 
 #@news_router.get("/", response_model=List[NewsRead], status_code=status.HTTP_200_OK)
@@ -87,9 +206,16 @@ async def get_all_news(db: AsyncSession = Depends(get_db)):
 
 
 @news_router.get("/{news_id}", response_model=NewsRead, status_code=status.HTTP_200_OK)
-async def get_news_by_id(news_id: UUID, db: AsyncSession = Depends(get_db)):
+async def get_news_by_id(news_id: UUID, request: Request, db: AsyncSession = Depends(get_read_db)) -> Response:
   """Get a single news article by UUID"""
-  news_item = await db.get(News, news_id)
-  if not news_item:
-    raise HTTPException(status_code=404, detail="News not found")
-  return news_item
\ No newline at end of file
+  cache_key = ("detail", news_id)
+  cached = news_response_cache.get(cache_key)
+  if cached is None:
+    generation = news_response_cache.fill_generation()
+    news_item = await db.get(News, news_id)
+    if not news_item:
+      raise HTTPException(status_code=404, detail="News not found")
+    article = NewsRead.model_validate(news_item, from_attributes=True)
+    cached = CachedResponse(article, make_etag([article.id, article.updated_at]), article.updated_at)
+    news_response_cache.set(cache_key, cached, generation)
+  return cached.to_response(request, get_response_compressor())
\ No newline at end of file
@@ -1,15 +1,22 @@
 # app/api/v1/endpoints/users.py
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import List, Optional, Tuple
 from sqlmodel import select, desc
 
 from app.core.auth import get_current_user, get_current_superuser
-from app.database.session import get_db
+from app.core.config import settings
+from app.database.session import get_db, get_read_db, AsyncReadSessionLocal
 from app.models.users import User
+from app.schemas.imports import ImportReport
 from app.schemas.users import UserCreate, UserUpdate, UserRead
+from app.services.bulk_import import NDJSON_REQUEST_BODY, import_users, ndjson_lines
 from app.services.user_service import UserService
+from app.services.password_hasher import get_password_hasher
+from app.utils.export import ExportFormat, export_response, schema_columns
+from app.utils.fieldsets import fieldset, partial_model
+from app.utils.serialization import json_list_response
 
 users_router = APIRouter()
 
@@ -31,20 +38,43 @@ async def update_current_user_profile(
 
 @users_router.get("/", response_model=List[UserRead], status_code=status.HTTP_200_OK)
 async def get_users(
+   fields: Optional[Tuple[str, ...]] = Depends(fieldset(UserRead)),
+   current_user: User = Depends(get_current_superuser),
+   db: AsyncSession = Depends(get_read_db)
+):
+    """ Gett all users; ?fields= limits the columns read and returned """
+    schema = partial_model(UserRead, fields) if fields else UserRead
+    # Only the schema's columns: the password hash and login keys are never read
+    result = await db.execute(select(*schema_columns(User, schema)).order_by(desc(User.date_joined)))
+    return json_list_response(schema, result.all())
+
+
+@users_router.get("/export", status_code=status.HTTP_200_OK)
+async def export_users(
+   format: ExportFormat = ExportFormat.ndjson,
+   current_user: User = Depends(get_current_superuser)
+):
+    """ Stream every user as NDJSON (default) or CSV """
+    statement = select(*schema_columns(User, UserRead)).order_by(User.date_joined, User.id)
+    return export_response(AsyncReadSessionLocal, statement, UserRead, format, "users", settings.EXPORT_CHUNK_SIZE)
+
+
+@users_router.post("/import", response_model=ImportReport, status_code=status.HTTP_200_OK, openapi_extra=NDJSON_REQUEST_BODY)
+async def import_user_accounts(
+   request: Request,
+   batch_size: int = Query(settings.IMPORT_BATCH_SIZE, ge=1, le=5000, description="Rows per transaction"),
    current_user: User = Depends(get_current_superuser),
    db: AsyncSession = Depends(get_db)
 ):
-    """ Gett all users """
-    result = await db.execute(select(User).order_by(desc(User.date_joined)))
-    all_users = result.scalars().all()
-    return all_users
+   """ Bulk-create users from an NDJSON body (one UserCreate object per line); invalid lines are reported, not fatal """
+   return await import_users(db, ndjson_lines(request.stream()), batch_size)
 
 
 @users_router.get("/{user_id}", response_model=UserRead, status_code=status.HTTP_200_OK)
 async def get_user_by_id(
    user_id: UUID,
    current_user: User = Depends(get_current_superuser),
-   db: AsyncSession = Depends(get_db)
+   db: AsyncSession = Depends(get_read_db)
 ):
   """ Get a single user by ID (UUID) """
   user = await UserService.get_user_by_id(db, user_id)
@@ -57,16 +87,15 @@ async def get_user_by_id(
 async def create_user(user: UserCreate, db: AsyncSession = Depends(get_db)) -> User:
     """ Create a new user """
     # Check if email already exists
-    result = await db.execute(select(User).where(User.email == user.email))
-    if result.scalar_one_or_none():
+    if await UserService.get_user_by_email(db, user.email):
        raise HTTPException(400, "User with this e-mail already registered")
+    if user.username and await UserService.username_taken(db, user.username):
+       raise HTTPException(400, "Username already taken")
 
     db_user = User(**user.model_dump(exclude={"password"}))
-    db_user.set_password(user.password)
+    db_user.password = await get_password_hasher().hash(user.password)
     db.add(db_user)
-    await db.commit()
-    await db.refresh(db_user)
-    return db_user
+    return await UserService.commit_user(db, db_user)
 
 
 @users_router.get("/verify-token")
@@ -1,21 +1,16 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from uuid import UUID
-from jose import JWTError, jwt
+from jose import JWTError
 from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlmodel import select
 from app.models.users import User
 from app.database.session import get_db
-from app.core.security import settings
+from app.core.security import verify_token
+from app.services.user_service import UserService
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
-def _get_secret_key() -> str:
-  """Return SECRET_KEY as str or raise if not configured (helps static type checkers)."""
-  if settings.SECRET_KEY is None:
-    raise RuntimeError("SECRET_KEY is not configured")
-  return settings.SECRET_KEY
-
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: AsyncSession = Depends(get_db)
@@ -26,15 +21,18 @@ async def get_current_user(
     headers={"WWW-Authenticate": "Bearer"},
   )
   try:
-    payload = jwt.encode(token, _get_secret_key(), algorithm=settings.ALGORITHM)
-    user_id: UUID = payload.get("sub")
-    if user_id is None:
-      raise credentials_exception
-  except JWTError:
+    payload = verify_token(token, "access")
+    user_id = UUID(payload["sub"])
+  except (JWTError, KeyError, TypeError, ValueError):
     raise credentials_exception
   
-  result = await db.execute(select(User).where(User.id == user_id))
-  user = result.scalar_one_or_none()
+  user = UserService.get_cached_user(user_id)
+  if user is None:
+    generation = UserService.user_cache_generation()
+    result = await db.execute(select(User).where(User.id == user_id))
+    user = result.scalar_one_or_none()
+    if user is not None:
+      UserService.cache_user(user, generation)
   if user is None or not user.is_active:
     raise credentials_exception
   return user
@@ -0,0 +1,22 @@
+# app/core/compression.py | Response compression policy built from the settings
+from typing import Optional
+
+from app.core.config import settings
+from app.utils.compression import ResponseCompressor, build_codecs
+
+_response_compressor: Optional[ResponseCompressor] = None
+
+
+def get_response_compressor() -> ResponseCompressor:
+  """Return the shared compressor; it has no codecs (never compresses) when COMPRESSION_ENABLED is off."""
+  global _response_compressor
+  if _response_compressor is None:
+    encodings = [name.strip() for name in settings.COMPRESSION_ENCODINGS.split(",") if name.strip()]
+    codecs = build_codecs(
+      encodings if settings.COMPRESSION_ENABLED else [],
+      gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+      brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+      zstd_level=settings.COMPRESSION_ZSTD_LEVEL,
+    )
+    _response_compressor = ResponseCompressor(codecs, settings.COMPRESSION_MIN_SIZE)
+  return _response_compressor
@@ -9,21 +9,105 @@ class Settings(BaseSettings):
   # Project
   PROJECT_NAME: str = "PASCI API"
   DESCRIPTION: str = "API REST pour la plateforme des CRASC"
+  ENVIRONMENT: str = "development"  # "development", "staging" or "production"
   
   # Database
   DATABASE_URL: Optional[str] = None
+  DATABASE_READ_URL: Optional[str] = None  # Read replica for GET handlers; primary when unset
+  DB_POOL_SIZE: int = 5
+  DB_MAX_OVERFLOW: int = 10
+  DB_POOL_TIMEOUT: float = 30.0
+  DB_POOL_RECYCLE: int = 300
+  DB_POOL_PRE_PING: str = "always"  # "always", "never", or "idle" (only after DB_POOL_PRE_PING_IDLE_SECONDS)
+  DB_POOL_PRE_PING_IDLE_SECONDS: float = 60.0
+  DB_POOL_WARMUP: int = 0  # Connections to open per engine at startup
+  DB_CREATE_TABLES_ON_STARTUP: bool = False
+  DB_SLOW_QUERY_MS: float = 200.0  # Statements slower than this are logged
+  DB_EXPLAIN_SAMPLE_RATE: float = 0.1  # Share of slow SELECTs to EXPLAIN outside production
 
   # Security
   SECRET_KEY: Optional[str] = None
   ALGORITHM: str = "HS256"
   ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
   REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+  JWT_BACKEND: str = "native"  # "native" (stdlib HMAC) or "jose"
+  TOKEN_CACHE_MAX_SIZE: int = 10000
+
+  # Password hashing
+  PASSWORD_HASH_EXECUTOR: str = "thread"  # "thread" or "process"
+  PASSWORD_HASH_WORKERS: int = 2
+  PASSWORD_HASH_MAX_QUEUE: int = 32
+
+  # Login throttling (failed attempts, checked before hashing)
+  LOGIN_THROTTLE_BACKEND: str = "memory"  # "memory" (per worker) or "sqlite" (shared by workers on a host)
+  LOGIN_THROTTLE_SQLITE_PATH: str = "login_throttle.db"
+  LOGIN_THROTTLE_WINDOW_SECONDS: float = 900.0
+  LOGIN_MAX_FAILURES_PER_IDENTIFIER: int = 5
+  LOGIN_MAX_FAILURES_PER_IP: int = 50
+  LOGIN_LOCKOUT_BASE_SECONDS: float = 60.0
+  LOGIN_LOCKOUT_MAX_SECONDS: float = 3600.0
+
+  # Load shedding: per route group concurrency limits, adapted from latency (see app/core/middleware.py)
+  CONCURRENCY_LIMIT_ENABLED: bool = True
+  CONCURRENCY_LIMIT_MAX: int = 256  # Cheap routes
+  CONCURRENCY_LATENCY_TARGET_SECONDS: float = 0.5
+  CONCURRENCY_LIMIT_EXPENSIVE_MAX: int = 32  # Login, registration, user creation, news upload
+  CONCURRENCY_EXPENSIVE_LATENCY_TARGET_SECONDS: float = 2.0
+  CONCURRENCY_LIMIT_BULK_MAX: int = 4  # Imports and exports (fixed)
+  LOAD_SHED_RETRY_AFTER_SECONDS: int = 1
+
+  # Response compression (negotiated from Accept-Encoding)
+  COMPRESSION_ENABLED: bool = True
+  COMPRESSION_ENCODINGS: str = "zstd,br,gzip"  # Server preference; br and zstd need the brotli/zstandard packages
+  COMPRESSION_MIN_SIZE: int = 1024  # Smaller bodies are sent as they are
+  COMPRESSION_GZIP_LEVEL: int = 6
+  COMPRESSION_BROTLI_QUALITY: int = 4
+  COMPRESSION_ZSTD_LEVEL: int = 3
+
+  # Authenticated user cache (per worker)
+  USER_CACHE_TTL_SECONDS: float = 30.0
+  USER_CACHE_MAX_SIZE: int = 10000
+
+  # News response cache (per worker)
+  # Also the longest other workers (and writes outside the ORM session) can serve a stale copy
+  NEWS_CACHE_TTL_SECONDS: float = 10.0
+  NEWS_CACHE_MAX_SIZE: int = 1000
+  NEWS_CACHE_REPLICA_LAG_SECONDS: float = 2.0  # With DATABASE_READ_URL: no caching this long after a write
+
+  # Scheduled publisher (drafts go live at their publication_date, if they have one)
+  NEWS_PUBLISHER_ENABLED: bool = True
+  NEWS_PUBLISHER_INTERVAL_SECONDS: float = 60.0
+  NEWS_PUBLISHER_BATCH_SIZE: int = 500  # Rows per UPDATE transaction
+
+  # NDJSON/CSV exports
+  EXPORT_CHUNK_SIZE: int = 500
+
+  # NDJSON bulk imports
+  IMPORT_BATCH_SIZE: int = 500  # Rows per INSERT transaction
 
   # ImageKit
   IMAGEKIT_PRIVATE_KEY: Optional[str] = None
   IMAGEKIT_PUBLIC_KEY: Optional[str] = None
   IMAGEKIT_URL: Optional[str] = None
 
+  # File storage
+  STORAGE_BACKEND: str = "imagekit"  # "imagekit" or "local"
+  LOCAL_STORAGE_DIR: str = "media"
+  LOCAL_STORAGE_BASE_URL: str = "/media"
+  UPLOAD_MAX_CONCURRENCY: int = 4
+  UPLOAD_TIMEOUT_SECONDS: float = 30.0
+
+  # Image uploads (resized and re-encoded before storage)
+  IMAGE_MAX_UPLOAD_BYTES: int = 15 * 1024 * 1024
+  IMAGE_MAX_DIMENSION: int = 10000  # Larger sources are rejected before decoding
+  IMAGE_MAX_PIXELS: int = 40_000_000  # Likewise; bounds each worker's decode to ~160 MB (RGBA)
+  IMAGE_OUTPUT_MAX_WIDTH: int = 1600
+  IMAGE_WEBP_QUALITY: int = 80
+  IMAGE_AVIF_ENABLED: bool = True
+  IMAGE_AVIF_QUALITY: int = 60
+  IMAGE_PLACEHOLDER_WIDTH: int = 16
+  IMAGE_WORKERS: int = 2
+
   class Config:
     case_sensitive = True
     env_file = ".env"
@@ -0,0 +1,173 @@
+# app/core/metrics.py | In-process metrics with Prometheus text exposition
+import threading
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Registry:
+  """Holds every metric so they can be rendered together."""
+
+  def __init__(self):
+    self._metrics: List["_Metric"] = []
+
+  def register(self, metric: "_Metric") -> None:
+    self._metrics.append(metric)
+
+  def render(self) -> str:
+    lines: List[str] = []
+    for metric in self._metrics:
+      lines.append(f"# HELP {metric.name} {metric.documentation}")
+      lines.append(f"# TYPE {metric.name} {metric.type}")
+      lines.extend(metric.samples())
+    return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+  pairs = list(zip(names, values))
+  if extra:
+    pairs.append(extra)
+  if not pairs:
+    return ""
+  escaped = (v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in pairs)
+  return "{" + ",".join(f'{n}="{v}"' for (n, _), v in zip(pairs, escaped)) + "}"
+
+
+def _format_value(value: float) -> str:
+  if value == float("inf"):
+    return "+Inf"
+  return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric(ABC):
+  type = "untyped"
+
+  def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), registry: Registry = REGISTRY):
+    self.name = name
+    self.documentation = documentation
+    self.labelnames = tuple(labelnames)
+    self._children: Dict[Tuple[str, ...], object] = {}
+    self._lock = threading.Lock()
+    registry.register(self)
+
+  def labels(self, *labelvalues) -> "_Metric":
+    """Return the child for these label values, creating it on first use."""
+    key = tuple(str(v) for v in labelvalues)
+    child = self._children.get(key)
+    if child is None:
+      with self._lock:
+        child = self._children.setdefault(key, self._new_child())
+    return child
+
+  @abstractmethod
+  def _new_child(self):
+    """Return a new child holding the value(s) of one label set."""
+
+  @abstractmethod
+  def samples(self) -> List[str]:
+    """Return the exposition lines of every child."""
+
+
+class _ValueChild:
+  def __init__(self):
+    self.value = 0.0
+    self.function: Optional[Callable[[], float]] = None
+
+  def inc(self, amount: float = 1) -> None:
+    self.value += amount
+
+  def dec(self, amount: float = 1) -> None:
+    self.value -= amount
+
+  def set(self, value: float) -> None:
+    self.value = value
+
+  def set_function(self, function: Callable[[], float]) -> None:
+    """Compute the value when metrics are rendered instead of storing it."""
+    self.function = function
+
+  def get(self) -> float:
+    return self.function() if self.function else self.value
+
+
+class Counter(_Metric):
+  type = "counter"
+
+  def _new_child(self):
+    return _ValueChild()
+
+  def inc(self, amount: float = 1) -> None:
+    self.labels().inc(amount)
+
+  def get(self) -> float:
+    return self.labels().get()
+
+  def samples(self) -> List[str]:
+    return [
+      f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(child.get())}"
+      for key, child in list(self._children.items())
+    ]
+
+
+class Gauge(Counter):
+  type = "gauge"
+
+  def dec(self, amount: float = 1) -> None:
+    self.labels().dec(amount)
+
+  def set(self, value: float) -> None:
+    self.labels().set(value)
+
+  def set_function(self, function: Callable[[], float]) -> None:
+    self.labels().set_function(function)
+
+
+class _HistogramChild:
+  def __init__(self, buckets: Tuple[float, ...]):
+    self.buckets = buckets
+    self.counts = [0] * (len(buckets) + 1)
+    self.sum = 0.0
+
+  def observe(self, value: float) -> None:
+    # counts are per bucket; they are made cumulative when rendered
+    self.counts[bisect_left(self.buckets, value)] += 1
+    self.sum += value
+
+
+class Histogram(_Metric):
+  type = "histogram"
+
+  def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+               buckets: Sequence[float] = DEFAULT_BUCKETS, registry: Registry = REGISTRY):
+    self.buckets = tuple(sorted(buckets))
+    super().__init__(name, documentation, labelnames, registry)
+
+  def _new_child(self):
+    return _HistogramChild(self.buckets)
+
+  def observe(self, value: float) -> None:
+    self.labels().observe(value)
+
+  def samples(self) -> List[str]:
+    lines = []
+    for key, child in list(self._children.items()):
+      cumulative = 0
+      for bound, count in zip(self.buckets + (float("inf"),), list(child.counts)):
+        cumulative += count
+        le = ("le", _format_value(bound))
+        lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+      lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(child.sum)}")
+      lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {cumulative}")
+    return lines
+
+
+def render_metrics() -> str:
+  """Render every registered metric in the Prometheus text format."""
+  return REGISTRY.render()
@@ -0,0 +1,327 @@
+# app/core/middleware.py | ASGI middleware
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.compression import get_response_compressor
+from app.core.config import settings
+from app.core.metrics import Counter, Gauge, Histogram
+from app.database.session import track_queries
+from app.utils.compression import ResponseCompressor, StreamCompressor
+
+SIZE_BUCKETS = (64, 256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+REQUEST_LATENCY = Histogram(
+  "http_request_duration_seconds",
+  "Time from receiving a request to sending the last byte of its response",
+  labelnames=("method", "route", "status"),
+  buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+REQUESTS_IN_FLIGHT = Gauge("http_requests_in_flight", "Requests currently being handled")
+REQUEST_SIZE = Histogram(
+  "http_request_size_bytes", "Size of request bodies", labelnames=("method", "route"), buckets=SIZE_BUCKETS
+)
+RESPONSE_SIZE = Histogram(
+  "http_response_size_bytes", "Size of response bodies", labelnames=("method", "route"), buckets=SIZE_BUCKETS
+)
+REQUEST_DB_QUERIES = Histogram(
+  "http_request_db_queries", "SQL statements executed per request", labelnames=("method", "route"),
+  buckets=(0, 1, 2, 3, 5, 8, 13, 21, 50, 100),
+)
+REQUEST_DB_TIME = Histogram(
+  "http_request_db_seconds", "Time spent in the database per request", labelnames=("method", "route"),
+  buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+CONCURRENCY_LIMIT = Gauge(
+  "http_concurrency_limit", "Current concurrency limit of each route group", labelnames=("group",)
+)
+GROUP_IN_FLIGHT = Gauge("http_concurrency_in_flight", "Requests admitted per route group", labelnames=("group",))
+REQUESTS_SHED = Counter(
+  "http_requests_shed_total", "Requests refused with 503 because their route group was at its limit",
+  labelnames=("group",),
+)
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class MetricsMiddleware:
+  """
+    Records latency, in-flight requests, body sizes and the SQL statements
+    run (count and time, see track_queries) per route template
+    (/api/v1/news/{news_id}, not the concrete path, to keep label cardinality bounded).
+    Written as plain ASGI rather than BaseHTTPMiddleware: it only wraps
+    receive/send, so streaming responses are not buffered and the per-request
+    cost is a few dict lookups.
+  """
+
+  def __init__(self, app: ASGIApp):
+    self.app = app
+
+  async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+    if scope["type"] != "http":
+      await self.app(scope, receive, send)
+      return
+
+    started = time.perf_counter()
+    request_size = 0
+    response_size = 0
+    status = 500
+
+    async def counting_receive() -> Message:
+      nonlocal request_size
+      message = await receive()
+      if message["type"] == "http.request":
+        request_size += len(message.get("body", b""))
+      return message
+
+    async def counting_send(message: Message) -> None:
+      nonlocal response_size, status
+      if message["type"] == "http.response.start":
+        status = message["status"]
+      elif message["type"] == "http.response.body":
+        response_size += len(message.get("body", b""))
+      await send(message)
+
+    in_flight = REQUESTS_IN_FLIGHT.labels()
+    in_flight.inc()
+    try:
+      with track_queries() as queries:
+        await self.app(scope, counting_receive, counting_send)
+    finally:
+      in_flight.dec()
+      # The router stores the matched route in the scope it was given
+      route = scope.get("route")
+      template = getattr(route, "path_format", None) or UNMATCHED_ROUTE
+      method = scope["method"]
+      REQUEST_LATENCY.labels(method, template, status).observe(time.perf_counter() - started)
+      REQUEST_SIZE.labels(method, template).observe(request_size)
+      RESPONSE_SIZE.labels(method, template).observe(response_size)
+      REQUEST_DB_QUERIES.labels(method, template).observe(queries.count)
+      REQUEST_DB_TIME.labels(method, template).observe(queries.duration)
+
+
+class AIMDLimiter:
+  """
+    Concurrency limit adjusted from observed latency (additive increase,
+    multiplicative decrease). A response slower than latency_target, or a 503
+    from downstream, cuts the limit by `backoff` (at most once per
+    latency_target, so one slow burst is not counted many times); otherwise
+    the limit grows by about one per `limit` completions while at least half
+    of it is in use. latency_target None keeps the limit fixed at max_limit.
+  """
+
+  def __init__(
+    self, min_limit: int, max_limit: int, latency_target: Optional[float], initial: Optional[int] = None,
+    backoff: float = 0.9,
+  ):
+    self.min_limit = min_limit
+    self.max_limit = max_limit
+    self.latency_target = latency_target
+    self.backoff = backoff
+    self.limit = float(initial if initial is not None else max_limit)
+    self.in_flight = 0
+    self._last_decrease = 0.0
+
+  @property
+  def capacity(self) -> int:
+    return max(self.min_limit, int(self.limit))
+
+  @property
+  def saturated(self) -> bool:
+    return self.in_flight >= self.capacity
+
+  def try_acquire(self) -> bool:
+    if self.saturated:
+      return False
+    self.in_flight += 1
+    return True
+
+  def release(self, latency: float, overloaded: bool, now: float) -> None:
+    in_use = self.in_flight
+    self.in_flight -= 1
+    if self.latency_target is None:
+      return
+    if overloaded or latency > self.latency_target:
+      if now - self._last_decrease >= self.latency_target:
+        self.limit = max(self.min_limit, self.limit * self.backoff)
+        self._last_decrease = now
+    elif in_use * 2 >= self.limit:
+      self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+
+@dataclass(frozen=True)
+class RouteGroup:
+  name: str
+  # (method, path prefix) pairs; matched before routing, so templates cannot be used
+  routes: Sequence[Tuple[str, str]]
+  limiter: AIMDLimiter
+
+
+def default_route_groups() -> Tuple[RouteGroup, ...]:
+  """
+    Route groups in priority order; requests not listed fall in the first one.
+    A group is only admitted while every group before it has room, so under
+    overload logins, uploads and bulk transfers are shed before cheap reads.
+  """
+  return (
+    RouteGroup("default", (), AIMDLimiter(
+      min_limit=4, max_limit=settings.CONCURRENCY_LIMIT_MAX,
+      latency_target=settings.CONCURRENCY_LATENCY_TARGET_SECONDS,
+      initial=max(4, settings.CONCURRENCY_LIMIT_MAX // 2),
+    )),
+    RouteGroup("expensive", (
+      ("POST", "/api/v1/auth/login"),
+      ("POST", "/api/v1/auth/register"),
+      ("POST", "/api/v1/users/"),
+      ("POST", "/api/v1/news/"),
+    ), AIMDLimiter(
+      min_limit=1, max_limit=settings.CONCURRENCY_LIMIT_EXPENSIVE_MAX,
+      latency_target=settings.CONCURRENCY_EXPENSIVE_LATENCY_TARGET_SECONDS,
+      initial=max(1, settings.CONCURRENCY_LIMIT_EXPENSIVE_MAX // 2),
+    )),
+    # Duration depends on the payload size, so latency says nothing here: fixed limit
+    RouteGroup("bulk", (
+      ("POST", "/api/v1/news/import"),
+      ("POST", "/api/v1/users/import"),
+      ("GET", "/api/v1/news/export"),
+      ("GET", "/api/v1/users/export"),
+    ), AIMDLimiter(min_limit=1, max_limit=settings.CONCURRENCY_LIMIT_BULK_MAX, latency_target=None)),
+  )
+
+
+class ConcurrencyLimitMiddleware:
+  """
+    Sheds load instead of queueing it: a request whose route group is at its
+    limit (or behind a saturated higher-priority group) gets an immediate 503
+    with Retry-After, before it takes a database connection or a hashing slot.
+    /metrics is never limited so overload stays observable.
+  """
+
+  def __init__(self, app: ASGIApp, groups: Optional[Sequence[RouteGroup]] = None, exempt: Sequence[str] = ("/metrics",)):
+    self.app = app
+    self.groups = tuple(groups) if groups is not None else default_route_groups()
+    self.exempt = frozenset(exempt)
+    self._routes: Dict[Tuple[str, str], int] = {
+      (method, path.rstrip("/")): index
+      for index, group in enumerate(self.groups)
+      for method, path in group.routes
+    }
+    for group in self.groups:
+      CONCURRENCY_LIMIT.labels(group.name).set_function(lambda limiter=group.limiter: limiter.capacity)
+      GROUP_IN_FLIGHT.labels(group.name).set_function(lambda limiter=group.limiter: limiter.in_flight)
+
+  def _group_index(self, scope: Scope) -> int:
+    return self._routes.get((scope["method"], scope["path"].rstrip("/")), 0)
+
+  async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+    if scope["type"] != "http" or scope["path"] in self.exempt:
+      await self.app(scope, receive, send)
+      return
+
+    index = self._group_index(scope)
+    group = self.groups[index]
+    if any(higher.limiter.saturated for higher in self.groups[:index]) or not group.limiter.try_acquire():
+      REQUESTS_SHED.labels(group.name).inc()
+      response = JSONResponse(
+        {"detail": "Server busy, retry later"}, status_code=503,
+        headers={"Retry-After": str(settings.LOAD_SHED_RETRY_AFTER_SECONDS)},
+      )
+      await response(scope, receive, send)
+      return
+
+    started = time.perf_counter()
+    status = 500
+
+    async def status_send(message: Message) -> None:
+      nonlocal status
+      if message["type"] == "http.response.start":
+        status = message["status"]
+      await send(message)
+
+    try:
+      await self.app(scope, receive, status_send)
+    finally:
+      now = time.perf_counter()
+      group.limiter.release(now - started, overloaded=status == 503, now=now)
+
+
+class CompressionMiddleware:
+  """
+    Compresses responses with the best coding the client accepts (see
+    ResponseCompressor), instead of Starlette's gzip-only GZipMiddleware.
+    Complete bodies under the size threshold are left alone; streamed bodies
+    (exports) are compressed chunk by chunk and flushed as they go. Responses
+    that already carry a Content-Encoding, such as cached news responses with
+    their stored compressed bodies, are passed through untouched.
+  """
+
+  def __init__(self, app: ASGIApp, compressor: Optional[ResponseCompressor] = None):
+    self.app = app
+    self.compressor = compressor or get_response_compressor()
+
+  async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+    if scope["type"] != "http" or scope["method"] == "HEAD":
+      await self.app(scope, receive, send)
+      return
+    codec = self.compressor.negotiate(Headers(scope=scope).get("accept-encoding"))
+
+    start: Optional[Message] = None
+    stream: Optional[StreamCompressor] = None
+    passthrough = False
+
+    async def compressing_send(message: Message) -> None:
+      nonlocal start, stream, passthrough
+      if message["type"] == "http.response.start":
+        # Held back until the first body chunk tells whether the body is complete
+        start = message
+        return
+      if message["type"] != "http.response.body" or passthrough:
+        await send(message)
+        return
+
+      body = message.get("body", b"")
+      more_body = message.get("more_body", False)
+      if stream is not None:
+        body = stream.compress(body)
+        if not more_body:
+          body += stream.finish()
+        await send({"type": "http.response.body", "body": body, "more_body": more_body})
+        return
+
+      headers = MutableHeaders(raw=start["headers"])
+      eligible = (
+        start["status"] not in (204, 206, 304)
+        and "content-encoding" not in headers
+        and self.compressor.is_compressible(headers.get("content-type"))
+      )
+      if eligible:
+        # Cached news responses already vary on it; add_vary_header appends unconditionally
+        vary = {token.strip().lower() for token in headers.get("vary", "").split(",")}
+        if not vary & {"accept-encoding", "*"}:
+          headers.add_vary_header("Accept-Encoding")
+      if not eligible or codec is None or (not more_body and len(body) < self.compressor.min_size):
+        passthrough = True
+        await send(start)
+        await send(message)
+        return
+
+      headers["Content-Encoding"] = codec.encoding
+      etag = headers.get("etag")
+      if etag and not etag.startswith("W/"):
+        headers["ETag"] = f"W/{etag}"
+      if more_body:
+        stream = codec.stream()
+        if "content-length" in headers:
+          del headers["Content-Length"]
+        body = stream.compress(body)
+      else:
+        body = codec.compress(body)
+        headers["Content-Length"] = str(len(body))
+      await send(start)
+      await send({"type": "http.response.body", "body": body, "more_body": more_body})
+
+    await self.app(scope, receive, compressing_send)
@@ -2,19 +2,11 @@
 from fastapi import HTTPException, status
 from datetime import datetime, timedelta, UTC
 from typing import Optional
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+from jose import JWTError
 from app.core.config import settings
+from app.core.tokens import encode_token, get_token_verifier
 import bcrypt
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-def _get_secret_key() -> str:
-  """Return SECRET_KEY as str or raise if not configured (helps static type checkers)."""
-  if settings.SECRET_KEY is None:
-    raise RuntimeError("SECRET_KEY is not configured")
-  return settings.SECRET_KEY
-
 #def verify_password(plain_password: str, hashed_password: str) -> bool:
 #  """Verify password (similar to Django's check_password)"""
 #  return pwd_context.verify(plain_password, hashed_password)
@@ -53,21 +45,18 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
   to_encode = data.copy()
   expire = datetime.now(UTC) + (expires_delta or timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES))
   to_encode.update({"exp": expire, "type": "access"})
-  encode_jwt = jwt.encode(to_encode, _get_secret_key(), algorithm=settings.ALGORITHM)
+  encode_jwt = encode_token(to_encode)
   return encode_jwt
 
 def create_refresh_token(data: dict):
   to_encode = data.copy()
   expire = datetime.now(UTC) + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
   to_encode.update({"exp": expire, "type": "refresh"})
-  return jwt.encode(to_encode, _get_secret_key(), algorithm=settings.ALGORITHM)
+  return encode_token(to_encode)
 
 def verify_token(token: str, token_type: str) -> dict:
   """Verify JWT token and return the payload if valid."""
   try:
-    payload = jwt.decode(token, _get_secret_key(), algorithms=[settings.ALGORITHM])
-    if payload.get("type") != token_type:
-      raise JWTError("Invalid token type")
-    return payload
+    return get_token_verifier().verify(token, token_type)
   except JWTError as e:
     raise JWTError(f"Token verification failed: {str(e)}")
\ No newline at end of file
@@ -0,0 +1,153 @@
+# app/core/tokens.py | JWT verification with a verified-claims cache
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+# Only the exceptions: jose.jwt pulls in cryptography, imported on demand below
+from jose import JWTError
+
+from app.core.config import settings
+from app.utils.cache import TTLCache
+
+_HMAC_DIGESTS = {
+  "HS256": hashlib.sha256,
+  "HS384": hashlib.sha384,
+  "HS512": hashlib.sha512,
+}
+
+
+def _get_secret_key() -> str:
+  """Return SECRET_KEY as str or raise if not configured (helps static type checkers)."""
+  if settings.SECRET_KEY is None:
+    raise RuntimeError("SECRET_KEY is not configured")
+  return settings.SECRET_KEY
+
+
+def _b64decode(segment: str) -> bytes:
+  return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+
+
+def _b64encode(data: bytes) -> str:
+  return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def encode_hmac_jwt(claims: Dict[str, Any], key: str, algorithm: str) -> str:
+  """Sign claims as an HS256/384/512 JWT; datetime values become epoch seconds, as with jose."""
+  claims = {
+    name: int(value.timestamp()) if isinstance(value, datetime) else value
+    for name, value in claims.items()
+  }
+  header_segment = _b64encode(json.dumps({"alg": algorithm, "typ": "JWT"}, separators=(",", ":")).encode("utf-8"))
+  payload_segment = _b64encode(json.dumps(claims, separators=(",", ":")).encode("utf-8"))
+  signing_input = f"{header_segment}.{payload_segment}".encode("ascii")
+  signature = hmac.new(key.encode("utf-8"), signing_input, _HMAC_DIGESTS[algorithm]).digest()
+  return f"{header_segment}.{payload_segment}.{_b64encode(signature)}"
+
+
+def encode_token(claims: Dict[str, Any]) -> str:
+  """Sign claims with SECRET_KEY and ALGORITHM using the configured JWT_BACKEND."""
+  if settings.JWT_BACKEND == "native" and settings.ALGORITHM in _HMAC_DIGESTS:
+    return encode_hmac_jwt(claims, _get_secret_key(), settings.ALGORITHM)
+  from jose import jwt
+  return jwt.encode(claims, _get_secret_key(), algorithm=settings.ALGORITHM)
+
+
+def decode_hmac_jwt(token: str, key: str, algorithms: list[str]) -> Dict[str, Any]:
+  """
+    Verify an HS256/384/512 token with the standard library only.
+    Checks the signature, then exp and nbf, like jose.jwt.decode does for
+    these algorithms, and raises JWTError on any failure.
+  """
+  try:
+    header_segment, payload_segment, signature_segment = token.split(".")
+    header = json.loads(_b64decode(header_segment))
+    signature = _b64decode(signature_segment)
+  except (ValueError, binascii.Error):
+    raise JWTError("Malformed token")
+
+  algorithm = header.get("alg") if isinstance(header, dict) else None
+  if algorithm not in algorithms or algorithm not in _HMAC_DIGESTS:
+    raise JWTError("The specified alg value is not allowed")
+
+  signing_input = f"{header_segment}.{payload_segment}".encode("ascii")
+  expected = hmac.new(key.encode("utf-8"), signing_input, _HMAC_DIGESTS[algorithm]).digest()
+  if not hmac.compare_digest(expected, signature):
+    raise JWTError("Signature verification failed")
+
+  try:
+    claims = json.loads(_b64decode(payload_segment))
+  except (ValueError, binascii.Error):
+    raise JWTError("Invalid payload")
+  if not isinstance(claims, dict):
+    raise JWTError("Invalid payload")
+
+  now = time.time()
+  for claim, expired in (("exp", lambda value: value <= now), ("nbf", lambda value: value > now)):
+    if claim in claims:
+      if not isinstance(claims[claim], (int, float)):
+        raise JWTError(f"Invalid {claim} claim")
+      if expired(claims[claim]):
+        raise JWTError("Signature has expired" if claim == "exp" else "The token is not yet valid (nbf)")
+  return claims
+
+
+class TokenVerifier:
+  """
+    Single place where JWTs are verified.
+    backend="native" verifies HMAC tokens with hashlib/hmac and falls back to
+    python-jose for other algorithms; backend="jose" always uses python-jose.
+    Verified claims are cached by SHA-256 of the token until the token's exp,
+    so a client reusing its token pays for the signature check once.
+  """
+
+  def __init__(self, backend: str, cache_size: int):
+    self.backend = backend
+    self._cache: TTLCache[Dict[str, Any]] = TTLCache("tokens", cache_size, ttl=0)
+
+  def decode(self, token: str) -> Dict[str, Any]:
+    """Return the verified claims of token; the returned dict must not be modified."""
+    digest = hashlib.sha256(token.encode("utf-8")).digest()
+    claims = self._cache.get(digest)
+    if claims is not None:
+      # The cache TTL is the token lifetime, but expiry is checked exactly here
+      if "exp" not in claims or claims["exp"] > time.time():
+        return claims
+      self._cache.invalidate(digest)
+      raise JWTError("Signature has expired")
+
+    algorithms = [settings.ALGORITHM]
+    if self.backend == "native" and settings.ALGORITHM in _HMAC_DIGESTS:
+      claims = decode_hmac_jwt(token, _get_secret_key(), algorithms)
+    else:
+      from jose import jwt
+      claims = jwt.decode(token, _get_secret_key(), algorithms=algorithms)
+
+    if isinstance(claims.get("exp"), (int, float)):
+      self._cache.set(digest, claims, ttl=claims["exp"] - time.time())
+    return claims
+
+  def verify(self, token: str, token_type: str) -> Dict[str, Any]:
+    """Verify token and check that it is of the expected type ("access" or "refresh")."""
+    claims = self.decode(token)
+    if claims.get("type") != token_type:
+      raise JWTError("Invalid token type")
+    return claims
+
+  def clear(self) -> None:
+    self._cache.clear()
+
+
+_token_verifier: Optional[TokenVerifier] = None
+
+
+def get_token_verifier() -> TokenVerifier:
+  """Return the shared token verifier."""
+  global _token_verifier
+  if _token_verifier is None:
+    _token_verifier = TokenVerifier(settings.JWT_BACKEND, settings.TOKEN_CACHE_MAX_SIZE)
+  return _token_verifier
@@ -1,20 +1,203 @@
 # app/core/database/session.py | Database session management
+import asyncio
+import logging
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Iterator, Optional
+
 from sqlmodel import SQLModel
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy import event, exc
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession, AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from app.core.config import settings
+from app.core.metrics import Gauge, Histogram
+
+
+POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled database connection",
+    labelnames=("engine",),
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0, 30.0),
+)
+POOL_IN_USE = Gauge("db_pool_connections_in_use", "Connections currently checked out", labelnames=("engine",))
+POOL_IDLE = Gauge("db_pool_connections_idle", "Connections sitting idle in the pool", labelnames=("engine",))
+POOL_OVERFLOW = Gauge("db_pool_overflow", "Connections open beyond DB_POOL_SIZE", labelnames=("engine",))
+QUERY_DURATION = Histogram(
+    "db_query_duration_seconds",
+    "Time spent executing a single SQL statement",
+    labelnames=("engine",),
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0),
+)
+
+logger = logging.getLogger(__name__)
+
+EXPLAIN_PREFIXES = {"postgresql": "EXPLAIN ", "sqlite": "EXPLAIN QUERY PLAN "}
+
+
+@dataclass
+class QueryStats:
+    """SQL statements run and time spent in the database on behalf of one request."""
+    count: int = 0
+    duration: float = 0.0
+
+
+_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Count every statement executed in this context (one request) into the yielded QueryStats."""
+    stats = QueryStats()
+    token = _query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _query_stats.reset(token)
+
+
+def _redact(parameters: Any, executemany: bool) -> Any:
+    # Keep the shape and types of the parameters, never their values
+    if executemany:
+        return f"<{len(parameters)} parameter sets>"
+    if isinstance(parameters, dict):
+        return {name: type(value).__name__ for name, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+def _explain(connection, statement: str, parameters: Any) -> Optional[str]:
+    prefix = EXPLAIN_PREFIXES.get(connection.dialect.name)
+    if prefix is None:
+        return None
+    # A raw DBAPI cursor: runs on the same connection/transaction without firing engine events
+    cursor = connection.connection.cursor()
+    try:
+        cursor.execute(prefix + statement, parameters)
+        return "\n".join(" ".join(str(column) for column in row) for row in cursor.fetchall())
+    finally:
+        cursor.close()
+
+
+def _instrument_queries(engine: AsyncEngine, role: str) -> None:
+    """Time every statement; count it against the current request and log the slow ones."""
+    slow_seconds = settings.DB_SLOW_QUERY_MS / 1000
+    explain_rate = settings.DB_EXPLAIN_SAMPLE_RATE if settings.ENVIRONMENT != "production" else 0.0
+    duration_metric = QUERY_DURATION.labels(role)
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _start_timer(connection, cursor, statement, parameters, context, executemany):
+        context._query_started = time.perf_counter()
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def _record_query(connection, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - context._query_started
+        duration_metric.observe(elapsed)
+        stats = _query_stats.get()
+        if stats is not None:
+            stats.count += 1
+            stats.duration += elapsed
+        if elapsed < slow_seconds:
+            return
+
+        plan = None
+        if (
+            explain_rate
+            and not executemany
+            and not context.execution_options.get("stream_results")
+            and statement.lstrip()[:6].upper() == "SELECT"
+            and random.random() < explain_rate
+        ):
+            try:
+                plan = _explain(connection, statement, parameters)
+            except Exception:
+                logger.warning("EXPLAIN failed for slow query", exc_info=True)
+        logger.warning(
+            "Slow query (%.1f ms, engine=%s): %s | parameters=%s%s",
+            elapsed * 1000, role, statement, _redact(parameters, executemany),
+            f"\nPlan:\n{plan}" if plan else "",
+        )
+
+
+def _to_async_url(url: Optional[str]) -> Optional[str]:
+    # Convert postgresql:// to postgresql+asyncpg://
+    return url.replace("postgresql://", "postgresql+asyncpg://") if url else None
+
+
+def _instrumented_pool(role: str) -> type:
+    """Queue pool that records how long each checkout waited; the role labels the metrics."""
+    class InstrumentedPool(AsyncAdaptedQueuePool):
+        def _do_get(self):
+            started = time.perf_counter()
+            try:
+                return super()._do_get()
+            finally:
+                POOL_CHECKOUT_WAIT.labels(role).observe(time.perf_counter() - started)
+
+    InstrumentedPool.__name__ = f"InstrumentedPool[{role}]"
+    return InstrumentedPool
+
+
+def _ping_idle_connections(engine: AsyncEngine, idle_seconds: float) -> None:
+    """
+    Pre-ping only connections that sat idle for longer than idle_seconds.
+    Connections reused right away (the common case under load) skip the extra round trip.
+    """
+    @event.listens_for(engine.sync_engine.pool, "checkin")
+    def _record_checkin(dbapi_connection, connection_record):
+        connection_record.info["checked_in_at"] = time.monotonic()
+
+    @event.listens_for(engine.sync_engine.pool, "checkout")
+    def _ping_if_idle(dbapi_connection, connection_record, connection_proxy):
+        checked_in_at = connection_record.info.get("checked_in_at")
+        if checked_in_at is None or time.monotonic() - checked_in_at < idle_seconds:
+            return
+        try:
+            engine.sync_engine.dialect.do_ping(dbapi_connection)
+        except Exception as error:
+            # The pool discards this connection and retries the checkout with a new one
+            raise exc.DisconnectionError() from error
+
+
+def _create_engine(url: Optional[str], role: str) -> AsyncEngine:
+    options = {
+        "echo": False,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING == "always",
+        "pool_recycle": settings.DB_POOL_RECYCLE,  # Prevents connection timeouts with Neon
+    }
+    # In-memory SQLite uses a single static connection and takes no sizing options
+    queue_pool = not (url and url.startswith("sqlite") and ":memory:" in url)
+    if queue_pool:
+        options.update(
+            poolclass=_instrumented_pool(role),
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+        )
+    new_engine = create_async_engine(url, **options)
+
+    if settings.DB_POOL_PRE_PING == "idle":
+        _ping_idle_connections(new_engine, settings.DB_POOL_PRE_PING_IDLE_SECONDS)
+    _instrument_queries(new_engine, role)
+    if queue_pool:
+        # Read the pool attribute on every scrape: dispose() replaces the pool object
+        POOL_IN_USE.labels(role).set_function(lambda: new_engine.sync_engine.pool.checkedout())
+        POOL_IDLE.labels(role).set_function(lambda: new_engine.sync_engine.pool.checkedin())
+        POOL_OVERFLOW.labels(role).set_function(lambda: max(new_engine.sync_engine.pool.overflow(), 0))
+    return new_engine
 
 
 # Create async engine for Neon DB (critical!)
-# Convert postgresql:// to postgresql+asyncpg://
-async_database_url = settings.DATABASE_URL.replace(
-    "postgresql://", "postgresql+asyncpg://"
-) if settings.DATABASE_URL else None
-
-engine = create_async_engine(
-    async_database_url,
-    echo=False,
-    pool_pre_ping=True,
-    pool_recycle=300,  # Prevents connection timeouts with Neon
+async_database_url = _to_async_url(settings.DATABASE_URL)
+engine = _create_engine(async_database_url, "primary")
+
+# Optional read replica for read-only routes; falls back to the primary
+read_engine = (
+    _create_engine(_to_async_url(settings.DATABASE_READ_URL), "replica")
+    if settings.DATABASE_READ_URL else engine
 )
 
 AsyncSessionLocal = async_sessionmaker(
@@ -23,6 +206,12 @@ AsyncSessionLocal = async_sessionmaker(
     expire_on_commit=False
 )
 
+AsyncReadSessionLocal = async_sessionmaker(
+    bind=read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False
+)
+
 async def get_db():
     async with AsyncSessionLocal() as session:
         try:
@@ -30,7 +219,33 @@ async def get_db():
         finally:
             await session.close()
 
+async def get_read_db():
+    """Session for read-only handlers; uses the replica when DATABASE_READ_URL is set."""
+    async with AsyncReadSessionLocal() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
+
+async def warm_up_pools(connections: int) -> None:
+    """
+    Open up to `connections` pooled connections per engine concurrently and return
+    them to the pool, so the first requests after a cold start skip connect + TLS.
+    """
+    engines = {engine, read_engine}
+    for target in engines:
+        count = min(connections, settings.DB_POOL_SIZE)
+        if count <= 0:
+            continue
+        opened = await asyncio.gather(*(target.connect() for _ in range(count)))
+        for connection in opened:
+            await connection.close()
+
+async def dispose_engines() -> None:
+    for target in {engine, read_engine}:
+        await target.dispose()
+
 # Async table creation
 async def create_db_and_tables():
     async with engine.begin() as conn:
-        await conn.run_sync(SQLModel.metadata.create_all)
\ No newline at end of file
+        await conn.run_sync(SQLModel.metadata.create_all)
@@ -1,26 +1,49 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.staticfiles import StaticFiles
 from contextlib import asynccontextmanager
 from app.core.config import settings
+from app.core.metrics import CONTENT_TYPE_LATEST, render_metrics
+from app.core.middleware import CompressionMiddleware, ConcurrencyLimitMiddleware, MetricsMiddleware
 from app.api.v1.endpoints.auth import auth_router
 from app.api.v1.endpoints.users import users_router
 from app.api.v1.endpoints.items import item_router
 from app.api.v1.endpoints.news import news_router
-from app.database.session import create_db_and_tables
+from app.database.session import create_db_and_tables, dispose_engines, warm_up_pools
+from app.services.image_pipeline import close_image_pipeline
+from app.services.login_throttle import close_login_throttle
+from app.services.news_publisher import close_news_publisher, get_news_publisher
+from app.services.password_hasher import close_password_hasher
+from app.services.storage import close_storage
 
 @asynccontextmanager
 async def life_span(app: FastAPI):
-    await create_db_and_tables()
-    print("Database tables created")
+    # Clients (ImageKit, storage and hashing pools) are created on first use, not here
+    if settings.DB_CREATE_TABLES_ON_STARTUP:
+        await create_db_and_tables()
+        print("Database tables created")
+    await warm_up_pools(settings.DB_POOL_WARMUP)
+    if settings.NEWS_PUBLISHER_ENABLED:
+        get_news_publisher().start()
     yield
+    await close_news_publisher()
+    close_storage()
+    close_image_pipeline()
+    close_login_throttle()
+    close_password_hasher()
+    await dispose_engines()
 
 app = FastAPI(
   title=settings.PROJECT_NAME,
   description=settings.DESCRIPTION,
   version="1.0.0",
-#  lifespan=life_span
+  lifespan=life_span
 )
 
+# Innermost: shed before any handler work, but inside CORS so 503s carry CORS headers
+if settings.CONCURRENCY_LIMIT_ENABLED:
+  app.add_middleware(ConcurrencyLimitMiddleware)
+
 # CORS middleware
 app.add_middleware(
   CORSMiddleware,
@@ -30,7 +53,25 @@ app.add_middleware(
   allow_headers=["*"],
 )
 
+# Inside the metrics middleware so response sizes are the bytes actually sent
+if settings.COMPRESSION_ENABLED:
+  app.add_middleware(CompressionMiddleware)
+
+# Added last so it wraps everything else and times the whole request
+app.add_middleware(MetricsMiddleware)
+
 app.include_router(auth_router, prefix="/api/v1/auth", tags=["auth"])
 app.include_router(users_router, prefix="/api/v1/users", tags=["users"])
 app.include_router(item_router, prefix="/api/v1/items", tags=["items"])
-app.include_router(news_router, prefix="/api/v1/news", tags=["news"])
\ No newline at end of file
+app.include_router(news_router, prefix="/api/v1/news", tags=["news"])
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+  """ Prometheus scrape endpoint """
+  return Response(render_metrics(), media_type=CONTENT_TYPE_LATEST)
+
+
+# Serve uploaded files when they are stored on the local filesystem
+if settings.STORAGE_BACKEND == "local":
+  app.mount(settings.LOCAL_STORAGE_BASE_URL, StaticFiles(directory=settings.LOCAL_STORAGE_DIR, check_dir=False), name="media")
@@ -1,9 +1,20 @@
 # models/items.py
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field
 from typing import Optional
 
-class Item(SQLModel):
+class Item(SQLModel, table=True):
+    __table_args__ = (
+        # Each backs one sort order of the catalog listing (keyset on (column, id))
+        # and the matching filter: price range, or name prefix as a range scan
+        Index("ix_item_price_id", "price", "id"),
+        Index("ix_item_name_id", "name", "id"),
+        # PostgreSQL orders ix_item_name_id by the database collation; the name
+        # prefix range needs byte order there (listed in migrations/env.py for autogenerate)
+        Index("ix_item_name_pattern", "name", postgresql_ops={"name": "text_pattern_ops"}).ddl_if(dialect="postgresql"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
-    name: str
+    name: str = Field(max_length=255, nullable=False)
     description: Optional[str] = None
-    price: float
\ No newline at end of file
+    price: float = Field(nullable=False)
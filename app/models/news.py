@@ -1,12 +1,32 @@
 from datetime import date, datetime, timezone
 from typing import Optional
 from uuid import uuid4, UUID
-from sqlalchemy import Column, DateTime, String, func
+from sqlalchemy import DDL, Boolean, Column, DateTime, Index, String, and_, column, event, false, func, literal_column, true
+from sqlalchemy.orm import attributes
 from sqlmodel import SQLModel, Field
+from app.utils.preview_text_generator import generate_excerpt
+
+DRAFT = "draft"
+PUBLISHED = "published"
+
+# Predicates of the partial indexes below. SQLite only uses a partial index when
+# the query repeats its predicate with the same literals, so queries must use
+# these expressions (true()/false() and literal_column, never bound parameters).
+IS_PUBLISHED = column("is_published", Boolean) == true()
+IS_DRAFT = and_(column("is_published", Boolean) == false(), column("status", String) == literal_column(f"'{DRAFT}'"))
   
 
 class News(SQLModel, table=True):
    """ Represents a news article in the database. """
+   __table_args__ = (
+      # Backs keyset pagination of the news list: ORDER BY created_at DESC, id DESC
+      Index("ix_news_created_at_id", "created_at", "id"),
+      # Public feed: published articles only, ORDER BY publication_date DESC, id DESC
+      Index("ix_news_published_feed", "publication_date", "id", postgresql_where=IS_PUBLISHED, sqlite_where=IS_PUBLISHED),
+      # Scheduled publisher: drafts by the date they go live
+      Index("ix_news_draft_publication_date", "publication_date", postgresql_where=IS_DRAFT, sqlite_where=IS_DRAFT),
+   )
+
    # Primary Key
    id: UUID = Field(default_factory=uuid4, primary_key=True, index=True, description="Unique news article identifier")
    # Core News Information
@@ -14,11 +34,17 @@ class News(SQLModel, table=True):
    content: str = Field(sa_column=Column(String, nullable=True), description="Content of the news article")
    preview_text: Optional[str] = Field(default=None, sa_column=Column(String, nullable=True), description="Preview text of the article")
    author: Optional[str] = Field(default=None, max_length=100)
-   publication_date: Optional[datetime] = Field(default_factory=datetime.utcnow)
+   # Naive UTC. A draft with a publication_date is scheduled: the publisher publishes it
+   # once the date has passed. Drafts without one stay drafts
+   publication_date: Optional[datetime] = Field(default=None)
    image_url: Optional[str] = Field(default=None, max_length=2048, description="ImageKit public URL")
+   image_avif_url: Optional[str] = Field(default=None, max_length=2048, description="AVIF variant of the image")
+   image_width: Optional[int] = Field(default=None, description="Width of the stored image in pixels")
+   image_height: Optional[int] = Field(default=None, description="Height of the stored image in pixels")
+   image_placeholder: Optional[str] = Field(default=None, sa_column=Column(String, nullable=True), description="Tiny blurred preview as a data: URI")
    # Status Fields
    is_published: bool = Field(default=False)
-   status: str = Field(default="draft", max_length=20) # e.g., 'draft', 'published', 'archived'
+   status: str = Field(default=DRAFT, max_length=20) # e.g., 'draft', 'published', 'archived'
 
    # Timestamps (auto-managed)
    created_at: datetime = Field(
@@ -32,4 +58,54 @@ class News(SQLModel, table=True):
    
    # Representation in admin/logs
    def __repr__(self) -> str:
-      return f"<NewsArticle: {self.title}>"
\ No newline at end of file
+      return f"<NewsArticle: {self.title}>"
+
+
+@event.listens_for(News, "before_insert")
+def _fill_preview_text_on_insert(mapper, connection, target: News) -> None:
+   """ Store the excerpt with the article so the read path never computes it """
+   if not target.preview_text:
+      target.preview_text = generate_excerpt(target.content)
+
+
+@event.listens_for(News, "before_update")
+def _refresh_preview_text_on_update(mapper, connection, target: News) -> None:
+   """ Regenerate the excerpt when content changes, unless it was set explicitly """
+   content_changed = attributes.get_history(target, "content").has_changes()
+   preview_changed = attributes.get_history(target, "preview_text").has_changes()
+   if content_changed and not preview_changed:
+      target.preview_text = generate_excerpt(target.content)
+
+
+@event.listens_for(News, "before_update")
+def _touch_updated_at(mapper, connection, target: News) -> None:
+   """ server_onupdate only describes a database trigger; set the timestamp here so it really changes """
+   target.updated_at = datetime.now(timezone.utc)
+
+
+# Full-text search objects for databases built with create_all().
+# Alembic revision 0003_news_search creates the same objects on migrated databases.
+# news_fts rows share the rowid of their news row: news_id is UNINDEXED, so the
+# triggers find the row by rowid (news_id only guards against a mismatch).
+NEWS_SEARCH_DDL = {
+   "postgresql": [
+      "ALTER TABLE news ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+      "setweight(to_tsvector('french', coalesce(title, '')), 'A') || "
+      "setweight(to_tsvector('french', coalesce(content, '')), 'B')) STORED",
+      "CREATE INDEX ix_news_search_vector ON news USING gin (search_vector)",
+   ],
+   "sqlite": [
+      "CREATE VIRTUAL TABLE news_fts USING fts5("
+      "news_id UNINDEXED, title, content, tokenize = 'unicode61 remove_diacritics 2')",
+      "CREATE TRIGGER news_fts_ai AFTER INSERT ON news BEGIN "
+      "INSERT INTO news_fts (rowid, news_id, title, content) VALUES (new.rowid, new.id, new.title, new.content); END",
+      "CREATE TRIGGER news_fts_ad AFTER DELETE ON news BEGIN "
+      "DELETE FROM news_fts WHERE rowid = old.rowid AND news_id = old.id; END",
+      "CREATE TRIGGER news_fts_au AFTER UPDATE OF title, content ON news BEGIN "
+      "UPDATE news_fts SET title = new.title, content = new.content WHERE rowid = old.rowid AND news_id = old.id; END",
+   ],
+}
+
+for _dialect, _statements in NEWS_SEARCH_DDL.items():
+   for _statement in _statements:
+      event.listen(News.__table__, "after_create", DDL(_statement).execute_if(dialect=_dialect))
@@ -1,13 +1,21 @@
 # app/models/user.py | User model definition
 from datetime import datetime
-from passlib.context import CryptContext
-from sqlalchemy import Column, Text, DateTime
+from functools import lru_cache
+from sqlalchemy import Column, Text, DateTime, event
 from sqlalchemy.sql import func
 from sqlmodel import SQLModel, Field
 from typing import Optional
 from uuid import uuid4, UUID
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+def normalize_identifier(value: Optional[str]) -> Optional[str]:
+  """Form of an e-mail or username used for login lookups: trimmed and lowercased"""
+  return value.strip().lower() if value is not None else None
+
+@lru_cache(maxsize=1)
+def _pwd_context():
+  # passlib is only needed by the blocking helpers below; import it on first use
+  from passlib.context import CryptContext
+  return CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 class User(SQLModel, table=True):
   # Core fields
@@ -15,6 +23,9 @@ class User(SQLModel, table=True):
   id: UUID = Field(default_factory=uuid4, primary_key=True, index=True)
   email: str = Field(max_length=255, unique=True, index=True, nullable=False)
   username: Optional[str] = Field(default=None, max_length=150, unique=True, index=True)
+  # Lookup keys kept in sync with email/username (see sync_login_identifiers); login is case-insensitive
+  email_normalized: str = Field(default=None, max_length=255, unique=True, index=True, nullable=False)
+  username_normalized: Optional[str] = Field(default=None, max_length=150, unique=True, index=True)
 
   # Password
   password: str = Field(max_length=255, nullable=False)
@@ -44,13 +55,14 @@ class User(SQLModel, table=True):
 
   # ——— Additional methods ———
 
+  # These block on bcrypt; async code should use app.services.password_hasher instead
   def set_password(self, raw_password: str):
       """Hash and set the password"""
-      self.password = pwd_context.hash(raw_password)
+      self.password = _pwd_context().hash(raw_password)
 
   def check_password(self, raw_password: str) -> bool:
       """Verify a raw password against the stored hash"""
-      return pwd_context.verify(raw_password, self.password)
+      return _pwd_context().verify(raw_password, self.password)
 
   @property
   def full_name(self) -> str:
@@ -70,6 +82,11 @@ class User(SQLModel, table=True):
       """Module-level permission check"""
       return self.is_superuser
 
+  def sync_login_identifiers(self) -> None:
+      """Recompute the normalized login columns from email and username"""
+      self.email_normalized = normalize_identifier(self.email)
+      self.username_normalized = normalize_identifier(self.username)
+
   def get_username(self) -> str:
       """Return username or fallback to email"""
       return self.username or self.email
@@ -79,4 +96,10 @@ class User(SQLModel, table=True):
 
   # Optional: Nice representation in admin/logs
   def __repr__(self) -> str:
-      return f"<User {self.id}: {self.get_username()} ({'active' if self.is_active else 'inactive'})>"
\ No newline at end of file
+      return f"<User {self.id}: {self.get_username()} ({'active' if self.is_active else 'inactive'})>"
+
+
+@event.listens_for(User, "before_insert")
+@event.listens_for(User, "before_update")
+def _sync_login_identifiers(mapper, connection, target: User) -> None:
+  target.sync_login_identifiers()
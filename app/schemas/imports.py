@@ -0,0 +1,20 @@
+# schemas/imports.py
+from typing import List
+from pydantic import BaseModel
+
+
+class ImportRowError(BaseModel):
+    """ A rejected NDJSON line (1-based) and why """
+    line: int
+    error: str
+
+
+class ImportReport(BaseModel):
+    """ Outcome of a bulk import; rows not listed in errors were inserted """
+    inserted: int = 0
+    failed: int = 0
+    errors: List[ImportRowError] = []
+
+    def add_error(self, line: int, error: str) -> None:
+        self.failed += 1
+        self.errors.append(ImportRowError(line=line, error=error))
@@ -1,4 +1,6 @@
 # schemas/items.py
+from enum import Enum
+from typing import List, Optional
 from pydantic import BaseModel
 from datetime import datetime
 
@@ -14,7 +16,24 @@ class ItemRead(BaseModel):
     price: float
     #created_at: datetime
 
+    class Config:
+        from_attributes = True
+
 class ItemUpdate(BaseModel):
     name: str | None = None
     description: str | None = None
-    price: float | None = None
\ No newline at end of file
+    price: float | None = None
+
+
+class ItemSort(str, Enum):
+    """ Listing order; a leading "-" means descending. Ties are broken by id """
+    name = "name"
+    name_desc = "-name"
+    price = "price"
+    price_desc = "-price"
+
+
+class ItemPage(BaseModel):
+    """ One page of items; pass next_cursor back (with the same sort and filters) to get the next one """
+    items: List[ItemRead]
+    next_cursor: Optional[str] = None
@@ -1,13 +1,32 @@
-from datetime import date, datetime
-from typing import Optional
-from pydantic import BaseModel
+from datetime import date, datetime, timezone
+from typing import List, Optional
+from pydantic import BaseModel, Field, field_validator
 from uuid import UUID
 
 # Schemas for News
 class NewsCreate(BaseModel):
-    title: str
+    # Lengths match the News columns, so oversized values are a 422 rather than a database error
+    title: str = Field(max_length=250)
     content: str
-    image_url: Optional[str] = None
+    image_url: Optional[str] = Field(default=None, max_length=2048)
+    image_avif_url: Optional[str] = Field(default=None, max_length=2048)
+    image_width: Optional[int] = None
+    image_height: Optional[int] = None
+    image_placeholder: Optional[str] = None
+    publication_date: Optional[datetime] = None
+
+    @field_validator("publication_date")
+    @classmethod
+    def _as_naive_utc(cls, value: Optional[datetime]) -> Optional[datetime]:
+        """ publication_date is stored as naive UTC """
+        if value is not None and value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+
+
+class NewsImport(NewsCreate):
+    """ One line of a news NDJSON import; created_at keeps the original date of migrated articles """
+    created_at: Optional[datetime] = None
 
 
 class NewsRead(NewsCreate):
@@ -17,6 +36,35 @@ class NewsRead(NewsCreate):
     updated_at: datetime
 
 
+class NewsSummary(BaseModel):
+    """ News article as shown in lists (no content body) """
+    id: UUID
+    title: str
+    preview_text: Optional[str]
+    image_url: Optional[str] = None
+    image_avif_url: Optional[str] = None
+    image_width: Optional[int] = None
+    image_height: Optional[int] = None
+    image_placeholder: Optional[str] = None
+    publication_date: Optional[datetime] = None
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class NewsSearchResult(NewsSummary):
+    """ News article matched by a search, with its relevance (higher is better) """
+    rank: float
+
+
+class NewsPage(BaseModel):
+    """ One page of news articles (list or feed); pass next_cursor back to get the next one """
+    items: List[NewsSummary]
+    next_cursor: Optional[str] = None
+
+
 #class NewsUpdate(BaseModel):
 #    title: Optional[str] = None
 #    published_date: Optional[date] = None
\ No newline at end of file
@@ -2,15 +2,16 @@
 # schemas/user.py
 from typing import Optional
 from datetime import datetime
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from uuid import UUID
 
 class UserCreate(BaseModel):
-  email: str
-  username: Optional[str] = None
+  # Lengths match the User columns, so oversized values are a 422 rather than a database error
+  email: str = Field(max_length=255)
+  username: Optional[str] = Field(default=None, max_length=150)
   password: str
-  first_name: Optional[str] = None
-  last_name: Optional[str] = None
+  first_name: Optional[str] = Field(default=None, max_length=150)
+  last_name: Optional[str] = Field(default=None, max_length=150)
 
   def password_validator(self) -> None:
     if len(self.password) < 8:
@@ -0,0 +1,83 @@
+# app/scripts/backfill_news_preview.py | Fill News.preview_text for existing rows
+"""
+Backfill News.preview_text in bounded batches.
+
+Usage:
+    python -m app.scripts.backfill_news_preview [--batch-size 500] [--max-batches N]
+
+Each batch is committed on its own, and only rows whose preview_text is still
+empty are selected, so the command can be interrupted and re-run at any time:
+it picks up where the previous run stopped.
+"""
+import argparse
+import asyncio
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import or_, update
+from sqlmodel import select
+
+from app.database.session import AsyncSessionLocal, engine
+from app.models.news import News
+from app.utils.preview_text_generator import generate_excerpts
+
+
+async def backfill_preview_text(batch_size: int = 500, max_batches: Optional[int] = None) -> int:
+  """Generate and store preview_text for rows that lack one; return the number of rows updated."""
+  updated = 0
+  batches = 0
+  last_id = None
+
+  while max_batches is None or batches < max_batches:
+    async with AsyncSessionLocal() as session:
+      statement = (
+        select(News.id, News.content)
+        .where(or_(News.preview_text.is_(None), News.preview_text == ""))
+        .order_by(News.id)
+        .limit(batch_size)
+      )
+      # Walk forward by id so rows whose excerpt is empty are not selected again
+      if last_id is not None:
+        statement = statement.where(News.id > last_id)
+      rows = (await session.execute(statement)).all()
+      if not rows:
+        break
+
+      # Bulk updates skip the mapper events, so updated_at (which feeds the ETag and
+      # Last-Modified of the news routes) is set here; clients then refetch the rows
+      now = datetime.now(timezone.utc)
+      await session.execute(
+        update(News).execution_options(synchronize_session=False),
+        [
+          {"id": row.id, "preview_text": preview, "updated_at": now}
+          for row, preview in zip(rows, generate_excerpts(row.content for row in rows))
+        ],
+      )
+      await session.commit()
+
+    last_id = rows[-1].id
+    updated += len(rows)
+    batches += 1
+    print(f"Batch {batches}: {len(rows)} rows updated (last id {last_id})")
+
+  return updated
+
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description="Backfill News.preview_text in batches")
+  parser.add_argument("--batch-size", type=int, default=500, help="Rows per transaction")
+  parser.add_argument("--max-batches", type=int, default=None, help="Stop after this many batches")
+  args = parser.parse_args()
+
+  async def run() -> int:
+    try:
+      return await backfill_preview_text(args.batch_size, args.max_batches)
+    finally:
+      await engine.dispose()
+
+  total = asyncio.run(run())
+  print(f"Done: {total} rows updated")
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,179 @@
+# app/services/bulk_import.py | NDJSON bulk imports of news and users
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple, Type, TypeVar
+
+from fastapi import HTTPException
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import Table, insert, or_
+from sqlalchemy.exc import DBAPIError
+from sqlmodel import SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models.news import News
+from app.models.users import User, normalize_identifier
+from app.schemas.imports import ImportReport
+from app.schemas.news import NewsImport
+from app.schemas.users import UserCreate
+from app.services.password_hasher import get_password_hasher
+from app.utils.preview_text_generator import generate_excerpts
+
+RowT = TypeVar("RowT", bound=BaseModel)
+
+# The body is read as a stream, so it is documented by hand rather than through a model
+NDJSON_REQUEST_BODY = {
+  "requestBody": {"content": {"application/x-ndjson": {"schema": {"type": "string"}}}, "required": True}
+}
+
+# (line number, parsed row)
+Batch = List[Tuple[int, RowT]]
+
+
+async def ndjson_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, bytes]]:
+  """Split a streamed body into (1-based line number, line) pairs, skipping blank lines."""
+  pending = b""
+  line_number = 0
+  async for chunk in chunks:
+    pending += chunk
+    *lines, pending = pending.split(b"\n")
+    for line in lines:
+      line_number += 1
+      if line.strip():
+        yield line_number, line
+  if pending.strip():
+    yield line_number + 1, pending
+
+
+def _describe(error: ValidationError) -> str:
+  return "; ".join(
+    f"{'.'.join(str(part) for part in detail['loc'])}: {detail['msg']}" if detail["loc"] else detail["msg"]
+    for detail in error.errors()
+  )
+
+
+def _column_values(obj: SQLModel) -> Dict[str, object]:
+  # Going through the model applies its defaults (id, timestamps, status) like an ORM insert would
+  return {column.name: getattr(obj, column.name) for column in obj.__table__.columns}
+
+
+async def _insert_batch(
+  db: AsyncSession, table: Table, rows: List[Tuple[int, Dict[str, object]]], report: ImportReport
+) -> None:
+  """
+    Insert a batch in one transaction with a single executemany.
+    If the database rejects it (a unique value taken meanwhile, a value the
+    column cannot hold...), insert its rows one by one so only the offending
+    rows are reported.
+  """
+  if not rows:
+    return
+  try:
+    await db.execute(insert(table), [values for _, values in rows])
+    await db.commit()
+    report.inserted += len(rows)
+    return
+  except DBAPIError:
+    await db.rollback()
+
+  for line, values in rows:
+    try:
+      await db.execute(insert(table), [values])
+      await db.commit()
+      report.inserted += 1
+    except DBAPIError as error:
+      await db.rollback()
+      report.add_error(line, f"Rejected by the database: {error.orig}")
+
+
+async def _run_import(
+  lines: AsyncIterator[Tuple[int, bytes]],
+  schema: Type[RowT],
+  batch_size: int,
+  insert_batch: Callable[[Batch, ImportReport], Awaitable[None]],
+  check: Optional[Callable[[RowT], None]] = None,
+) -> ImportReport:
+  report = ImportReport()
+  batch: Batch = []
+  async for line, raw in lines:
+    try:
+      row = schema.model_validate_json(raw)
+      if check:
+        check(row)
+    except ValidationError as error:
+      report.add_error(line, _describe(error))
+      continue
+    except ValueError as error:
+      report.add_error(line, str(error))
+      continue
+    batch.append((line, row))
+    if len(batch) >= batch_size:
+      await insert_batch(batch, report)
+      batch = []
+  if batch:
+    await insert_batch(batch, report)
+  report.errors.sort(key=lambda row_error: row_error.line)
+  return report
+
+
+async def import_news(db: AsyncSession, lines: AsyncIterator[Tuple[int, bytes]], batch_size: int) -> ImportReport:
+  """Insert NewsImport rows in batches; excerpts are generated per batch."""
+
+  async def insert_batch(batch: Batch[NewsImport], report: ImportReport) -> None:
+    previews = generate_excerpts(row.content for _, row in batch)
+    rows = []
+    for (line, row), preview in zip(batch, previews):
+      values = _column_values(News(**row.model_dump(exclude_none=True)))
+      values["preview_text"] = preview
+      rows.append((line, values))
+    await _insert_batch(db, News.__table__, rows, report)
+
+  return await _run_import(lines, NewsImport, batch_size, insert_batch)
+
+
+async def import_users(db: AsyncSession, lines: AsyncIterator[Tuple[int, bytes]], batch_size: int) -> ImportReport:
+  """Insert UserCreate rows in batches; passwords of a batch are hashed in parallel."""
+
+  async def insert_batch(batch: Batch[UserCreate], report: ImportReport) -> None:
+    # Reject duplicates before paying for bcrypt
+    emails = [normalize_identifier(row.email) for _, row in batch]
+    usernames = [normalize_identifier(row.username) for _, row in batch if row.username]
+    result = await db.execute(
+      select(User.email_normalized, User.username_normalized).where(
+        or_(User.email_normalized.in_(emails), User.username_normalized.in_(usernames))
+      )
+    )
+    taken_emails, taken_usernames = set(), set()
+    for email, username in result.all():
+      taken_emails.add(email)
+      taken_usernames.add(username)
+
+    accepted: Batch[UserCreate] = []
+    for line, row in batch:
+      email, username = normalize_identifier(row.email), normalize_identifier(row.username)
+      if email in taken_emails:
+        report.add_error(line, "User with this e-mail already registered")
+      elif username and username in taken_usernames:
+        report.add_error(line, "Username already taken")
+      else:
+        accepted.append((line, row))
+        taken_emails.add(email)
+        if username:
+          taken_usernames.add(username)
+    if not accepted:
+      return
+
+    try:
+      hashes = await get_password_hasher().hash_many([row.password for _, row in accepted])
+    except HTTPException as error:
+      # The hashing queue is full (login burst); these rows can simply be sent again
+      for line, _ in accepted:
+        report.add_error(line, f"Not imported, retry later: {error.detail}")
+      return
+
+    rows = []
+    for (line, row), password_hash in zip(accepted, hashes):
+      user = User(**row.model_dump(exclude={"password"}), password=password_hash)
+      # Core inserts skip the ORM events that fill these
+      user.sync_login_identifiers()
+      rows.append((line, _column_values(user)))
+    await _insert_batch(db, User.__table__, rows, report)
+
+  return await _run_import(lines, UserCreate, batch_size, insert_batch, check=UserCreate.password_validator)
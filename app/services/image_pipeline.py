@@ -0,0 +1,189 @@
+# app/services/image_pipeline.py | Validate, resize and re-encode uploaded images before storage
+import asyncio
+import base64
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional
+
+from fastapi import HTTPException, UploadFile, status
+
+from app.core.config import settings
+from app.services.storage import FileStorage
+
+ALLOWED_IMAGE_TYPES = {"image/jpeg", "image/png", "image/webp", "image/gif", "image/avif"}
+
+# Bytes handed to libmagic; enough for every allowed signature
+SNIFF_BYTES = 2048
+
+READ_CHUNK = 256 * 1024
+
+
+class ImageRejected(ValueError):
+  """Raised in a worker when the bytes cannot be turned into an acceptable image."""
+
+
+@dataclass
+class EncodedImage:
+  """Result of optimize_image; plain data so it can cross the process boundary."""
+  width: int
+  height: int
+  webp: bytes
+  avif: Optional[bytes]
+  placeholder: str
+
+
+@dataclass
+class StoredImage:
+  url: str
+  avif_url: Optional[str]
+  width: int
+  height: int
+  placeholder: str
+
+
+def optimize_image(
+  data: bytes,
+  max_dimension: int,
+  max_pixels: int,
+  max_width: int,
+  webp_quality: int,
+  avif_quality: Optional[int],
+  placeholder_width: int,
+) -> EncodedImage:
+  """
+    Decode, orient, downscale and re-encode one image (runs in a worker process).
+    Only the header is read before the size check, so oversized images are
+    rejected without being decoded.
+  """
+  from PIL import Image, ImageOps, UnidentifiedImageError, features
+
+  try:
+    image = Image.open(io.BytesIO(data))
+  except UnidentifiedImageError:
+    raise ImageRejected("The file is not a readable image")
+  except (OSError, Image.DecompressionBombError) as error:
+    # Pillow's own bomb check already runs on the header, for the largest images
+    raise ImageRejected(f"The image could not be decoded: {error}")
+  if image.width > max_dimension or image.height > max_dimension:
+    raise ImageRejected(f"Images may not exceed {max_dimension}x{max_dimension} pixels")
+  if image.width * image.height > max_pixels:
+    raise ImageRejected(f"Images may not exceed {max_pixels / 1_000_000:g} megapixels")
+
+  try:
+    image.load()
+  except (OSError, Image.DecompressionBombError) as error:
+    raise ImageRejected(f"The image could not be decoded: {error}")
+
+  # Apply the EXIF rotation so phone photos keep their orientation once metadata is dropped
+  image = ImageOps.exif_transpose(image)
+  image = image.convert("RGBA" if image.mode in ("RGBA", "LA", "P") and image.has_transparency_data else "RGB")
+  if image.width > max_width:
+    image = image.resize((max_width, round(image.height * max_width / image.width)), Image.Resampling.LANCZOS)
+
+  def encode(target: Image.Image, image_format: str, **options) -> bytes:
+    buffer = io.BytesIO()
+    target.save(buffer, format=image_format, **options)
+    return buffer.getvalue()
+
+  webp = encode(image, "WEBP", quality=webp_quality, method=4)
+  avif = None
+  if avif_quality is not None and features.check("avif"):
+    avif = encode(image, "AVIF", quality=avif_quality)
+
+  tiny = image.resize(
+    (placeholder_width, max(1, round(image.height * placeholder_width / image.width))), Image.Resampling.BILINEAR
+  )
+  placeholder = "data:image/webp;base64," + base64.b64encode(encode(tiny, "WEBP", quality=30)).decode("ascii")
+  return EncodedImage(image.width, image.height, webp, avif, placeholder)
+
+
+async def _read_limited(upload: UploadFile, limit: int) -> bytes:
+  chunks: List[bytes] = []
+  size = 0
+  while chunk := await upload.read(READ_CHUNK):
+    size += len(chunk)
+    if size > limit:
+      raise HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Images may not be larger than {limit // (1024 * 1024)} MB",
+      )
+    chunks.append(chunk)
+  return b"".join(chunks)
+
+
+class ImagePipeline:
+  """
+    Turns an uploaded image into web-ready variants before it reaches storage:
+    the real type is sniffed with libmagic (the client's Content-Type is not
+    trusted), size and dimensions are bounded, and the CPU-heavy decode/resize/
+    encode runs on a process pool so it neither blocks the event loop nor
+    holds the GIL.
+  """
+
+  def __init__(self, workers: int):
+    self._executor = ProcessPoolExecutor(max_workers=workers)
+
+  async def process(self, upload: UploadFile) -> EncodedImage:
+    data = await _read_limited(upload, settings.IMAGE_MAX_UPLOAD_BYTES)
+    import magic
+
+    mime_type = magic.from_buffer(data[:SNIFF_BYTES], mime=True)
+    if mime_type not in ALLOWED_IMAGE_TYPES:
+      raise HTTPException(
+        status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+        detail=f"Unsupported image type {mime_type}; expected one of {', '.join(sorted(ALLOWED_IMAGE_TYPES))}",
+      )
+    try:
+      return await asyncio.get_running_loop().run_in_executor(
+        self._executor, optimize_image, data,
+        settings.IMAGE_MAX_DIMENSION,
+        settings.IMAGE_MAX_PIXELS,
+        settings.IMAGE_OUTPUT_MAX_WIDTH,
+        settings.IMAGE_WEBP_QUALITY,
+        settings.IMAGE_AVIF_QUALITY if settings.IMAGE_AVIF_ENABLED else None,
+        settings.IMAGE_PLACEHOLDER_WIDTH,
+      )
+    except ImageRejected as error:
+      raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(error))
+
+  async def process_and_store(
+    self, upload: UploadFile, storage: FileStorage, tags: Optional[List[str]] = None
+  ) -> StoredImage:
+    """Optimize the upload, then store its variants concurrently."""
+    encoded = await self.process(upload)
+    stem = os.path.splitext(upload.filename or "image")[0] or "image"
+    uploads = [storage.save_bytes(encoded.webp, f"{stem}.webp", "image/webp", tags)]
+    if encoded.avif is not None:
+      uploads.append(storage.save_bytes(encoded.avif, f"{stem}.avif", "image/avif", tags))
+    stored = await asyncio.gather(*uploads)
+    return StoredImage(
+      url=stored[0].url,
+      avif_url=stored[1].url if len(stored) > 1 else None,
+      width=encoded.width,
+      height=encoded.height,
+      placeholder=encoded.placeholder,
+    )
+
+  def close(self) -> None:
+    self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_image_pipeline: Optional[ImagePipeline] = None
+
+
+def get_image_pipeline() -> ImagePipeline:
+  """Return the shared image pipeline (FastAPI dependency)."""
+  global _image_pipeline
+  if _image_pipeline is None:
+    _image_pipeline = ImagePipeline(settings.IMAGE_WORKERS)
+  return _image_pipeline
+
+
+def close_image_pipeline() -> None:
+  """Shut down the worker processes, if the pipeline was ever created."""
+  global _image_pipeline
+  if _image_pipeline is not None:
+    _image_pipeline.close()
+    _image_pipeline = None
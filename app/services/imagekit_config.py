@@ -1,14 +1,28 @@
 # app/services/imagekit_service.py
-from imagekitio import ImageKit
-from dotenv import load_dotenv
-#import os
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
 from app.core.config import settings
 
-load_dotenv()
+if TYPE_CHECKING:
+  from imagekitio import ImageKit
+
+
+@lru_cache(maxsize=1)
+def get_imagekit() -> "ImageKit":
+  """Build the ImageKit client on first use, so startup neither imports the SDK nor needs credentials."""
+  from imagekitio import ImageKit
+
+  # Retrieve credentials from settings (environment / .env)
+  return ImageKit(
+    private_key=settings.IMAGEKIT_PRIVATE_KEY,
+    public_key=settings.IMAGEKIT_PUBLIC_KEY,
+    url_endpoint=settings.IMAGEKIT_URL,
+  )
+
 
-# Retrieve credentials from environment variables
-imagekit = ImageKit(
-  private_key=settings.IMAGEKIT_PRIVATE_KEY,
-  public_key=settings.IMAGEKIT_PUBLIC_KEY,
-  url_endpoint=settings.IMAGEKIT_URL,
-)
\ No newline at end of file
+def __getattr__(name: str):
+  # Backwards compatibility for `from app.services.imagekit_config import imagekit`
+  if name == "imagekit":
+    return get_imagekit()
+  raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
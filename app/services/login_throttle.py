@@ -0,0 +1,343 @@
+# app/services/login_throttle.py | Brute-force protection for /auth/login, checked before any hashing
+import asyncio
+import math
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from typing import Deque, Dict, Optional, Tuple
+
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+from app.core.metrics import Counter
+from app.models.users import normalize_identifier
+
+THROTTLE_REJECTED = Counter(
+  "login_throttle_rejected_total", "Login attempts refused because the identifier or IP is locked out",
+  labelnames=("scope",),
+)
+THROTTLE_LOCKOUTS = Counter(
+  "login_throttle_lockouts_total", "Lockouts started after too many failed logins", labelnames=("scope",),
+)
+
+
+class ThrottleStore(ABC):
+  """
+    Where login attempts and lockouts are kept.
+    Keys are opaque strings ("id:<identifier>", "ip:<address>"); times are
+    epoch seconds. Implementations must be safe to share between requests.
+  """
+
+  @abstractmethod
+  async def record_attempt(self, key: str, now: float, window: float, not_before: float = 0.0) -> int:
+    """
+      Record an attempt for key and return the number of attempts within the
+      last `window` seconds and after not_before, this one included.
+    """
+
+  @abstractmethod
+  async def forget_attempt(self, key: str, at: float) -> None:
+    """Remove the attempt recorded for key at `at`, if it is still kept."""
+
+  @abstractmethod
+  async def get_lockout(self, key: str, now: float) -> Tuple[float, int]:
+    """Return (locked_until, strikes) for key; (0, 0) when it was never locked or has been forgiven."""
+
+  @abstractmethod
+  async def set_lockout(self, key: str, locked_until: float, strikes: int, forget_at: float) -> None:
+    """Lock key until locked_until; strikes are remembered until forget_at to make the next lockout longer."""
+
+  @abstractmethod
+  async def clear(self, key: str) -> None:
+    """Forget attempts, lockout and strikes for key."""
+
+  def close(self) -> None:
+    pass
+
+
+class MemoryThrottleStore(ThrottleStore):
+  """
+    Per-process store; enough for a single worker.
+    At most max_keys keys are kept per kind: beyond that the least recently
+    used key is dropped. Expired keys are dropped from the least recently used
+    end as new attempts come in, so each call does constant work on average.
+  """
+
+  def __init__(self, max_attempts_kept: int, max_keys: int = 100_000):
+    self.max_attempts_kept = max_attempts_kept
+    self.max_keys = max_keys
+    self._attempts: "OrderedDict[str, Deque[float]]" = OrderedDict()
+    self._lockouts: "OrderedDict[str, Tuple[float, int, float]]" = OrderedDict()
+
+  async def record_attempt(self, key: str, now: float, window: float, not_before: float = 0.0) -> int:
+    self._expire(now, window)
+    # A sliding log: only the most recent attempts are needed to decide on a lockout
+    attempts = self._attempts.get(key)
+    if attempts is None:
+      attempts = self._attempts[key] = deque(maxlen=self.max_attempts_kept)
+      if len(self._attempts) > self.max_keys:
+        self._attempts.popitem(last=False)
+    else:
+      self._attempts.move_to_end(key)
+    attempts.append(now)
+    cutoff = max(now - window, not_before)
+    while attempts and attempts[0] <= cutoff:
+      attempts.popleft()
+    return len(attempts)
+
+  async def forget_attempt(self, key: str, at: float) -> None:
+    attempts = self._attempts.get(key)
+    if attempts is not None and at in attempts:
+      attempts.remove(at)
+
+  async def get_lockout(self, key: str, now: float) -> Tuple[float, int]:
+    lockout = self._lockouts.get(key)
+    if lockout is None or lockout[2] <= now:
+      return 0.0, 0
+    return lockout[0], lockout[1]
+
+  async def set_lockout(self, key: str, locked_until: float, strikes: int, forget_at: float) -> None:
+    self._lockouts[key] = (locked_until, strikes, forget_at)
+    self._lockouts.move_to_end(key)
+    if len(self._lockouts) > self.max_keys:
+      self._lockouts.popitem(last=False)
+
+  async def clear(self, key: str) -> None:
+    self._attempts.pop(key, None)
+    self._lockouts.pop(key, None)
+
+  def _expire(self, now: float, window: float) -> None:
+    # Both dicts are in least recently written order, so expired keys gather at the front
+    while self._attempts:
+      key, attempts = next(iter(self._attempts.items()))
+      if attempts and attempts[-1] > now - window:
+        break
+      del self._attempts[key]
+    while self._lockouts:
+      key, lockout = next(iter(self._lockouts.items()))
+      if lockout[2] > now:
+        break
+      del self._lockouts[key]
+
+
+class SqliteThrottleStore(ThrottleStore):
+  """
+    Store in a SQLite file shared by every worker process on the host.
+    Each operation is one short transaction run on a worker thread; WAL mode
+    lets readers and the single writer proceed without blocking each other.
+  """
+
+  def __init__(self, path: str, max_attempts_kept: int):
+    self.max_attempts_kept = max_attempts_kept
+    self._lock = threading.Lock()
+    self._connection = sqlite3.connect(path, timeout=5.0, check_same_thread=False, isolation_level=None)
+    self._connection.execute("PRAGMA journal_mode=WAL")
+    self._connection.execute("PRAGMA synchronous=NORMAL")
+    self._connection.executescript(
+      """
+      CREATE TABLE IF NOT EXISTS login_failures (key TEXT NOT NULL, at REAL NOT NULL);
+      CREATE INDEX IF NOT EXISTS ix_login_failures_key_at ON login_failures (key, at);
+      CREATE TABLE IF NOT EXISTS login_lockouts (
+        key TEXT PRIMARY KEY, locked_until REAL NOT NULL, strikes INTEGER NOT NULL, forget_at REAL NOT NULL
+      );
+      """
+    )
+
+  async def _run(self, func, *args):
+    return await asyncio.to_thread(self._locked, func, *args)
+
+  def _locked(self, func, *args):
+    with self._lock:
+      return func(*args)
+
+  def _transaction(self, statements):
+    cursor = self._connection.cursor()
+    cursor.execute("BEGIN IMMEDIATE")
+    try:
+      result = statements(cursor)
+      cursor.execute("COMMIT")
+      return result
+    except BaseException:
+      cursor.execute("ROLLBACK")
+      raise
+
+  async def record_attempt(self, key: str, now: float, window: float, not_before: float = 0.0) -> int:
+    def statements(cursor: sqlite3.Cursor) -> int:
+      cursor.execute("DELETE FROM login_failures WHERE key = ? AND at <= ?", (key, max(now - window, not_before)))
+      cursor.execute("INSERT INTO login_failures (key, at) VALUES (?, ?)", (key, now))
+      (count,) = cursor.execute("SELECT count(*) FROM login_failures WHERE key = ?", (key,)).fetchone()
+      if count > self.max_attempts_kept:
+        cursor.execute(
+          "DELETE FROM login_failures WHERE key = ? AND at < "
+          "(SELECT at FROM login_failures WHERE key = ? ORDER BY at DESC LIMIT 1 OFFSET ?)",
+          (key, key, self.max_attempts_kept - 1),
+        )
+      # Keys nobody retries would otherwise stay forever; prune a few stale rows on every write
+      cursor.execute(
+        "DELETE FROM login_failures WHERE rowid IN (SELECT rowid FROM login_failures WHERE at <= ? LIMIT 100)",
+        (now - window,),
+      )
+      return min(count, self.max_attempts_kept)
+
+    return await self._run(self._transaction, statements)
+
+  async def forget_attempt(self, key: str, at: float) -> None:
+    def statements(cursor: sqlite3.Cursor) -> None:
+      cursor.execute(
+        "DELETE FROM login_failures WHERE rowid = (SELECT rowid FROM login_failures WHERE key = ? AND at = ? LIMIT 1)",
+        (key, at),
+      )
+
+    await self._run(self._transaction, statements)
+
+  async def get_lockout(self, key: str, now: float) -> Tuple[float, int]:
+    def query() -> Tuple[float, int]:
+      row = self._connection.execute(
+        "SELECT locked_until, strikes FROM login_lockouts WHERE key = ? AND forget_at > ?", (key, now)
+      ).fetchone()
+      return (row[0], row[1]) if row else (0.0, 0)
+
+    return await self._run(query)
+
+  async def set_lockout(self, key: str, locked_until: float, strikes: int, forget_at: float) -> None:
+    def statements(cursor: sqlite3.Cursor) -> None:
+      cursor.execute(
+        "INSERT INTO login_lockouts (key, locked_until, strikes, forget_at) VALUES (?, ?, ?, ?) "
+        "ON CONFLICT (key) DO UPDATE SET locked_until = excluded.locked_until, "
+        "strikes = excluded.strikes, forget_at = excluded.forget_at",
+        (key, locked_until, strikes, forget_at),
+      )
+      cursor.execute("DELETE FROM login_lockouts WHERE forget_at <= ?", (time.time(),))
+
+    await self._run(self._transaction, statements)
+
+  async def clear(self, key: str) -> None:
+    def statements(cursor: sqlite3.Cursor) -> None:
+      cursor.execute("DELETE FROM login_failures WHERE key = ?", (key,))
+      cursor.execute("DELETE FROM login_lockouts WHERE key = ?", (key,))
+
+    await self._run(self._transaction, statements)
+
+  def close(self) -> None:
+    with self._lock:
+      self._connection.close()
+
+
+class LoginThrottle:
+  """
+    Sliding-window limits on failed logins, per identifier and per client IP.
+    Going over a limit locks that key out for LOGIN_LOCKOUT_BASE_SECONDS, doubled
+    for every further lockout (up to LOGIN_LOCKOUT_MAX_SECONDS) until the key
+    stays clean for a full window after its last lockout.
+    acquire() counts the attempt before the user lookup and bcrypt, in the same
+    store operation that checks the limit, so concurrent requests cannot all
+    pass the check before any of them is recorded; locked-out attempts cost
+    almost nothing. record_success() takes back the attempts of a successful
+    login, release() those of an attempt the server could not decide (503 from
+    the hasher, database error). The IP is the ASGI client address: run uvicorn with --proxy-headers
+    behind a reverse proxy so it is the real client.
+  """
+
+  def __init__(
+    self,
+    store: ThrottleStore,
+    window: float,
+    max_failures_per_identifier: int,
+    max_failures_per_ip: int,
+    lockout_base: float,
+    lockout_max: float,
+  ):
+    self.store = store
+    self.window = window
+    self.limits = {"id": max_failures_per_identifier, "ip": max_failures_per_ip}
+    self.lockout_base = lockout_base
+    self.lockout_max = lockout_max
+
+  def _keys(self, identifier: str, client_ip: Optional[str]) -> Dict[str, str]:
+    keys = {"id": f"id:{normalize_identifier(identifier)}"}
+    if client_ip:
+      keys["ip"] = f"ip:{client_ip}"
+    return keys
+
+  async def acquire(self, identifier: str, client_ip: Optional[str]) -> float:
+    """
+      Count a login attempt, to be called before checking the password.
+      Returns the attempt time, to pass to record_success().
+
+      Raises:
+        HTTPException: 429 if the identifier or the IP is locked out, or if
+          this attempt goes over its limit (which starts a lockout)
+    """
+    now = time.time()
+    counted: Dict[str, str] = {}
+    for scope, key in self._keys(identifier, client_ip).items():
+      locked_until, strikes = await self.store.get_lockout(key, now)
+      if locked_until <= now:
+        # Attempts made before the last lockout ended were paid for by it
+        attempts = await self.store.record_attempt(key, now, self.window, not_before=locked_until)
+        if attempts <= self.limits[scope]:
+          counted[scope] = key
+          continue
+        strikes += 1
+        duration = min(self.lockout_base * 2 ** (strikes - 1), self.lockout_max)
+        locked_until = now + duration
+        await self.store.set_lockout(key, locked_until, strikes, forget_at=locked_until + self.window)
+        THROTTLE_LOCKOUTS.labels(scope).inc()
+      # A refused attempt never reaches bcrypt, so it must not count against the other key
+      for other in counted.values():
+        await self.store.forget_attempt(other, now)
+      THROTTLE_REJECTED.labels(scope).inc()
+      raise HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Too many failed login attempts, try again later",
+        headers={"Retry-After": str(math.ceil(locked_until - now))},
+      )
+    return now
+
+  async def release(self, identifier: str, client_ip: Optional[str], attempted_at: float) -> None:
+    """Take back an attempt counted by acquire() whose password was never checked."""
+    for key in self._keys(identifier, client_ip).values():
+      await self.store.forget_attempt(key, attempted_at)
+
+  async def record_success(self, identifier: str, client_ip: Optional[str], attempted_at: float) -> None:
+    keys = self._keys(identifier, client_ip)
+    await self.store.clear(keys["id"])
+    # The IP only gives back this attempt: one valid credential must not unlock a stuffing run
+    if "ip" in keys:
+      await self.store.forget_attempt(keys["ip"], attempted_at)
+
+
+_login_throttle: Optional[LoginThrottle] = None
+
+
+def get_login_throttle() -> LoginThrottle:
+  """Return the shared login throttle (FastAPI dependency)."""
+  global _login_throttle
+  if _login_throttle is None:
+    # One more than the largest limit, to tell the attempt that goes over it
+    kept = max(settings.LOGIN_MAX_FAILURES_PER_IDENTIFIER, settings.LOGIN_MAX_FAILURES_PER_IP) + 1
+    if settings.LOGIN_THROTTLE_BACKEND == "memory":
+      store: ThrottleStore = MemoryThrottleStore(kept)
+    elif settings.LOGIN_THROTTLE_BACKEND == "sqlite":
+      store = SqliteThrottleStore(settings.LOGIN_THROTTLE_SQLITE_PATH, kept)
+    else:
+      raise RuntimeError(f"Unknown LOGIN_THROTTLE_BACKEND: {settings.LOGIN_THROTTLE_BACKEND}")
+    _login_throttle = LoginThrottle(
+      store,
+      settings.LOGIN_THROTTLE_WINDOW_SECONDS,
+      settings.LOGIN_MAX_FAILURES_PER_IDENTIFIER,
+      settings.LOGIN_MAX_FAILURES_PER_IP,
+      settings.LOGIN_LOCKOUT_BASE_SECONDS,
+      settings.LOGIN_LOCKOUT_MAX_SECONDS,
+    )
+  return _login_throttle
+
+
+def close_login_throttle() -> None:
+  """Close the store, if the throttle was ever created."""
+  global _login_throttle
+  if _login_throttle is not None:
+    _login_throttle.store.close()
+    _login_throttle = None
@@ -0,0 +1,56 @@
+# app/services/news_cache.py | Response cache for the news read endpoints
+#
+# The cache is per worker. Writes made through a session of this worker
+# invalidate it at commit; writes made by other workers, or outside the
+# ORM session entirely (raw connections, other services), are only seen once
+# entries expire, i.e. after at most NEWS_CACHE_TTL_SECONDS. ETags come from
+# the cached entry, so a 304 can confirm a copy that is stale by that much.
+from sqlalchemy import event
+from sqlalchemy.orm import ORMExecuteState, Session
+
+from app.core.config import settings
+from app.models.news import News
+from app.utils.http_cache import ResponseCache
+
+news_response_cache = ResponseCache(
+  "news_responses",
+  settings.NEWS_CACHE_MAX_SIZE,
+  settings.NEWS_CACHE_TTL_SECONDS,
+  # The read endpoints fill the cache from the replica, which may lag behind the write that invalidated it
+  replica_lag=settings.NEWS_CACHE_REPLICA_LAG_SECONDS if settings.DATABASE_READ_URL else 0.0,
+)
+
+
+def invalidate_news_cache() -> None:
+  """Drop every cached news response on this worker."""
+  news_response_cache.invalidate_all()
+
+
+# Any session that flushes a News change invalidates the cache once it commits,
+# so new write paths do not need to remember to do it themselves.
+@event.listens_for(Session, "after_flush")
+def _track_news_changes(session: Session, flush_context) -> None:
+  if any(isinstance(obj, News) for obj in (*session.new, *session.dirty, *session.deleted)):
+    session.info["news_changed"] = True
+
+
+# Bulk UPDATE/DELETE (and core INSERT) statements run through a session never flush News objects
+@event.listens_for(Session, "do_orm_execute")
+def _track_news_statements(orm_execute_state: ORMExecuteState) -> None:
+  if orm_execute_state.is_select:
+    return
+  # ORM-enabled statements carry an annotated copy of the table, so compare by name
+  table = getattr(orm_execute_state.statement, "table", None)
+  if table is not None and getattr(table, "name", None) == News.__tablename__:
+    orm_execute_state.session.info["news_changed"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session: Session) -> None:
+  if session.info.pop("news_changed", False):
+    invalidate_news_cache()
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_after_rollback(session: Session) -> None:
+  session.info.pop("news_changed", None)
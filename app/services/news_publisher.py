@@ -0,0 +1,111 @@
+# app/services/news_publisher.py | Publishes drafts once their publication_date has passed
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Callable, Optional
+
+from sqlalchemy import false, literal_column, select, true, update
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.core.metrics import Counter
+from app.database.session import AsyncSessionLocal
+from app.models.news import DRAFT, PUBLISHED, News
+
+logger = logging.getLogger(__name__)
+
+NEWS_PUBLISHED = Counter("news_scheduled_published_total", "Draft articles published by the scheduler")
+
+# IS_DRAFT spelled against the mapped columns, so ix_news_draft_publication_date applies
+_IS_DRAFT = (News.is_published == false(), News.status == literal_column(f"'{DRAFT}'"))
+
+
+async def publish_due_news(
+  session_factory: Callable[[], AsyncSession], batch_size: int, now: Optional[datetime] = None
+) -> int:
+  """
+    Publish every draft whose publication_date is past, batch_size rows per
+    transaction, and return how many were published. Drafts without a
+    publication_date are not scheduled and are left alone. Safe to run from
+    several workers at once: the UPDATE re-checks that a row is still a draft.
+  """
+  now = now or datetime.now(timezone.utc).replace(tzinfo=None)
+  published = 0
+  while True:
+    async with session_factory() as session:
+      result = await session.execute(
+        select(News.id)
+        .where(*_IS_DRAFT, News.publication_date <= now)
+        .order_by(News.publication_date)
+        .limit(batch_size)
+      )
+      ids = result.scalars().all()
+      if not ids:
+        break
+      result = await session.execute(
+        update(News)
+        .where(News.id.in_(ids), *_IS_DRAFT)
+        .values(is_published=true(), status=PUBLISHED, updated_at=datetime.now(timezone.utc))
+        .execution_options(synchronize_session=False)
+      )
+      await session.commit()
+      published += result.rowcount
+    if len(ids) < batch_size:
+      break
+  if published:
+    NEWS_PUBLISHED.inc(published)
+  return published
+
+
+class NewsPublisher:
+  """ Runs publish_due_news every `interval` seconds in a background task """
+
+  def __init__(self, session_factory: Callable[[], AsyncSession], interval: float, batch_size: int):
+    self.session_factory = session_factory
+    self.interval = interval
+    self.batch_size = batch_size
+    self._task: Optional[asyncio.Task] = None
+
+  def start(self) -> None:
+    if self._task is None:
+      self._task = asyncio.create_task(self._run(), name="news-publisher")
+
+  async def _run(self) -> None:
+    while True:
+      try:
+        published = await publish_due_news(self.session_factory, self.batch_size)
+        if published:
+          logger.info("Published %d scheduled news articles", published)
+      except Exception:
+        # A failed run (database unavailable...) is retried at the next tick
+        logger.exception("Scheduled news publishing failed")
+      await asyncio.sleep(self.interval)
+
+  async def close(self) -> None:
+    if self._task is not None:
+      self._task.cancel()
+      try:
+        await self._task
+      except asyncio.CancelledError:
+        pass
+      self._task = None
+
+
+_news_publisher: Optional[NewsPublisher] = None
+
+
+def get_news_publisher() -> NewsPublisher:
+  global _news_publisher
+  if _news_publisher is None:
+    _news_publisher = NewsPublisher(
+      AsyncSessionLocal, settings.NEWS_PUBLISHER_INTERVAL_SECONDS, settings.NEWS_PUBLISHER_BATCH_SIZE
+    )
+  return _news_publisher
+
+
+async def close_news_publisher() -> None:
+  """Stop the background task, if it was started."""
+  global _news_publisher
+  if _news_publisher is not None:
+    await _news_publisher.close()
+    _news_publisher = None
@@ -0,0 +1,51 @@
+# app/services/news_search.py | Ranked full-text search over news articles
+from typing import Any, Sequence
+
+from sqlalchemy import column, desc, func, literal_column, select, table, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.news import News
+
+# Text search configuration used by the news.search_vector column
+SEARCH_CONFIG = literal_column("'french'::regconfig")
+
+news_fts = table("news_fts", column("news_id"))
+
+
+def _fts5_query(query: str) -> str:
+  """Quote every term so user input cannot use FTS5 query syntax; terms are ANDed."""
+  return " ".join('"' + term.replace('"', '""') + '"' for term in query.split())
+
+
+async def search_news(
+  db: AsyncSession,
+  query: str,
+  columns: Sequence[Any],
+  limit: int,
+  offset: int = 0,
+) -> Sequence[Any]:
+  """
+    Return rows of `columns` plus a `rank` column, best match first.
+    PostgreSQL ranks with ts_rank_cd over the GIN-indexed search_vector
+    (title weighted above content); SQLite uses FTS5 bm25 with the same bias.
+  """
+  if db.get_bind().dialect.name == "postgresql":
+    vector = literal_column("news.search_vector")
+    tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, query)
+    rank = func.ts_rank_cd(vector, tsquery)
+    statement = select(*columns, rank.label("rank")).where(vector.op("@@")(tsquery))
+  else:
+    terms = _fts5_query(query)
+    if not terms:
+      return []
+    # bm25() is lower for better matches; negate it so higher rank is better everywhere
+    rank = -func.bm25(literal_column("news_fts"), 0.0, 10.0, 1.0)
+    statement = (
+      select(*columns, rank.label("rank"))
+      .join(news_fts, news_fts.c.news_id == News.id)
+      .where(text("news_fts MATCH :terms").bindparams(terms=terms))
+    )
+
+  statement = statement.order_by(desc("rank"), desc(News.created_at)).limit(limit).offset(offset)
+  result = await db.execute(statement)
+  return result.all()
@@ -0,0 +1,126 @@
+# app/services/password_hasher.py | bcrypt off the event loop with admission control
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, List, Optional, Sequence, TypeVar
+
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+from app.core.metrics import Counter, Gauge, Histogram
+from app.core.security import get_password_hash, verify_password
+
+T = TypeVar("T")
+
+HASH_QUEUE_DEPTH = Gauge(
+  "password_hash_queue_depth", "Password hash operations waiting for a free worker"
+)
+HASH_IN_PROGRESS = Gauge(
+  "password_hash_in_progress", "Password hash operations currently running on a worker"
+)
+HASH_LATENCY = Histogram(
+  "password_hash_duration_seconds",
+  "Time from submission to result of a password hash operation, queueing included",
+  labelnames=("operation",),
+  buckets=(0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 2.0, 5.0),
+)
+HASH_REJECTED = Counter(
+  "password_hash_rejected_total", "Password hash operations rejected because the queue was full",
+  labelnames=("operation",),
+)
+
+
+class PasswordHasher:
+  """
+    Runs bcrypt on a dedicated pool.
+    At most `workers` hashes run at once and at most `max_queue` more may wait;
+    anything beyond that is rejected with 503 so a login burst cannot pile up
+    unbounded work or starve the rest of the API.
+  """
+
+  def __init__(self, workers: int, max_queue: int, use_processes: bool = False):
+    self.workers = workers
+    self.max_queue = max_queue
+    self._pending = 0
+    self._executor: Executor = (
+      ProcessPoolExecutor(max_workers=workers) if use_processes
+      else ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+    )
+
+  async def hash(self, password: str) -> str:
+    return await self._submit("hash", get_password_hash, password)
+
+  async def hash_many(self, passwords: Sequence[str]) -> List[str]:
+    """
+      Hash a batch in parallel, with at most `workers` submitted at a time so a
+      bulk job keeps the pool busy without filling the queue on its own.
+    """
+    slots = asyncio.Semaphore(self.workers)
+
+    async def hash_one(password: str) -> str:
+      async with slots:
+        return await self.hash(password)
+
+    tasks = [asyncio.ensure_future(hash_one(password)) for password in passwords]
+    try:
+      return list(await asyncio.gather(*tasks))
+    except BaseException:
+      # A rejected (503) or failed hash fails the batch: release the slots and
+      # queue places the rest of it still holds instead of hashing for nobody
+      for task in tasks:
+        task.cancel()
+      await asyncio.gather(*tasks, return_exceptions=True)
+      raise
+
+  async def verify(self, password: str, hashed_password: str) -> bool:
+    return await self._submit("verify", verify_password, password, hashed_password)
+
+  async def _submit(self, operation: str, func: Callable[..., T], *args) -> T:
+    # Only the event loop thread touches _pending, so no lock is needed
+    if self._pending >= self.workers + self.max_queue:
+      HASH_REJECTED.labels(operation).inc()
+      raise HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many authentication requests, please retry shortly",
+        headers={"Retry-After": "1"},
+      )
+    self._pending += 1
+    self._update_gauges()
+    started = time.perf_counter()
+    try:
+      return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+    finally:
+      self._pending -= 1
+      self._update_gauges()
+      HASH_LATENCY.labels(operation).observe(time.perf_counter() - started)
+
+  def _update_gauges(self) -> None:
+    running = min(self._pending, self.workers)
+    HASH_IN_PROGRESS.set(running)
+    HASH_QUEUE_DEPTH.set(self._pending - running)
+
+  def close(self) -> None:
+    self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_password_hasher: Optional[PasswordHasher] = None
+
+
+def get_password_hasher() -> PasswordHasher:
+  """Return the shared password hasher."""
+  global _password_hasher
+  if _password_hasher is None:
+    _password_hasher = PasswordHasher(
+      settings.PASSWORD_HASH_WORKERS,
+      settings.PASSWORD_HASH_MAX_QUEUE,
+      use_processes=settings.PASSWORD_HASH_EXECUTOR == "process",
+    )
+  return _password_hasher
+
+
+def close_password_hasher() -> None:
+  """Shut down the hashing pool, if it was ever created."""
+  global _password_hasher
+  if _password_hasher is not None:
+    _password_hasher.close()
+    _password_hasher = None
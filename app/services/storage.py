@@ -0,0 +1,141 @@
+# app/services/storage.py | Async file storage backends
+import asyncio
+import io
+import os
+import shutil
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from typing import BinaryIO, Callable, List, Optional, TypeVar
+from uuid import uuid4
+
+from fastapi import UploadFile
+
+from app.core.config import settings
+
+T = TypeVar("T")
+
+
+class StorageError(Exception):
+  """Raised when a backend fails to store a file."""
+
+
+class StorageTimeoutError(StorageError):
+  """Raised when a backend does not finish within UPLOAD_TIMEOUT_SECONDS."""
+
+
+@dataclass
+class StoredFile:
+  url: str
+  file_id: Optional[str] = None
+  size: Optional[int] = None
+
+
+class FileStorage(ABC):
+  """
+    Base class for storage backends.
+    Backends implement the blocking _save(); save() runs it on a dedicated
+    thread pool so the event loop is never blocked, with at most
+    max_concurrency uploads in flight and a timeout covering queueing and upload.
+  """
+
+  def __init__(self, max_concurrency: int, timeout: float):
+    self.timeout = timeout
+    self._semaphore = asyncio.Semaphore(max_concurrency)
+    self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="storage")
+
+  async def save(self, upload: UploadFile, tags: Optional[List[str]] = None) -> StoredFile:
+    # The worker thread gets its own copy: after a timeout it may still be reading
+    # while the request handler closes the UploadFile
+    await upload.seek(0)
+    data = await upload.read()
+    return await self.save_bytes(data, upload.filename or "upload", upload.content_type, tags)
+
+  async def save_bytes(
+    self, data: bytes, file_name: str, content_type: Optional[str], tags: Optional[List[str]] = None
+  ) -> StoredFile:
+    """Store content produced in memory (e.g. a re-encoded image)."""
+    return await self._run(partial(self._save, io.BytesIO(data), file_name, content_type, tags or []))
+
+  @abstractmethod
+  def _save(self, fileobj: BinaryIO, file_name: str, content_type: Optional[str], tags: List[str]) -> StoredFile:
+    """Store fileobj and return where it went; runs on a worker thread."""
+
+  async def _run(self, func: Callable[[], T]) -> T:
+    try:
+      async with asyncio.timeout(self.timeout):
+        await self._semaphore.acquire()
+        future = asyncio.get_running_loop().run_in_executor(self._executor, func)
+        # The worker thread cannot be interrupted: keep the slot taken until it really finishes
+        future.add_done_callback(lambda _: self._semaphore.release())
+        return await asyncio.shield(future)
+    except TimeoutError:
+      raise StorageTimeoutError(f"Upload did not complete within {self.timeout}s")
+
+  def close(self) -> None:
+    self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class ImageKitStorage(FileStorage):
+  """Uploads to ImageKit using the synchronous SDK client."""
+
+  def _save(self, fileobj: BinaryIO, file_name: str, content_type: Optional[str], tags: List[str]) -> StoredFile:
+    from imagekitio.models.UploadFileRequestOptions import UploadFileRequestOptions
+    from app.services.imagekit_config import get_imagekit
+
+    upload_result = get_imagekit().upload_file(
+      # A (name, file, content type) tuple is passed straight to the multipart encoder
+      file=(file_name, fileobj, content_type),
+      file_name=file_name,
+      options=UploadFileRequestOptions(use_unique_file_name=True, tags=tags),
+    )
+    if upload_result.response_metadata.http_status_code != 200:
+      raise StorageError(f"ImageKit returned HTTP {upload_result.response_metadata.http_status_code}")
+    return StoredFile(url=upload_result.url, file_id=upload_result.file_id, size=upload_result.size)
+
+
+class LocalStorage(FileStorage):
+  """Writes files under a local directory; used for development, tests and benchmarks."""
+
+  def __init__(self, directory: str, base_url: str, max_concurrency: int, timeout: float):
+    super().__init__(max_concurrency, timeout)
+    self.directory = directory
+    self.base_url = base_url.rstrip("/")
+
+  def _save(self, fileobj: BinaryIO, file_name: str, content_type: Optional[str], tags: List[str]) -> StoredFile:
+    os.makedirs(self.directory, exist_ok=True)
+    stored_name = f"{uuid4().hex}{os.path.splitext(file_name)[1]}"
+    with open(os.path.join(self.directory, stored_name), "wb") as destination:
+      shutil.copyfileobj(fileobj, destination)
+      size = destination.tell()
+    return StoredFile(url=f"{self.base_url}/{stored_name}", file_id=stored_name, size=size)
+
+
+_storage: Optional[FileStorage] = None
+
+
+def get_storage() -> FileStorage:
+  """Return the configured storage backend (FastAPI dependency)."""
+  global _storage
+  if _storage is None:
+    if settings.STORAGE_BACKEND == "local":
+      _storage = LocalStorage(
+        settings.LOCAL_STORAGE_DIR,
+        settings.LOCAL_STORAGE_BASE_URL,
+        settings.UPLOAD_MAX_CONCURRENCY,
+        settings.UPLOAD_TIMEOUT_SECONDS,
+      )
+    elif settings.STORAGE_BACKEND == "imagekit":
+      _storage = ImageKitStorage(settings.UPLOAD_MAX_CONCURRENCY, settings.UPLOAD_TIMEOUT_SECONDS)
+    else:
+      raise RuntimeError(f"Unknown STORAGE_BACKEND: {settings.STORAGE_BACKEND}")
+  return _storage
+
+
+def close_storage() -> None:
+  """Shut down the storage worker threads, if the backend was ever created."""
+  global _storage
+  if _storage is not None:
+    _storage.close()
+    _storage = None
@@ -1,28 +1,123 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import or_, select
+from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException, status
-from app.models.users import User
+from app.models.users import User, normalize_identifier
 from app.schemas.users import UserCreate, UserUpdate
 from app.core.security import get_password_hash
+from app.core.config import settings
+from app.services.password_hasher import get_password_hasher
+from app.utils.cache import TTLCache
+from typing import Optional
 from uuid import UUID
 
+# Snapshots of user rows for get_current_user, keyed by str(user id)
+user_cache: TTLCache[dict] = TTLCache("users", settings.USER_CACHE_MAX_SIZE, settings.USER_CACHE_TTL_SECONDS)
+# Bumped by every invalidation; guards against re-caching a row read before it (see ResponseCache)
+_user_cache_generation = 0
+# Room left for the number available_username appends, within User.username's 150 characters
+USERNAME_BASE_MAX_LENGTH = 140
+
 class UserService:
   @staticmethod
   async def get_user_by_email(db: AsyncSession, email: str) -> User:
-    result = await db.execute(select(User).where(User.email == email))
+    result = await db.execute(select(User).where(User.email_normalized == normalize_identifier(email)))
     return result.scalar_one_or_none()
   
   @staticmethod
   async def get_user_by_username(db: AsyncSession, username: str) -> User:
-      result = await db.execute(select(User).where(User.username == username))
+      result = await db.execute(select(User).where(User.username_normalized == normalize_identifier(username)))
       return result.scalar_one_or_none()
+
+  @staticmethod
+  async def get_user_by_login(db: AsyncSession, identifier: str) -> Optional[User]:
+     """
+        Resolve an e-mail or username (any case) in one query, served by the two
+        unique normalized indexes. If the identifier is one user's e-mail and
+        another's username, the e-mail wins.
+     """
+     normalized = normalize_identifier(identifier)
+     email_match = User.email_normalized == normalized
+     result = await db.execute(
+        select(User)
+        .where(or_(email_match, User.username_normalized == normalized))
+        .order_by(email_match.desc())
+        .limit(1)
+     )
+     return result.scalar_one_or_none()
   
   @staticmethod
   async def get_user_by_id(db: AsyncSession, user_id: UUID) -> User:
      result = await db.execute(select(User).where(User.id == user_id))
      return result.scalar_one_or_none()
+
+  @staticmethod
+  async def username_taken(db: AsyncSession, username: str, exclude_id: Optional[UUID] = None) -> bool:
+     """ Usernames are unique regardless of case (username_normalized), so "Bob" takes "bob" """
+     statement = select(User.id).where(User.username_normalized == normalize_identifier(username))
+     if exclude_id is not None:
+        statement = statement.where(User.id != exclude_id)
+     return (await db.execute(statement.limit(1))).first() is not None
+
+  @staticmethod
+  async def available_username(db: AsyncSession, base: str) -> str:
+     """ Return base if no user has it (in any case), else base followed by the smallest free number """
+     base = base.strip()[:USERNAME_BASE_MAX_LENGTH] or "user"
+     normalized = normalize_identifier(base)
+     result = await db.execute(
+        select(User.username_normalized).where(User.username_normalized.startswith(normalized, autoescape=True))
+     )
+     taken = set(result.scalars().all())
+     if normalized not in taken:
+        return base
+     suffix = 2
+     while f"{normalized}{suffix}" in taken:
+        suffix += 1
+     return f"{base}{suffix}"
+
+  @staticmethod
+  async def commit_user(db: AsyncSession, user: User) -> User:
+     """
+        Commit a new or changed user and refresh it. The checks before it can
+        race with another request: the unique indexes have the last word, and
+        a login identifier taken meanwhile is a 400, not a 500.
+     """
+     try:
+        await db.commit()
+     except IntegrityError:
+        await db.rollback()
+        raise HTTPException(
+           status_code=status.HTTP_400_BAD_REQUEST,
+           detail="E-mail or username already registered"
+        )
+     await db.refresh(user)
+     return user
   
 
+  @staticmethod
+  def get_cached_user(user_id: UUID | str) -> Optional[User]:
+     """ Return a detached copy of a cached user, or None """
+     data = user_cache.get(str(user_id))
+     return User(**data) if data is not None else None
+
+  @staticmethod
+  def user_cache_generation() -> int:
+     """ Take this before loading a user, and pass it to cache_user """
+     return _user_cache_generation
+
+  @staticmethod
+  def cache_user(user: User, generation: int) -> None:
+     """ Cache user, unless an invalidation happened since it was loaded (the row may be stale) """
+     if generation == _user_cache_generation:
+        user_cache.set(str(user.id), user.model_dump())
+
+  @staticmethod
+  def invalidate_cached_user(user_id: UUID | str) -> None:
+     global _user_cache_generation
+     _user_cache_generation += 1
+     user_cache.invalidate(str(user_id))
+
+
   @staticmethod
   async def update_user(
      db: AsyncSession,
@@ -37,10 +132,33 @@ class UserService:
         )
      
      update_data = user_update.model_dump(exclude_unset=True)
+     if update_data.get("email"):
+        other = await UserService.get_user_by_email(db, update_data["email"])
+        if other is not None and other.id != user.id:
+           raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
+     if update_data.get("username") and await UserService.username_taken(db, update_data["username"], user.id):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Username already taken")
      for field, value in update_data.items():
         setattr(user, field, value)
      
+     try:
+        return await UserService.commit_user(db, user)
+     finally:
+        UserService.invalidate_cached_user(user_id)
+
+
+  @staticmethod
+  async def deactivate_user(db: AsyncSession, user_id: UUID) -> User:
+     user = await UserService.get_user_by_id(db, user_id)
+     if not user:
+        raise HTTPException(
+           status_code=status.HTTP_404_NOT_FOUND,
+           detail="User not found"
+        )
+
+     user.is_active = False
      await db.commit()
+     UserService.invalidate_cached_user(user_id)
      await db.refresh(user)
      return user
   
@@ -51,12 +169,8 @@ class UserService:
      username: str,
      password: str
   ) -> User:
-     # Try to find by email or username
-     user = await UserService.get_user_by_email(db, username)
-     if not user:
-        user = await UserService.get_user_by_username(db, username)
-
-     if not user or not user.check_password(password):
+     user = await UserService.get_user_by_login(db, username)
+     if not user or not await get_password_hasher().verify(password, user.password):
         return None
      
      return user
\ No newline at end of file
@@ -0,0 +1,68 @@
+import time
+from collections import OrderedDict
+from typing import Any, Generic, Hashable, Optional, Tuple, TypeVar
+
+from app.core.metrics import Counter, Gauge
+
+V = TypeVar("V")
+
+CACHE_HITS = Counter("cache_hits_total", "In-process cache hits", labelnames=("cache",))
+CACHE_MISSES = Counter("cache_misses_total", "In-process cache misses", labelnames=("cache",))
+CACHE_SIZE = Gauge("cache_entries", "Entries currently held by an in-process cache", labelnames=("cache",))
+
+
+class TTLCache(Generic[V]):
+    """
+    Bounded in-process LRU cache whose entries expire after a TTL
+
+    Meant for use from the event loop thread only. Hit and miss counts are
+    exported as cache_hits_total / cache_misses_total labelled with `name`.
+
+    Args:
+        name: Label used for the cache metrics
+        maxsize: Maximum number of entries; the least recently used is evicted
+        ttl: Default time to live in seconds
+    """
+
+    def __init__(self, name: str, maxsize: int, ttl: float):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[float, V]]" = OrderedDict()
+        self._hits = CACHE_HITS.labels(name)
+        self._misses = CACHE_MISSES.labels(name)
+        CACHE_SIZE.labels(name).set_function(lambda: len(self._data))
+
+    def get(self, key: Hashable) -> Optional[V]:
+        entry = self._data.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > time.monotonic():
+                self._data.move_to_end(key)
+                self._hits.inc()
+                return value
+            del self._data[key]
+        self._misses.inc()
+        return None
+
+    def set(self, key: Hashable, value: V, ttl: Optional[float] = None) -> None:
+        """Store value; ttl overrides the default time to live for this entry."""
+        if self.maxsize <= 0:
+            return
+        self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Any) -> bool:
+        entry = self._data.get(key)
+        return entry is not None and entry[0] > time.monotonic()
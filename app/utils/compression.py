@@ -0,0 +1,211 @@
+import zlib
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Sequence
+
+try:
+    import brotli
+except ImportError:  # Optional: pip install brotli
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # Optional: pip install zstandard
+    zstandard = None
+
+
+# Media types worth compressing; images and archives are already compressed
+COMPRESSIBLE_TYPES = frozenset({
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+    "text/csv",
+    "text/css",
+    "text/html",
+    "text/plain",
+    "text/xml",
+})
+
+
+class StreamCompressor(ABC):
+    """Incremental compressor for streamed bodies; each chunk is flushed so clients see it at once."""
+
+    @abstractmethod
+    def compress(self, chunk: bytes) -> bytes:
+        """Compress chunk and return everything the client can decode so far."""
+
+    @abstractmethod
+    def finish(self) -> bytes:
+        """Return the end of the stream."""
+
+
+class Codec(ABC):
+    """A content coding (RFC 9110 section 8.4.1) at a fixed level."""
+
+    encoding: str
+
+    @abstractmethod
+    def compress(self, data: bytes) -> bytes:
+        """Compress a complete body."""
+
+    @abstractmethod
+    def stream(self) -> StreamCompressor:
+        """Return a new compressor for one streamed body."""
+
+
+class _ZlibStream(StreamCompressor):
+    def __init__(self, level: int):
+        # wbits=31: zlib stream with a gzip header and trailer
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, chunk: bytes) -> bytes:
+        return self._compressor.compress(chunk) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class GzipCodec(Codec):
+    encoding = "gzip"
+
+    def __init__(self, level: int = 6):
+        self.level = level
+
+    def compress(self, data: bytes) -> bytes:
+        # zlib rather than the gzip module: same bytes without a file object and a timestamp
+        compressor = zlib.compressobj(self.level, zlib.DEFLATED, 31)
+        return compressor.compress(data) + compressor.flush()
+
+    def stream(self) -> StreamCompressor:
+        return _ZlibStream(self.level)
+
+
+class _BrotliStream(StreamCompressor):
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, chunk: bytes) -> bytes:
+        return self._compressor.process(chunk) + self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class BrotliCodec(Codec):
+    encoding = "br"
+
+    def __init__(self, quality: int = 4):
+        self.quality = quality
+
+    def compress(self, data: bytes) -> bytes:
+        return brotli.compress(data, quality=self.quality)
+
+    def stream(self) -> StreamCompressor:
+        return _BrotliStream(self.quality)
+
+
+class _ZstdStream(StreamCompressor):
+    def __init__(self, level: int):
+        # A ZstdCompressor holds one compression context: streams must not share it
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, chunk: bytes) -> bytes:
+        return self._compressor.compress(chunk) + self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class ZstdCodec(Codec):
+    encoding = "zstd"
+
+    def __init__(self, level: int = 3):
+        self.level = level
+
+    def compress(self, data: bytes) -> bytes:
+        # A new context per call, so nothing is shared if bodies are ever compressed off the event loop
+        return zstandard.ZstdCompressor(level=self.level).compress(data)
+
+    def stream(self) -> StreamCompressor:
+        return _ZstdStream(self.level)
+
+
+def build_codecs(
+    encodings: Sequence[str], gzip_level: int = 6, brotli_quality: int = 4, zstd_level: int = 3
+) -> List[Codec]:
+    """
+    Instantiate the codecs named in `encodings`, keeping their order
+
+    Encodings whose library is not installed (br, zstd) are skipped, so the
+    same configuration works with only the standard library.
+
+    Raises:
+        ValueError: for an encoding this module does not know
+    """
+    codecs: List[Codec] = []
+    for encoding in encodings:
+        if encoding == "gzip":
+            codecs.append(GzipCodec(gzip_level))
+        elif encoding == "br":
+            if brotli is not None:
+                codecs.append(BrotliCodec(brotli_quality))
+        elif encoding == "zstd":
+            if zstandard is not None:
+                codecs.append(ZstdCodec(zstd_level))
+        else:
+            raise ValueError(f"Unsupported content encoding: {encoding}")
+    return codecs
+
+
+def parse_accept_encoding(header: str) -> Dict[str, float]:
+    """Map each coding of an Accept-Encoding header to its q-value (malformed q-values count as 0)."""
+    weights: Dict[str, float] = {}
+    for item in header.split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[coding] = q
+    return weights
+
+
+class ResponseCompressor:
+    """
+    Content negotiation and compression policy shared by the compression
+    middleware and the cached responses
+
+    Codecs are listed in server preference order: among the codings the
+    client weighs highest, the first one listed wins. Bodies shorter than
+    min_size are not worth the CPU and the extra header bytes.
+    """
+
+    def __init__(self, codecs: Sequence[Codec], min_size: int = 1024):
+        self.codecs = list(codecs)
+        self.min_size = min_size
+
+    def negotiate(self, accept_encoding: Optional[str]) -> Optional[Codec]:
+        if not accept_encoding or not self.codecs:
+            return None
+        weights = parse_accept_encoding(accept_encoding)
+        default = weights.get("*", 0.0)
+        best: Optional[Codec] = None
+        best_q = 0.0
+        for codec in self.codecs:
+            q = weights.get(codec.encoding, default)
+            if q > best_q:
+                best, best_q = codec, q
+        return best
+
+    def is_compressible(self, content_type: Optional[str]) -> bool:
+        if not content_type:
+            return False
+        return content_type.split(";", 1)[0].strip().lower() in COMPRESSIBLE_TYPES
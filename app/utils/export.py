@@ -0,0 +1,93 @@
+import csv
+import io
+from enum import Enum
+from typing import Any, AsyncIterator, Callable, List, Type
+
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.utils.serialization import validate_rows
+
+
+class ExportFormat(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+MEDIA_TYPES = {
+    ExportFormat.ndjson: "application/x-ndjson",
+    ExportFormat.csv: "text/csv; charset=utf-8",
+}
+
+
+def schema_columns(table_model: Type[Any], schema: Type[BaseModel]) -> List[Any]:
+    """Return the table columns backing each field of `schema`, in schema order."""
+    return [getattr(table_model, name) for name in schema.model_fields]
+
+
+async def _stream_rows(
+    session_factory: Callable[[], AsyncSession],
+    statement: Select,
+    chunk_size: int,
+) -> AsyncIterator[List[Any]]:
+    # The generator owns its session: it outlives the request handler's dependencies
+    async with session_factory() as session:
+        result = await session.stream(statement.execution_options(yield_per=chunk_size))
+        async for partition in result.partitions(chunk_size):
+            yield partition
+
+
+async def ndjson_chunks(
+    session_factory: Callable[[], AsyncSession],
+    statement: Select,
+    schema: Type[BaseModel],
+    chunk_size: int = 500,
+) -> AsyncIterator[bytes]:
+    """Yield one NDJSON chunk per `chunk_size` rows."""
+    serializer = schema.__pydantic_serializer__
+    async for rows in _stream_rows(session_factory, statement, chunk_size):
+        yield b"".join(serializer.to_json(item) + b"\n" for item in validate_rows(schema, rows))
+
+
+async def csv_chunks(
+    session_factory: Callable[[], AsyncSession],
+    statement: Select,
+    schema: Type[BaseModel],
+    chunk_size: int = 500,
+) -> AsyncIterator[bytes]:
+    """Yield a header line, then one CSV chunk per `chunk_size` rows."""
+    fieldnames = list(schema.model_fields)
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fieldnames, lineterminator="\n")
+    writer.writeheader()
+    yield buffer.getvalue().encode("utf-8")
+    async for rows in _stream_rows(session_factory, statement, chunk_size):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(item.model_dump(mode="json") for item in validate_rows(schema, rows))
+        yield buffer.getvalue().encode("utf-8")
+
+
+def export_response(
+    session_factory: Callable[[], AsyncSession],
+    statement: Select,
+    schema: Type[BaseModel],
+    export_format: ExportFormat,
+    filename: str,
+    chunk_size: int = 500,
+) -> StreamingResponse:
+    """
+    Stream the result of `statement` as NDJSON or CSV
+
+    Rows are fetched with a server-side cursor (yield_per) and written one
+    chunk at a time, so memory stays flat regardless of table size.
+    `statement` should select the columns of `schema` (see schema_columns).
+    """
+    chunks = ndjson_chunks if export_format is ExportFormat.ndjson else csv_chunks
+    return StreamingResponse(
+        chunks(session_factory, statement, schema, chunk_size),
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{export_format.value}"'},
+    )
@@ -0,0 +1,68 @@
+from functools import lru_cache
+from typing import Callable, List, Optional, Tuple, Type
+
+from fastapi import HTTPException, Query, status
+from pydantic import BaseModel, ConfigDict, create_model
+
+
+def parse_fields(fields: Optional[str], schema: Type[BaseModel]) -> Optional[Tuple[str, ...]]:
+    """
+    Parse a sparse fieldset (?fields=id,title) against a response schema
+
+    Args:
+        fields: Comma-separated field names, as sent by the client
+        schema: Schema whose fields may be requested
+
+    Returns:
+        The requested names in schema order (so equal sets give equal tuples),
+        or None when no fieldset was sent
+
+    Raises:
+        HTTPException: 400 naming the fields the schema does not have
+    """
+    if fields is None:
+        return None
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    if not requested:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="fields must name at least one field")
+    unknown = requested.difference(schema.model_fields)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}. Allowed: {', '.join(schema.model_fields)}",
+        )
+    return tuple(name for name in schema.model_fields if name in requested)
+
+
+def fieldset(schema: Type[BaseModel]) -> Callable[..., Optional[Tuple[str, ...]]]:
+    """Return a dependency reading the `fields` query parameter for `schema` (see parse_fields)."""
+    allowed = ", ".join(schema.model_fields)
+
+    def dependency(
+        fields: Optional[str] = Query(None, description=f"Comma-separated subset of the fields to return: {allowed}"),
+    ) -> Optional[Tuple[str, ...]]:
+        return parse_fields(fields, schema)
+
+    return dependency
+
+
+@lru_cache(maxsize=256)
+def partial_model(schema: Type[BaseModel], fields: Tuple[str, ...]) -> Type[BaseModel]:
+    """
+    Return a model with only `fields` of `schema` (same types and defaults)
+
+    Models are cached per fieldset, so each one compiles its validator and
+    serializer once. The parse_fields order keeps the cache keys canonical.
+    """
+    return create_model(
+        f"{schema.__name__}[{','.join(fields)}]",
+        __config__=ConfigDict(from_attributes=True),
+        **{name: (schema.model_fields[name].annotation, schema.model_fields[name]) for name in fields},
+    )
+
+
+@lru_cache(maxsize=256)
+def partial_page_model(page_schema: Type[BaseModel], item_model: Type[BaseModel]) -> Type[BaseModel]:
+    """Return `page_schema` with its `items` list typed as `item_model`."""
+    return create_model(f"{page_schema.__name__}[{item_model.__name__}]", __base__=page_schema, items=(List[item_model], ...))
+
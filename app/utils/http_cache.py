@@ -0,0 +1,154 @@
+import hashlib
+import time
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Dict, Hashable, Iterable, Optional
+
+from fastapi import Request, Response, status
+from pydantic import BaseModel
+
+from app.utils.cache import TTLCache
+from app.utils.compression import Codec, ResponseCompressor
+
+
+def make_etag(parts: Iterable[Any]) -> str:
+    """
+    Build a strong ETag from the values that determine a response
+
+    Hashing validators (ids, updated_at, ...) rather than the body means a
+    304 can be decided before anything is serialized.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(str(part).encode("utf-8"))
+        digest.update(b"\x1f")
+    return f'"{digest.hexdigest()}"'
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes; they are stored in UTC
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    """
+    Evaluate If-None-Match / If-Modified-Since (RFC 9110 section 13.2.2)
+
+    If-None-Match takes precedence; If-Modified-Since is only consulted when
+    the client did not send an entity tag.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return etag in candidates
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return _as_utc(last_modified).replace(microsecond=0) <= since
+    return False
+
+
+class CachedResponse:
+    """
+    A JSON response together with its validators
+
+    The body is serialized from `payload` on first use and kept, so cache hits
+    and 304s never serialize again. Compressed bodies are kept the same way,
+    one per content coding actually requested.
+    """
+
+    def __init__(self, payload: BaseModel, etag: str, last_modified: Optional[datetime] = None):
+        self.payload = payload
+        self.etag = etag
+        self.last_modified = _as_utc(last_modified) if last_modified else None
+        self._body: Optional[bytes] = None
+        self._encoded: Dict[str, bytes] = {}
+
+    @property
+    def body(self) -> bytes:
+        if self._body is None:
+            self._body = self.payload.model_dump_json().encode("utf-8")
+        return self._body
+
+    def encoded_body(self, codec: Codec) -> bytes:
+        encoded = self._encoded.get(codec.encoding)
+        if encoded is None:
+            encoded = self._encoded[codec.encoding] = codec.compress(self.body)
+        return encoded
+
+    def headers(self) -> dict:
+        headers = {"ETag": self.etag, "Cache-Control": "no-cache"}
+        if self.last_modified is not None:
+            headers["Last-Modified"] = format_datetime(self.last_modified, usegmt=True)
+        return headers
+
+    def to_response(self, request: Request, compressor: Optional[ResponseCompressor] = None) -> Response:
+        headers = self.headers()
+        codec = None
+        if compressor is not None:
+            headers["Vary"] = "Accept-Encoding"
+            if len(self.body) >= compressor.min_size:
+                codec = compressor.negotiate(request.headers.get("accept-encoding"))
+        if codec is not None:
+            # Same validator, different bytes: a strong ETag must not be shared (RFC 9110 section 8.8.3)
+            headers["ETag"] = f"W/{self.etag}"
+        if is_not_modified(request, self.etag, self.last_modified):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        if codec is None:
+            return Response(content=self.body, media_type="application/json", headers=headers)
+        headers["Content-Encoding"] = codec.encoding
+        return Response(content=self.encoded_body(codec), media_type="application/json", headers=headers)
+
+
+class ResponseCache:
+    """
+    TTL cache of CachedResponse objects with whole-cache invalidation
+
+    A generation number guards against a request that read the database
+    before an invalidation storing its (now stale) response afterwards:
+    call fill_generation() before querying and pass the result to set().
+
+    When reads go to a replica, a read that starts just after an invalidation
+    may still see the old rows. For `replica_lag` seconds after each
+    invalidation, fill_generation() returns None and set() stores nothing.
+
+    Args:
+        name: Label used for the cache metrics
+        maxsize: Maximum number of cached responses
+        ttl: Time to live of a cached response, in seconds
+        replica_lag: Replication lag to allow for; 0 when reads hit the primary
+    """
+
+    def __init__(self, name: str, maxsize: int, ttl: float, replica_lag: float = 0.0):
+        self._cache: TTLCache[CachedResponse] = TTLCache(name, maxsize, ttl)
+        self.replica_lag = replica_lag
+        self.generation = 0
+        self._invalidated_at = float("-inf")
+
+    def get(self, key: Hashable) -> Optional[CachedResponse]:
+        return self._cache.get(key)
+
+    def fill_generation(self) -> Optional[int]:
+        """Return the token to pass to set(), or None if a response read now must not be cached."""
+        if time.monotonic() - self._invalidated_at < self.replica_lag:
+            return None
+        return self.generation
+
+    def set(self, key: Hashable, entry: CachedResponse, generation: Optional[int]) -> None:
+        if generation is not None and generation == self.generation:
+            self._cache.set(key, entry)
+
+    def invalidate_all(self) -> None:
+        self.generation += 1
+        self._invalidated_at = time.monotonic()
+        self._cache.clear()
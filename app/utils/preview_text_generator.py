@@ -1,44 +1,117 @@
 import re
-from typing import Optional
+from html import unescape
+from typing import Iterable, List, Optional
 
-def generate_excerpt(
-    content: str, 
-    max_length: int = 200,
-    min_length: int = 50,
-    preserve_paragraphs: bool = False
+# Raw characters examined per step when a text run is longer than what is still needed
+TEXT_WINDOW = 4096
+
+# Longest HTML entity reference we try to keep whole across a window boundary (&CounterClockwiseContourIntegral;)
+MAX_ENTITY_LENGTH = 33
+
+# Tags whose content is not visible text
+SKIPPED_ELEMENTS = ("script", "style")
+
+_CLOSING_TAGS = {name: re.compile(rf"</{name}\s*>", re.IGNORECASE) for name in SKIPPED_ELEMENTS}
+_FIRST_PARAGRAPH = re.compile(r"<p(?:\s[^>]*)?>", re.IGNORECASE)
+_TITLE_ABBREVIATION = re.compile(r'\b(Mr|Mrs|Ms|Dr|Prof|Sr|Jr)\.$')
+
+
+def _visible_text(
+    content: str, limit: int, start: int = 0, stop_tag: Optional[str] = None, tag_space: bool = True
 ) -> str:
     """
-    Generate a readable excerpt from HTML or plain text content
-    
-    Args:
-        content: The full content (HTML or plain text)
-        max_length: Maximum excerpt length
-        min_length: Minimum excerpt length before adding ellipsis
-        preserve_paragraphs: Try to keep paragraph structure
-    
-    Returns:
-        Generated excerpt string
+    Return the visible text of `content`, whitespace-collapsed, stopping once
+    it is longer than `limit` characters.
+
+    Tags become spaces (or nothing, joining the text around them, if
+    `tag_space` is false), entities are decoded, and <script>/<style> bodies
+    and comments are skipped. The input is scanned once from `start` and only
+    as far as needed, so the cost depends on `limit`, not on the document size.
+    If `stop_tag` is given, scanning also stops at its closing tag.
     """
-    if not content:
-        return ""
-    
-    # 1. Clean HTML tags
-    clean_content = re.sub(r'<[^>]+>', ' ', content)
-    
-    # 2. Remove excessive whitespace
-    clean_content = re.sub(r'\s+', ' ', clean_content).strip()
-    
-    # 3. If content is already short enough, return as is
+    pieces: List[str] = []
+    length = 0
+    pending_space = False
+    position = start
+    end = len(content)
+
+    while position < end and length <= limit:
+        # Only look at as much raw text as could still be needed
+        search_end = min(end, position + max(limit - length + 1, 0) + TEXT_WINDOW)
+        tag_start = content.find("<", position, search_end)
+        text_end = search_end if tag_start == -1 else tag_start
+
+        if position < text_end:
+            window_end = text_end
+            if tag_start == -1 and window_end < end:
+                # Do not cut an entity reference in two
+                ampersand = content.rfind("&", max(position, window_end - MAX_ENTITY_LENGTH), window_end)
+                if ampersand > position and ";" not in content[ampersand:window_end]:
+                    window_end = ampersand
+            text = content[position:window_end]
+            if "&" in text:
+                text = unescape(text)
+            words = text.split()
+            if words:
+                if text[0].isspace():
+                    pending_space = True
+                for word in words:
+                    if pending_space and length:
+                        pieces.append(" ")
+                        length += 1
+                    pieces.append(word)
+                    length += len(word)
+                    pending_space = True
+                pending_space = text[-1].isspace()
+            elif text:
+                pending_space = True
+            position = window_end
+            continue
+
+        # position is at a "<"
+        if content.startswith("<!--", position):
+            comment_end = content.find("-->", position + 4)
+            position = end if comment_end == -1 else comment_end + 3
+            pending_space = pending_space or tag_space
+            continue
+        tag_end = content.find(">", position + 1)
+        if tag_end == -1 or tag_end == position + 1:
+            # A lone "<" (or "<>") is text, not markup
+            if pending_space and length:
+                pieces.append(" ")
+                length += 1
+            pieces.append("<")
+            length += 1
+            pending_space = False
+            position += 1
+            continue
+
+        tag = content[position + 1:tag_end]
+        position = tag_end + 1
+        pending_space = pending_space or tag_space
+        name = tag.split(None, 1)[0].rstrip("/").lower() if tag.strip() else ""
+        if stop_tag and name == f"/{stop_tag}":
+            break
+        if name in _CLOSING_TAGS and not tag.endswith("/"):
+            closing = _CLOSING_TAGS[name].search(content, position)
+            position = end if closing is None else closing.end()
+
+    return "".join(pieces)
+
+
+def _truncate(clean_content: str, max_length: int, min_length: int) -> str:
+    """Cut whitespace-collapsed text to max_length, preferring a sentence or word boundary."""
+    # 1. If content is already short enough, return as is
     if len(clean_content) <= max_length:
         return clean_content
-    
-    # 4. Try to find a good sentence boundary
+
+    # 2. Try to find a good sentence boundary
     truncated = clean_content[:max_length]
-    
+
     # Look for sentence boundaries
     sentence_indicators = [
         ('. ', 1),    # Period with space
-        ('! ', 1),    # Exclamation with space  
+        ('! ', 1),    # Exclamation with space
         ('? ', 1),    # Question with space
         ('.', 0),     # Just period
         ('!', 0),     # Just exclamation
@@ -46,25 +119,61 @@ def generate_excerpt(
         (', ', 1),    # Comma with space (fallback)
         ('; ', 1),    # Semicolon with space
     ]
-    
+
     for indicator, offset in sentence_indicators:
         last_pos = truncated.rfind(indicator)
         if last_pos > min_length:  # Ensure we have meaningful content
             end_pos = last_pos + offset + 1 if offset > 0 else last_pos + 1
             excerpt = truncated[:end_pos]
-            
+
             # Don't end with just "Mr.", "Dr.", etc.
-            if not re.search(r'\b(Mr|Mrs|Ms|Dr|Prof|Sr|Jr)\.$', excerpt):
+            if not _TITLE_ABBREVIATION.search(excerpt):
                 return excerpt
-    
-    # 5. Fallback: Cut at word boundary
+
+    # 3. Fallback: Cut at word boundary
     last_space = truncated.rfind(' ')
     if last_space > min_length:
         return truncated[:last_space] + '...'
-    
-    # 6. Final fallback: Hard truncate
+
+    # 4. Final fallback: Hard truncate
     return truncated + '...'
 
+
+def generate_excerpt(
+    content: str,
+    max_length: int = 200,
+    min_length: int = 50,
+    preserve_paragraphs: bool = False
+) -> str:
+    """
+    Generate a readable excerpt from HTML or plain text content
+
+    Args:
+        content: The full content (HTML or plain text)
+        max_length: Maximum excerpt length
+        min_length: Minimum excerpt length before adding ellipsis
+        preserve_paragraphs: Try to keep paragraph structure
+
+    Returns:
+        Generated excerpt string
+    """
+    if not content:
+        return ""
+    return _truncate(_visible_text(content, max_length), max_length, min_length)
+
+
+def generate_excerpts(
+    contents: Iterable[Optional[str]],
+    max_length: int = 200,
+    min_length: int = 50
+) -> List[str]:
+    """Generate excerpts for many documents at once (backfills, imports); None gives ""."""
+    return [
+        _truncate(_visible_text(content, max_length), max_length, min_length) if content else ""
+        for content in contents
+    ]
+
+
 def generate_excerpt_from_html(
     html_content: str,
     max_length: int = 200,
@@ -72,17 +181,14 @@ def generate_excerpt_from_html(
 ) -> str:
     """Specialized generator for HTML content"""
     if preserve_first_paragraph:
-        # Extract first paragraph
-        first_p_match = re.search(r'<p[^>]*>(.*?)</p>', html_content, re.DOTALL)
+        # Excerpt of the first paragraph only
+        first_p_match = _FIRST_PARAGRAPH.search(html_content)
         if first_p_match:
-            first_p = first_p_match.group(1)
-            # Remove inner HTML tags from the paragraph
-            clean_p = re.sub(r'<[^>]+>', '', first_p)
-            clean_p = re.sub(r'\s+', ' ', clean_p).strip()
-            
-            if len(clean_p) <= max_length:
-                return clean_p
-            return generate_excerpt(clean_p, max_length)
-    
+            # Inline markup inside the paragraph does not split words: Hel<b>lo</b> is "Hello"
+            clean_p = _visible_text(
+                html_content, max_length, start=first_p_match.end(), stop_tag="p", tag_space=False
+            )
+            return _truncate(clean_p, max_length, 50)
+
     # Fallback to regular generation
-    return generate_excerpt(html_content, max_length)
\ No newline at end of file
+    return generate_excerpt(html_content, max_length)
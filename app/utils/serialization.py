@@ -0,0 +1,36 @@
+from functools import lru_cache
+from typing import Any, Iterable, List, Type
+
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+
+
+@lru_cache(maxsize=None)
+def list_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    """Return a cached TypeAdapter for List[model]; building one compiles a schema."""
+    return TypeAdapter(List[model])
+
+
+def validate_rows(model: Type[BaseModel], rows: Iterable[Any]) -> List[BaseModel]:
+    """Build `model` instances from ORM objects or Row tuples in one pydantic-core call."""
+    return list_adapter(model).validate_python(rows, from_attributes=True)
+
+
+def dump_rows_json(model: Type[BaseModel], rows: Iterable[Any]) -> bytes:
+    """Serialize ORM objects or Row tuples to a JSON array of `model`."""
+    adapter = list_adapter(model)
+    return adapter.dump_json(adapter.validate_python(rows, from_attributes=True))
+
+
+def json_list_response(model: Type[BaseModel], rows: Iterable[Any], status_code: int = 200) -> Response:
+    """
+    Fast path for list endpoints
+
+    FastAPI's response_model handling dumps every ORM object to a dict,
+    validates the dicts against the response model, converts the result back
+    to Python primitives and finally runs json.dumps. Here the rows are read
+    through from_attributes and written straight to JSON bytes by pydantic-core,
+    with one validation pass. Keep response_model on the route for the
+    OpenAPI schema.
+    """
+    return Response(content=dump_rows_json(model, rows), status_code=status_code, media_type="application/json")
@@ -0,0 +1,191 @@
+# benchmarks/bench_compression.py | Response compression: bytes on the wire and CPU per request
+"""
+Measure what each content coding costs and saves on the main read routes.
+
+Usage:
+    python -m benchmarks.bench_compression [--news 200] [--requests 200]
+
+Seeds a throwaway SQLite database with articles of realistic HTML size, then
+requests (in-process, ASGI transport) the news list, a news detail and the
+item list with each Accept-Encoding: identity, gzip, br and zstd (the last
+two only if brotli / zstandard are installed). Reported per route and coding:
+
+  wire bytes   size of the body as sent (before the client decodes it)
+  ratio        wire bytes / identity bytes
+  cpu us/req   process CPU time per request, averaged over --requests
+
+News list and detail are served from the response cache, which keeps one
+compressed body per coding; the "uncached" rows clear the cache before every
+request to show what compressing (and querying) each time would cost. Every
+compressed body is decoded and compared with the identity body.
+
+Before that, each codec compresses two streams chunk by chunk, alternating
+between them (as two concurrent streamed responses would), and both must
+decode to their input: streams of a codec must not share state.
+"""
+import argparse
+import asyncio
+import gzip
+import os
+import random
+import shutil
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Tuple
+from uuid import UUID
+
+WORKDIR = tempfile.mkdtemp(prefix="pasci-bench-")
+
+# Must be set before the app (and its settings) are imported
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{os.path.join(WORKDIR, 'compression.db')}"
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+os.environ.setdefault("STORAGE_BACKEND", "local")
+# Shedding would turn a tight benchmark loop into 503s
+os.environ.setdefault("CONCURRENCY_LIMIT_ENABLED", "false")
+
+import httpx  # noqa: E402
+from sqlalchemy import insert  # noqa: E402
+
+from app.database.session import create_db_and_tables, engine  # noqa: E402
+from app.models.items import Item  # noqa: E402
+from app.models.news import News  # noqa: E402
+from app.services.news_cache import invalidate_news_cache  # noqa: E402
+from app.utils import compression  # noqa: E402
+from app.utils.preview_text_generator import generate_excerpt  # noqa: E402
+
+WORDS = ("CRASC", "atelier", "formation", "Abidjan", "projet", "citoyen", "gouvernance", "participation")
+
+
+def decode(encoding: str, body: bytes) -> bytes:
+  if encoding == "gzip":
+    return gzip.decompress(body)
+  if encoding == "br":
+    return compression.brotli.decompress(body)
+  if encoding == "zstd":
+    return compression.zstandard.ZstdDecompressor().decompressobj().decompress(body)
+  return body
+
+
+def check_interleaved_streams(rng: random.Random) -> None:
+  """Compress two streams in alternation with every available codec; raise if either does not decode."""
+  codecs = compression.build_codecs(["gzip", "br", "zstd"])
+  inputs = [
+    [" ".join(rng.choice(WORDS) for _ in range(rng.randint(50, 500))).encode() for _ in range(20)] for _ in range(2)
+  ]
+  for codec in codecs:
+    streams = [codec.stream(), codec.stream()]
+    outputs = [b"", b""]
+    for chunks in zip(*inputs):
+      for index, chunk in enumerate(chunks):
+        outputs[index] += streams[index].compress(chunk)
+    for index, stream in enumerate(streams):
+      outputs[index] += stream.finish()
+      assert decode(codec.encoding, outputs[index]) == b"".join(inputs[index]), (
+        f"{codec.encoding}: interleaved stream {index} does not decode"
+      )
+    # One-shot compression between stream chunks must not disturb them either
+    body = b"".join(inputs[0])
+    assert decode(codec.encoding, codec.compress(body)) == body, f"{codec.encoding}: body does not decode"
+  print(f"interleaved streams decode: {', '.join(codec.encoding for codec in codecs)}")
+
+
+async def seed(news: int, rng: random.Random) -> str:
+  await create_db_and_tables()
+  now = datetime.now(timezone.utc)
+  news_rows = []
+  for i in range(news):
+    paragraphs = (
+      "<p>" + " ".join(rng.choice(WORDS) for _ in range(rng.randint(40, 120))) + "</p>" for _ in range(8)
+    )
+    content = "<h2>Compte rendu</h2>" + "".join(paragraphs)
+    created = now - timedelta(minutes=i)
+    news_rows.append({
+      "id": UUID(int=rng.getrandbits(128), version=4), "title": f"Article {i}", "content": content,
+      "preview_text": generate_excerpt(content), "image_url": f"https://ik.example/pasci/{i}.webp",
+      "publication_date": created, "is_published": True, "status": "published",
+      "created_at": created, "updated_at": created,
+    })
+  item_rows = [
+    {"name": f"Article {i:05d}", "description": "Kit de formation " * 4, "price": round(rng.uniform(1, 500), 2)}
+    for i in range(500)
+  ]
+  async with engine.begin() as connection:
+    await connection.execute(insert(News.__table__), news_rows)
+    await connection.execute(insert(Item.__table__), item_rows)
+  return str(news_rows[0]["id"])
+
+
+async def fetch(client: httpx.AsyncClient, path: str, encoding: str) -> Tuple[bytes, Optional[str]]:
+  """Return the body as sent on the wire and its Content-Encoding."""
+  async with client.stream("GET", path, headers={"Accept-Encoding": encoding}) as response:
+    response.raise_for_status()
+    body = b"".join([chunk async for chunk in response.aiter_raw()])
+    return body, response.headers.get("content-encoding")
+
+
+async def measure(
+  client: httpx.AsyncClient, path: str, encoding: str, requests: int, uncached: bool
+) -> Tuple[int, float]:
+  """Return (wire bytes, CPU microseconds per request)."""
+  body, _ = await fetch(client, path, encoding)
+  started = time.process_time()
+  for _ in range(requests):
+    if uncached:
+      invalidate_news_cache()
+    await fetch(client, path, encoding)
+  return len(body), (time.process_time() - started) / requests * 1e6
+
+
+async def main_async(args) -> None:
+  rng = random.Random(args.seed)
+  check_interleaved_streams(rng)
+  news_id = await seed(args.news, rng)
+
+  from app.main import app
+
+  encodings = ["identity", "gzip"]
+  if compression.brotli is not None:
+    encodings.append("br")
+  if compression.zstandard is not None:
+    encodings.append("zstd")
+
+  routes: List[Tuple[str, str, bool]] = [
+    ("news list (limit 100)", "/api/v1/news/?limit=100", False),
+    ("news list, uncached", "/api/v1/news/?limit=100", True),
+    ("news detail", f"/api/v1/news/{news_id}", False),
+    ("news detail, uncached", f"/api/v1/news/{news_id}", True),
+    ("items list (limit 100)", "/api/v1/items/?limit=100", False),
+  ]
+
+  transport = httpx.ASGITransport(app=app)
+  async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+    print(f"{'route':<26}{'coding':<10}{'wire bytes':>12}{'ratio':>8}{'cpu us/req':>12}")
+    for label, path, uncached in routes:
+      identity, _ = await fetch(client, path, "identity")
+      for encoding in encodings:
+        if encoding != "identity":
+          body, sent_encoding = await fetch(client, path, encoding)
+          assert sent_encoding == encoding, f"{path}: asked for {encoding}, got {sent_encoding}"
+          assert decode(encoding, body) == identity, f"{path}: {encoding} body does not decode"
+        size, cpu = await measure(client, path, encoding, args.requests, uncached)
+        ratio = size / len(identity)
+        print(f"{label:<26}{encoding:<10}{size:>12}{ratio:>8.2f}{cpu:>12.0f}")
+
+  await engine.dispose()
+
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument("--news", type=int, default=200, help="Articles to seed")
+  parser.add_argument("--requests", type=int, default=200, help="Requests per route and coding")
+  parser.add_argument("--seed", type=int, default=42, help="Random seed for the generated data")
+  args = parser.parse_args()
+  try:
+    asyncio.run(main_async(args))
+  finally:
+    shutil.rmtree(WORKDIR, ignore_errors=True)
+
+
+if __name__ == "__main__":
+  main()
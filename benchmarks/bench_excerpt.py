@@ -0,0 +1,124 @@
+# benchmarks/bench_excerpt.py | Excerpt generation on large articles
+"""
+Compare the bounded tokenizer in app.utils.preview_text_generator with the
+previous regex implementation (kept below as legacy_*).
+
+Usage:
+    python -m benchmarks.bench_excerpt [--sizes 2000 100000 1000000] [--repeat 20]
+
+For each article size (characters of HTML) the best time per call of
+--repeat runs is reported for generate_excerpt and generate_excerpt_from_html,
+plus the batch API over 1000 documents. Outputs of both implementations are
+compared on inputs without entities or scripts, where they must agree: whole
+articles, and random paragraphs where inline tags split words (Hel<b>lo</b>).
+"""
+import argparse
+import random
+import re
+import time
+from typing import Callable, List
+
+from app.utils.preview_text_generator import generate_excerpt, generate_excerpt_from_html, generate_excerpts
+
+WORDS = ("Le", "CRASC", "organise", "un", "atelier", "de", "formation", "à", "Abidjan", "pour", "les",
+         "organisations", "citoyennes.", "Inscriptions", "ouvertes,", "places", "limitées!", "Pourquoi?")
+
+
+def legacy_generate_excerpt(content: str, max_length: int = 200, min_length: int = 50) -> str:
+  if not content:
+    return ""
+  clean_content = re.sub(r'<[^>]+>', ' ', content)
+  clean_content = re.sub(r'\s+', ' ', clean_content).strip()
+  if len(clean_content) <= max_length:
+    return clean_content
+  truncated = clean_content[:max_length]
+  for indicator, offset in [('. ', 1), ('! ', 1), ('? ', 1), ('.', 0), ('!', 0), ('?', 0), (', ', 1), ('; ', 1)]:
+    last_pos = truncated.rfind(indicator)
+    if last_pos > min_length:
+      end_pos = last_pos + offset + 1 if offset > 0 else last_pos + 1
+      excerpt = truncated[:end_pos]
+      if not re.search(r'\b(Mr|Mrs|Ms|Dr|Prof|Sr|Jr)\.$', excerpt):
+        return excerpt
+  last_space = truncated.rfind(' ')
+  if last_space > min_length:
+    return truncated[:last_space] + '...'
+  return truncated + '...'
+
+
+def legacy_generate_excerpt_from_html(html_content: str, max_length: int = 200) -> str:
+  first_p_match = re.search(r'<p[^>]*>(.*?)</p>', html_content, re.DOTALL)
+  if first_p_match:
+    clean_p = re.sub(r'<[^>]+>', '', first_p_match.group(1))
+    clean_p = re.sub(r'\s+', ' ', clean_p).strip()
+    if len(clean_p) <= max_length:
+      return clean_p
+    return legacy_generate_excerpt(clean_p, max_length)
+  return legacy_generate_excerpt(html_content, max_length)
+
+
+def make_article(size: int, rng: random.Random) -> str:
+  """HTML made of paragraphs with inline markup, about `size` characters long."""
+  parts: List[str] = []
+  length = 0
+  while length < size:
+    words = [rng.choice(WORDS) for _ in range(rng.randint(20, 80))]
+    emphasis = rng.randrange(len(words))
+    words[emphasis] = f"<strong>{words[emphasis]}</strong>"
+    paragraph = f'<p class="lead">\n  {" ".join(words)}\n</p>\n'
+    parts.append(paragraph)
+    length += len(paragraph)
+  return "".join(parts)
+
+
+def best_time(func: Callable[[], object], repeat: int) -> float:
+  best = float("inf")
+  for _ in range(repeat):
+    started = time.perf_counter()
+    func()
+    best = min(best, time.perf_counter() - started)
+  return best
+
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument("--sizes", type=int, nargs="+", default=[2000, 100_000, 1_000_000])
+  parser.add_argument("--repeat", type=int, default=20)
+  args = parser.parse_args()
+  rng = random.Random(7)
+
+  # Outputs must match the old implementation on plain markup
+  for _ in range(500):
+    article = make_article(rng.randint(10, 3000), rng)
+    assert generate_excerpt(article) == legacy_generate_excerpt(article), article
+    assert generate_excerpt_from_html(article) == legacy_generate_excerpt_from_html(article), article
+  # generate_excerpt turns tags into spaces, the first-paragraph search joins the text around them
+  pieces = ("Hel", "lo", " ", "\n", "<b>", "</b>", "<em>", "</em>", '<a href="/x">', "</a>", "<br/>", *WORDS)
+  for _ in range(2000):
+    paragraph = "".join(rng.choice(pieces) for _ in range(rng.randint(0, 120)))
+    article = f"<h2>Titre</h2><p>{paragraph}</p><p>{rng.choice(WORDS)}</p>"
+    assert generate_excerpt(article) == legacy_generate_excerpt(article), article
+    assert generate_excerpt_from_html(article) == legacy_generate_excerpt_from_html(article), article
+
+  print(f"{'case':<34}{'size':>10}{'legacy us':>12}{'new us':>10}{'speedup':>9}")
+  for size in args.sizes:
+    article = make_article(size, rng)
+    cases = {
+      "generate_excerpt": (lambda: legacy_generate_excerpt(article), lambda: generate_excerpt(article)),
+      "generate_excerpt_from_html": (
+        lambda: legacy_generate_excerpt_from_html(article), lambda: generate_excerpt_from_html(article)
+      ),
+    }
+    for name, (legacy, new) in cases.items():
+      legacy_time = best_time(legacy, args.repeat)
+      new_time = best_time(new, args.repeat)
+      print(f"{name:<34}{size:>10}{legacy_time * 1e6:>12.1f}{new_time * 1e6:>10.1f}{legacy_time / new_time:>8.1f}x")
+
+  documents = [make_article(rng.randint(2000, 50_000), rng) for _ in range(1000)]
+  legacy_time = best_time(lambda: [legacy_generate_excerpt(document) for document in documents], 3)
+  new_time = best_time(lambda: generate_excerpts(documents), 3)
+  print(f"{'generate_excerpts (1000 docs)':<34}{'2k-50k':>10}{legacy_time * 1e6:>12.0f}{new_time * 1e6:>10.0f}"
+        f"{legacy_time / new_time:>8.1f}x")
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,141 @@
+# benchmarks/bench_items.py | Item catalog listing at scale
+"""
+Seed a throwaway SQLite database with --items rows and time the listing.
+
+Usage:
+    python -m benchmarks.bench_items [--items 100000] [--repeat 20]
+
+Times GET /api/v1/items/ (in-process, ASGI transport) for each sort order,
+price-range and name-prefix filters, and a page deep into the listing
+reached with a keyset cursor, compared with the same page fetched with
+OFFSET. The SQLite query plan of each listing query is printed to show
+which index serves it.
+"""
+import argparse
+import asyncio
+import os
+import random
+import shutil
+import statistics
+import string
+import tempfile
+import time
+from typing import Awaitable, Callable, Dict
+
+WORKDIR = tempfile.mkdtemp(prefix="pasci-bench-")
+
+# Must be set before the app (and its settings) are imported
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{os.path.join(WORKDIR, 'items.db')}"
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+
+import httpx  # noqa: E402
+from sqlalchemy import insert, text  # noqa: E402
+from sqlmodel import select  # noqa: E402
+
+from app.database.session import create_db_and_tables, engine  # noqa: E402
+from app.models.items import Item  # noqa: E402
+
+SEED_BATCH = 5000
+
+
+async def seed(count: int, rng: random.Random) -> None:
+  await create_db_and_tables()
+  rows = [
+    {
+      "name": "".join(rng.choices(string.ascii_lowercase, k=rng.randint(6, 14))).capitalize(),
+      "description": "Article du catalogue",
+      "price": round(rng.uniform(1, 5000), 2),
+    }
+    for _ in range(count)
+  ]
+  async with engine.begin() as connection:
+    for start in range(0, count, SEED_BATCH):
+      await connection.execute(insert(Item.__table__), rows[start:start + SEED_BATCH])
+    await connection.execute(text("ANALYZE"))
+
+
+async def median_ms(func: Callable[[], Awaitable[object]], repeat: int) -> float:
+  timings = []
+  for _ in range(repeat):
+    started = time.perf_counter()
+    await func()
+    timings.append(time.perf_counter() - started)
+  return statistics.median(timings) * 1000
+
+
+async def get_ok(client: httpx.AsyncClient, params: Dict[str, object]) -> dict:
+  response = await client.get("/api/v1/items/", params=params)
+  response.raise_for_status()
+  return response.json()
+
+
+async def main_async(args) -> None:
+  rng = random.Random(args.seed)
+  started = time.perf_counter()
+  await seed(args.items, rng)
+  print(f"seeded {args.items} items in {time.perf_counter() - started:.1f}s\n")
+
+  from app.main import app
+
+  transport = httpx.ASGITransport(app=app)
+  async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+    cases = {
+      "sort=name": {"sort": "name"},
+      "sort=-price": {"sort": "-price"},
+      "price 100..150": {"min_price": 100, "max_price": 150, "sort": "price"},
+      "name_prefix=Ab": {"name_prefix": "Ab"},
+      "prefix + price": {"name_prefix": "Ab", "min_price": 2500},
+    }
+    print(f"{'case':<38}{'median ms':>10}")
+    for name, params in cases.items():
+      params = {"limit": 20, **params}
+      ms = await median_ms(lambda: get_ok(client, params), args.repeat)
+      print(f"{name:<38}{ms:>10.2f}")
+
+    # Walk to a deep page once, then time fetching the page after it both ways
+    depth = args.items // 2
+    cursor = None
+    for _ in range(depth // 100):
+      page = await get_ok(client, {"limit": 100, "sort": "price", **({"cursor": cursor} if cursor else {})})
+      cursor = page["next_cursor"]
+    keyset_ms = await median_ms(lambda: get_ok(client, {"limit": 20, "sort": "price", "cursor": cursor}), args.repeat)
+
+    offset_statement = select(Item.id, Item.name, Item.description, Item.price).order_by(
+      Item.price, Item.id
+    ).offset(depth).limit(21)
+
+    async def offset_page():
+      async with engine.connect() as connection:
+        return (await connection.execute(offset_statement)).all()
+
+    offset_ms = await median_ms(offset_page, args.repeat)
+    print(f"{f'page at row {depth} (cursor)':<38}{keyset_ms:>10.2f}")
+    print(f"{f'page at row {depth} (OFFSET, SQL only)':<38}{offset_ms:>10.2f}")
+
+  print("\nquery plans:")
+  async with engine.connect() as connection:
+    for label, where in (
+      ("sort=name", ""),
+      ("price range", "WHERE price >= 100 AND price <= 150"),
+      ("name prefix", "WHERE name >= 'Ab' AND name < 'Ac'"),
+    ):
+      order = "name, id" if label != "price range" else "price, id"
+      plan = await connection.execute(text(f"EXPLAIN QUERY PLAN SELECT * FROM item {where} ORDER BY {order} LIMIT 21"))
+      print(f"  {label:<14}" + " | ".join(row[-1] for row in plan))
+  await engine.dispose()
+
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument("--items", type=int, default=100_000, help="Items to seed")
+  parser.add_argument("--repeat", type=int, default=20, help="Requests per case (median reported)")
+  parser.add_argument("--seed", type=int, default=42, help="Random seed for the generated data")
+  args = parser.parse_args()
+  try:
+    asyncio.run(main_async(args))
+  finally:
+    shutil.rmtree(WORKDIR, ignore_errors=True)
+
+
+if __name__ == "__main__":
+  main()
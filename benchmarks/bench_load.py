@@ -0,0 +1,263 @@
+# benchmarks/bench_load.py | Load test of the main API routes
+"""
+Seed a throwaway SQLite database and drive the API with concurrent requests.
+
+Usage:
+    python -m benchmarks.bench_load [--mode asgi|uvicorn] [--users 1000] [--news 5000]
+                                    [--requests 500] [--concurrency 20] [--json out.json]
+
+--mode asgi    calls the app in-process through httpx's ASGI transport
+               (no sockets: measures the app itself);
+--mode uvicorn starts `uvicorn app.main:app` in a subprocess and talks to it
+               over a real socket.
+
+Scenarios: login, /users/me, the news list (first page) and news detail
+(random articles). The news routes are served from the response cache after
+the first request for a page, so news_list and news_detail mostly measure
+cache hits; in asgi mode news_list_uncached and news_detail_uncached clear the
+cache before every request to measure the query path. For each scenario the throughput, error count and p50/p95/p99
+latency are printed; --json writes them with the run settings and the git
+commit so runs can be compared between commits. The data is deterministic
+for a given --seed. Login is bound by bcrypt (PASSWORD_HASH_WORKERS).
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from uuid import UUID
+
+WORKDIR = tempfile.mkdtemp(prefix="pasci-bench-")
+DATABASE_URL = f"sqlite+aiosqlite:///{os.path.join(WORKDIR, 'bench.db')}"
+
+# Must be set before the app (and its settings) are imported
+os.environ["DATABASE_URL"] = DATABASE_URL
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+os.environ.setdefault("STORAGE_BACKEND", "local")
+
+import httpx  # noqa: E402
+from sqlalchemy import insert  # noqa: E402
+
+from app.database.session import create_db_and_tables, engine  # noqa: E402
+from app.models.news import News  # noqa: E402
+from app.models.users import User  # noqa: E402
+from app.utils.preview_text_generator import generate_excerpt  # noqa: E402
+
+PASSWORD = "benchmark-password"
+SEED_BATCH = 1000
+
+
+async def seed(users: int, news: int, rng: random.Random) -> Dict[str, List[Any]]:
+  """Create the schema and insert the users and news; return what the scenarios need."""
+  await create_db_and_tables()
+  # One bcrypt hash shared by every user: hashing thousands of passwords would dominate seeding
+  seeded_user = User(email="seed@example.org", password="")
+  seeded_user.set_password(PASSWORD)
+  password_hash = seeded_user.password
+
+  now = datetime.now(timezone.utc)
+  user_rows = [
+    {
+      "id": UUID(int=rng.getrandbits(128), version=4), "email": f"user{i}@example.org",
+      "username": f"user{i}", "email_normalized": f"user{i}@example.org", "username_normalized": f"user{i}",
+      "password": password_hash, "first_name": "Awa", "last_name": "Kouassi",
+      "is_active": True, "is_staff": False, "is_superuser": False, "date_joined": now,
+    }
+    for i in range(users)
+  ]
+  news_rows = []
+  for i in range(news):
+    content = "<p>" + " ".join(rng.choice(("CRASC", "atelier", "formation", "Abidjan", "projet", "citoyen"))
+                               for _ in range(200)) + "</p>"
+    created = now - timedelta(minutes=i)
+    news_rows.append({
+      "id": UUID(int=rng.getrandbits(128), version=4), "title": f"Article {i}", "content": content,
+      "preview_text": generate_excerpt(content), "publication_date": created, "is_published": True,
+      "status": "published", "created_at": created, "updated_at": created,
+    })
+
+  async with engine.begin() as connection:
+    for table, rows in ((User.__table__, user_rows), (News.__table__, news_rows)):
+      for start in range(0, len(rows), SEED_BATCH):
+        await connection.execute(insert(table), rows[start:start + SEED_BATCH])
+  return {"usernames": [row["username"] for row in user_rows], "news_ids": [str(row["id"]) for row in news_rows]}
+
+
+async def run_scenario(
+  request: Callable[[int], Awaitable[httpx.Response]], total: int, concurrency: int
+) -> Dict[str, Any]:
+  """Send `total` requests from `concurrency` workers; return throughput and latency percentiles."""
+  latencies: List[float] = []
+  errors = 0
+  next_index = 0
+
+  async def worker() -> None:
+    nonlocal errors, next_index
+    while next_index < total:
+      index = next_index
+      next_index += 1
+      started = time.perf_counter()
+      response = await request(index)
+      latencies.append(time.perf_counter() - started)
+      if response.status_code >= 400:
+        errors += 1
+
+  started = time.perf_counter()
+  await asyncio.gather(*(worker() for _ in range(concurrency)))
+  elapsed = time.perf_counter() - started
+  cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+  return {
+    "requests": total,
+    "errors": errors,
+    "seconds": elapsed,
+    "requests_per_second": total / elapsed,
+    "p50_ms": cuts[49] * 1000,
+    "p95_ms": cuts[94] * 1000,
+    "p99_ms": cuts[98] * 1000,
+  }
+
+
+async def run_all(client: httpx.AsyncClient, data: Dict[str, List[Any]], args, rng: random.Random) -> Dict[str, Any]:
+  usernames, news_ids = data["usernames"], data["news_ids"]
+  response = await client.post("/api/v1/auth/login", data={"username": usernames[0], "password": PASSWORD})
+  response.raise_for_status()
+  auth = {"Authorization": f"Bearer {response.json()['access_token']}"}
+  detail_ids = [rng.choice(news_ids) for _ in range(args.requests)]
+
+  scenarios: Dict[str, Callable[[int], Awaitable[httpx.Response]]] = {
+    "login": lambda i: client.post(
+      "/api/v1/auth/login", data={"username": usernames[i % len(usernames)], "password": PASSWORD}
+    ),
+    "users_me": lambda i: client.get("/api/v1/users/me", headers=auth),
+    "news_list": lambda i: client.get("/api/v1/news/", params={"limit": 20}),
+    "news_detail": lambda i: client.get(f"/api/v1/news/{detail_ids[i]}"),
+  }
+  if args.mode == "asgi":
+    # The cache lives in the app's process, so it can only be cleared in-process
+    from app.services.news_cache import invalidate_news_cache
+
+    def uncached(request: Callable[[int], Awaitable[httpx.Response]]) -> Callable[[int], Awaitable[httpx.Response]]:
+      def send(i: int) -> Awaitable[httpx.Response]:
+        invalidate_news_cache()
+        return request(i)
+      return send
+
+    scenarios["news_list_uncached"] = uncached(scenarios["news_list"])
+    scenarios["news_detail_uncached"] = uncached(scenarios["news_detail"])
+  results = {}
+  for name, request in scenarios.items():
+    if args.only and name not in args.only:
+      continue
+    # Login is ~100x slower than the rest; keep its run proportionate
+    total = max(args.requests // 10, args.concurrency) if name == "login" else args.requests
+    if args.warmup:
+      await run_scenario(request, min(args.warmup, total), args.concurrency)
+    results[name] = await run_scenario(request, total, args.concurrency)
+  return results
+
+
+def free_port() -> int:
+  with socket.socket() as probe:
+    probe.bind(("127.0.0.1", 0))
+    return probe.getsockname()[1]
+
+
+async def wait_for_server(client: httpx.AsyncClient, process: subprocess.Popen, timeout: float = 30.0) -> None:
+  deadline = time.monotonic() + timeout
+  while time.monotonic() < deadline:
+    if process.poll() is not None:
+      raise RuntimeError("uvicorn exited before accepting connections")
+    try:
+      await client.get("/metrics")
+      return
+    except httpx.TransportError:
+      await asyncio.sleep(0.1)
+  raise RuntimeError("uvicorn did not start in time")
+
+
+async def main_async(args) -> Dict[str, Any]:
+  rng = random.Random(args.seed)
+  data = await seed(args.users, args.news, rng)
+  # The app gets its own connections (and uvicorn its own process) from here on
+  await engine.dispose()
+  limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+
+  if args.mode == "asgi":
+    from app.main import app
+
+    async with app.router.lifespan_context(app):
+      transport = httpx.ASGITransport(app=app)
+      async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        return await run_all(client, data, args, rng)
+
+  port = free_port()
+  process = subprocess.Popen(
+    [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+     "--log-level", "warning", "--no-access-log"],
+    env=dict(os.environ),
+  )
+  try:
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=60) as client:
+      await wait_for_server(client, process)
+      return await run_all(client, data, args, rng)
+  finally:
+    process.terminate()
+    process.wait(timeout=10)
+
+
+def git_commit() -> Optional[str]:
+  try:
+    return subprocess.run(
+      ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+    ).stdout.strip()
+  except (OSError, subprocess.CalledProcessError):
+    return None
+
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument("--mode", choices=("asgi", "uvicorn"), default="asgi")
+  parser.add_argument("--users", type=int, default=1000, help="Users to seed")
+  parser.add_argument("--news", type=int, default=5000, help="News articles to seed")
+  parser.add_argument("--requests", type=int, default=500, help="Requests per scenario (login runs a tenth)")
+  parser.add_argument("--concurrency", type=int, default=20, help="Requests in flight at once")
+  parser.add_argument("--warmup", type=int, default=50, help="Unmeasured requests before each scenario")
+  parser.add_argument("--seed", type=int, default=42, help="Random seed for the generated data")
+  parser.add_argument("--only", nargs="*", help="Scenarios to run (default: all)")
+  parser.add_argument("--json", dest="json_path", help="Also write the results to this file")
+  args = parser.parse_args()
+
+  try:
+    results = asyncio.run(main_async(args))
+  finally:
+    shutil.rmtree(WORKDIR, ignore_errors=True)
+
+  print(f"mode={args.mode} users={args.users} news={args.news} concurrency={args.concurrency}")
+  print(f"{'scenario':<22}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}")
+  for name, result in results.items():
+    print(f"{name:<22}{result['requests_per_second']:>10.1f}{result['p50_ms']:>10.2f}"
+          f"{result['p95_ms']:>10.2f}{result['p99_ms']:>10.2f}{result['errors']:>8}")
+  if args.mode == "uvicorn" and any(name in results for name in ("news_list", "news_detail")):
+    print("news_list and news_detail are mostly response cache hits (uncached variants need --mode asgi)")
+
+  if args.json_path:
+    with open(args.json_path, "w") as output:
+      json.dump({
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "settings": {key: value for key, value in vars(args).items() if key != "json_path"},
+        "results": results,
+      }, output, indent=2)
+
+
+if __name__ == "__main__":
+  main()
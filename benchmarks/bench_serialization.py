@@ -0,0 +1,89 @@
+# benchmarks/bench_serialization.py | response_model path vs pydantic-core fast path
+"""
+Compare FastAPI's response_model serialization with json_list_response.
+
+Usage:
+    python -m benchmarks.bench_serialization [--sizes 1000 10000] [--repeat 5]
+
+Both paths start from ORM objects (User and News instances) and end with the
+JSON bytes sent on the wire. Reported times are the best of --repeat runs.
+"""
+import argparse
+import asyncio
+import os
+import time
+from datetime import datetime, timezone
+from typing import List
+from uuid import uuid4
+
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_model_field  # noqa: E402
+
+from app.models.news import News  # noqa: E402
+from app.models.users import User  # noqa: E402
+from app.schemas.news import NewsRead  # noqa: E402
+from app.schemas.users import UserRead  # noqa: E402
+from app.utils.serialization import json_list_response  # noqa: E402
+
+
+def make_users(count: int) -> List[User]:
+  now = datetime.now(timezone.utc)
+  return [
+    User(id=uuid4(), email=f"user{i}@example.org", username=f"user{i}", password="x" * 60,
+         first_name="Awa", last_name="Kouassi", date_joined=now, bio="Membre du CRASC " * 5)
+    for i in range(count)
+  ]
+
+
+def make_news(count: int) -> List[News]:
+  now = datetime.now(timezone.utc)
+  return [
+    News(id=uuid4(), title=f"Article {i}", content="<p>" + "Lorem ipsum dolor sit amet. " * 40 + "</p>",
+         preview_text="Lorem ipsum dolor sit amet.", image_url="https://ik.imagekit.io/pasci/a.jpg",
+         created_at=now, updated_at=now)
+    for i in range(count)
+  ]
+
+
+async def fastapi_path(model, rows) -> bytes:
+  field = create_model_field(name="Response", type_=List[model], mode="serialization")
+  content = await serialize_response(field=field, response_content=rows)
+  return JSONResponse(content).body
+
+
+async def fast_path(model, rows) -> bytes:
+  return json_list_response(model, rows).body
+
+
+async def best_of(repeat: int, func, *args) -> float:
+  timings = []
+  for _ in range(repeat):
+    started = time.perf_counter()
+    await func(*args)
+    timings.append(time.perf_counter() - started)
+  return min(timings)
+
+
+async def main() -> None:
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+  parser.add_argument("--repeat", type=int, default=5)
+  args = parser.parse_args()
+
+  print(f"{'payload':<16}{'rows':>8}{'response_model ms':>20}{'fast path ms':>15}{'speedup':>9}")
+  for label, model, factory in (("UserRead", UserRead, make_users), ("NewsRead", NewsRead, make_news)):
+    for size in args.sizes:
+      rows = factory(size)
+      # warm up schema compilation on both paths
+      await fastapi_path(model, rows[:10])
+      await fast_path(model, rows[:10])
+      slow = await best_of(args.repeat, fastapi_path, model, rows)
+      fast = await best_of(args.repeat, fast_path, model, rows)
+      print(f"{label:<16}{size:>8}{slow * 1000:>20.1f}{fast * 1000:>15.1f}{slow / fast:>8.1f}x")
+
+
+if __name__ == "__main__":
+  asyncio.run(main())
@@ -0,0 +1,109 @@
+# benchmarks/bench_startup.py | Cold-start cost: import time and lifespan startup
+"""
+Measure how long a fresh worker takes to become ready.
+
+Usage:
+    python -m benchmarks.bench_startup [--runs 5] [--top 15] [--json out.json]
+
+Each run is a new interpreter:
+  * `python -X importtime -c "import app.main"` gives the total import time
+    and the slowest modules (cumulative microseconds, self included);
+  * a second process enters the app lifespan and times startup alone.
+Medians over the runs are reported.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+STARTUP_SNIPPET = """
+import asyncio, time
+from app.main import app
+
+async def main():
+  started = time.perf_counter()
+  async with app.router.lifespan_context(app):
+    print(time.perf_counter() - started)
+
+asyncio.run(main())
+"""
+
+
+def child_env() -> Dict[str, str]:
+  env = dict(os.environ)
+  env.setdefault("SECRET_KEY", "benchmark-secret")
+  env.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+  return env
+
+
+def import_profile() -> Tuple[float, Dict[str, float]]:
+  """Return (total seconds for app.main, {module: cumulative seconds}) from one -X importtime run."""
+  completed = subprocess.run(
+    [sys.executable, "-X", "importtime", "-c", "import app.main"],
+    capture_output=True, text=True, env=child_env(), check=True,
+  )
+  modules: Dict[str, float] = {}
+  for line in completed.stderr.splitlines():
+    # import time: self [us] | cumulative | imported package
+    if not line.startswith("import time:") or "cumulative" in line:
+      continue
+    _, cumulative, name = line[len("import time:"):].split("|")
+    # A module is only reported once; the indentation shows its depth
+    modules[name.strip()] = int(cumulative) / 1e6
+  return modules.get("app.main", 0.0), modules
+
+
+def startup_time() -> float:
+  completed = subprocess.run(
+    [sys.executable, "-c", STARTUP_SNIPPET],
+    capture_output=True, text=True, env=child_env(), check=True,
+  )
+  return float(completed.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters to start")
+  parser.add_argument("--top", type=int, default=15, help="Slowest modules to list")
+  parser.add_argument("--json", dest="json_path", help="Also write the results to this file")
+  args = parser.parse_args()
+
+  totals: List[float] = []
+  startups: List[float] = []
+  per_module: Dict[str, List[float]] = defaultdict(list)
+  for _ in range(args.runs):
+    total, modules = import_profile()
+    totals.append(total)
+    for name, seconds in modules.items():
+      per_module[name].append(seconds)
+    startups.append(startup_time())
+
+  slowest = sorted(
+    ((name, statistics.median(values)) for name, values in per_module.items()),
+    key=lambda item: item[1], reverse=True,
+  )[:args.top]
+
+  print(f"import app.main  median {statistics.median(totals) * 1000:8.1f} ms  (runs: {args.runs})")
+  print(f"lifespan startup median {statistics.median(startups) * 1000:8.1f} ms")
+  print(f"\n{'module':<50}{'cumulative ms':>15}")
+  for name, seconds in slowest:
+    print(f"{name:<50}{seconds * 1000:>15.1f}")
+
+  if args.json_path:
+    with open(args.json_path, "w") as output:
+      json.dump({
+        "runs": args.runs,
+        "import_seconds_median": statistics.median(totals),
+        "import_seconds": totals,
+        "startup_seconds_median": statistics.median(startups),
+        "startup_seconds": startups,
+        "slowest_modules": [{"module": name, "cumulative_seconds": seconds} for name, seconds in slowest],
+      }, output, indent=2)
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,64 @@
+# benchmarks/bench_tokens.py | Token verifications per second
+"""
+Measure the per-request cost of JWT verification.
+
+Usage:
+    python -m benchmarks.bench_tokens [--seconds 2]
+
+Compares python-jose, the native HMAC verifier, and the verifier with its
+claims cache warm (the steady state for a client reusing one token).
+"""
+import argparse
+import os
+import time
+
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+
+from jose import jwt  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.core.security import create_access_token  # noqa: E402
+from app.core.tokens import TokenVerifier, decode_hmac_jwt  # noqa: E402
+
+
+def rate(func, seconds: float) -> float:
+  """Call func repeatedly for about `seconds` and return calls per second."""
+  calls = 0
+  started = time.perf_counter()
+  deadline = started + seconds
+  while True:
+    for _ in range(200):
+      func()
+    calls += 200
+    now = time.perf_counter()
+    if now >= deadline:
+      return calls / (now - started)
+
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument("--seconds", type=float, default=2.0, help="Duration of each measurement")
+  args = parser.parse_args()
+
+  token = create_access_token(data={"sub": "5b6f2a3e-0c1d-4e5f-8a9b-0c1d2e3f4a5b"})
+  key = settings.SECRET_KEY
+  algorithms = [settings.ALGORITHM]
+
+  cached = TokenVerifier("native", cache_size=1000)
+  cached.verify(token, "access")
+
+  cases = {
+    "python-jose decode": lambda: jwt.decode(token, key, algorithms=algorithms),
+    "native HMAC decode": lambda: decode_hmac_jwt(token, key, algorithms),
+    "TokenVerifier (cache hit)": lambda: cached.verify(token, "access"),
+  }
+  baseline = None
+  print(f"{'case':<28}{'verifications/s':>18}{'us/call':>10}{'speedup':>9}")
+  for name, func in cases.items():
+    per_second = rate(func, args.seconds)
+    baseline = baseline or per_second
+    print(f"{name:<28}{per_second:>18,.0f}{1e6 / per_second:>10.2f}{per_second / baseline:>8.1f}x")
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,110 @@
+import asyncio
+from logging.config import fileConfig
+
+from sqlalchemy import pool
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import async_engine_from_config
+
+from alembic import context
+from sqlmodel import SQLModel
+
+from app.database.session import async_database_url
+import app.models.news  # noqa: F401  (register tables on SQLModel.metadata)
+import app.models.users  # noqa: F401
+import app.models.items  # noqa: F401
+
+# this is the Alembic Config object, which provides
+# access to the values within the .ini file in use.
+config = context.config
+
+# Interpret the config file for Python logging.
+# This line sets up loggers basically.
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+# The database URL comes from Settings (DATABASE_URL), like the application
+if async_database_url:
+    config.set_main_option("sqlalchemy.url", async_database_url.replace("%", "%%"))
+
+target_metadata = SQLModel.metadata
+
+# Model indexes created on PostgreSQL only (Index.ddl_if), which autogenerate does not know about
+POSTGRESQL_ONLY_INDEXES = {"ix_item_name_pattern"}
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    """Leave out of autogenerate the objects it cannot compare correctly."""
+    # The SQLite FTS5 table and its shadow tables (news_fts_data, news_fts_idx...),
+    # created with raw DDL (see app.models.news.NEWS_SEARCH_DDL)
+    if type_ == "table" and name.startswith("news_fts"):
+        return False
+    if type_ == "index" and name in POSTGRESQL_ONLY_INDEXES:
+        return context.get_context().dialect.name == "postgresql"
+    return True
+
+# other values from the config, defined by the needs of env.py,
+# can be acquired:
+# my_important_option = config.get_main_option("my_important_option")
+# ... etc.
+
+
+def run_migrations_offline() -> None:
+    """Run migrations in 'offline' mode.
+
+    This configures the context with just a URL
+    and not an Engine, though an Engine is acceptable
+    here as well.  By skipping the Engine creation
+    we don't even need a DBAPI to be available.
+
+    Calls to context.execute() here emit the given string to the
+    script output.
+
+    """
+    url = config.get_main_option("sqlalchemy.url")
+    context.configure(
+        url=url,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        include_object=include_object,
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def do_run_migrations(connection: Connection) -> None:
+    context.configure(connection=connection, target_metadata=target_metadata, include_object=include_object)
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+async def run_async_migrations() -> None:
+    """In this scenario we need to create an Engine
+    and associate a connection with the context.
+
+    """
+
+    connectable = async_engine_from_config(
+        config.get_section(config.config_ini_section, {}),
+        prefix="sqlalchemy.",
+        poolclass=pool.NullPool,
+    )
+
+    async with connectable.connect() as connection:
+        await connection.run_sync(do_run_migrations)
+
+    await connectable.dispose()
+
+
+def run_migrations_online() -> None:
+    """Run migrations in 'online' mode."""
+
+    asyncio.run(run_async_migrations())
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,72 @@
+"""Baseline schema: user and news tables
+
+Revision ID: 0001_baseline
+Revises:
+Create Date: 2026-10-18 10:00:00.000000
+
+Databases created before migrations were introduced already have these
+tables; mark them as up to date with `alembic stamp 0001_baseline`.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001_baseline"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "user",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("email", sqlmodel.sql.sqltypes.AutoString(length=255), nullable=False),
+        sa.Column("username", sqlmodel.sql.sqltypes.AutoString(length=150), nullable=True),
+        sa.Column("password", sqlmodel.sql.sqltypes.AutoString(length=255), nullable=False),
+        sa.Column("first_name", sqlmodel.sql.sqltypes.AutoString(length=150), nullable=True),
+        sa.Column("last_name", sqlmodel.sql.sqltypes.AutoString(length=150), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("is_staff", sa.Boolean(), nullable=False),
+        sa.Column("is_superuser", sa.Boolean(), nullable=False),
+        sa.Column("date_joined", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("last_login", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("avatar", sqlmodel.sql.sqltypes.AutoString(length=500), nullable=True),
+        sa.Column("bio", sa.Text(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_user_email", "user", ["email"], unique=True)
+    op.create_index("ix_user_id", "user", ["id"], unique=False)
+    op.create_index("ix_user_username", "user", ["username"], unique=True)
+
+    op.create_table(
+        "news",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("title", sqlmodel.sql.sqltypes.AutoString(length=250), nullable=False),
+        sa.Column("content", sa.String(), nullable=True),
+        sa.Column("preview_text", sa.String(), nullable=True),
+        sa.Column("author", sqlmodel.sql.sqltypes.AutoString(length=100), nullable=True),
+        sa.Column("publication_date", sa.DateTime(), nullable=True),
+        sa.Column("image_url", sqlmodel.sql.sqltypes.AutoString(length=2048), nullable=True),
+        sa.Column("is_published", sa.Boolean(), nullable=False),
+        sa.Column("status", sqlmodel.sql.sqltypes.AutoString(length=20), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_news_id", "news", ["id"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_news_id", table_name="news")
+    op.drop_table("news")
+    op.drop_index("ix_user_username", table_name="user")
+    op.drop_index("ix_user_id", table_name="user")
+    op.drop_index("ix_user_email", table_name="user")
+    op.drop_table("user")
@@ -0,0 +1,71 @@
+"""Full-text search over news title and content
+
+Revision ID: 0003_news_search
+Revises: 0002_news_keyset_index
+Create Date: 2026-10-18 10:10:00.000000
+
+PostgreSQL: a generated (always up to date) tsvector column with a GIN index.
+SQLite: an FTS5 table kept in sync by triggers. Its rows share the rowid of
+their news row, which is how the triggers find them (news_id is UNINDEXED).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003_news_search"
+down_revision: Union[str, Sequence[str], None] = "0002_news_keyset_index"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        # Adding a stored generated column rewrites the table once
+        op.execute(
+            """
+            ALTER TABLE news ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+                setweight(to_tsvector('french', coalesce(title, '')), 'A') ||
+                setweight(to_tsvector('french', coalesce(content, '')), 'B')
+            ) STORED
+            """
+        )
+        with op.get_context().autocommit_block():
+            op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_news_search_vector ON news USING gin (search_vector)")
+    elif dialect == "sqlite":
+        op.execute(
+            "CREATE VIRTUAL TABLE news_fts USING fts5("
+            "news_id UNINDEXED, title, content, tokenize = 'unicode61 remove_diacritics 2')"
+        )
+        op.execute(
+            "CREATE TRIGGER news_fts_ai AFTER INSERT ON news BEGIN "
+            "INSERT INTO news_fts (rowid, news_id, title, content) "
+            "VALUES (new.rowid, new.id, new.title, new.content); END"
+        )
+        op.execute(
+            "CREATE TRIGGER news_fts_ad AFTER DELETE ON news BEGIN "
+            "DELETE FROM news_fts WHERE rowid = old.rowid AND news_id = old.id; END"
+        )
+        op.execute(
+            "CREATE TRIGGER news_fts_au AFTER UPDATE OF title, content ON news BEGIN "
+            "UPDATE news_fts SET title = new.title, content = new.content "
+            "WHERE rowid = old.rowid AND news_id = old.id; END"
+        )
+        op.execute("INSERT INTO news_fts (rowid, news_id, title, content) SELECT rowid, id, title, content FROM news")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_news_search_vector")
+        op.execute("ALTER TABLE news DROP COLUMN IF EXISTS search_vector")
+    elif dialect == "sqlite":
+        for trigger in ("news_fts_ai", "news_fts_ad", "news_fts_au"):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS news_fts")
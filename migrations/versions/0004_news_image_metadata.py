@@ -0,0 +1,36 @@
+"""Image variant URL, dimensions and placeholder on news
+
+Revision ID: 0004_news_image_metadata
+Revises: 0003_news_search
+Create Date: 2026-10-18 10:15:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004_news_image_metadata"
+down_revision: Union[str, Sequence[str], None] = "0003_news_search"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Nullable columns without defaults: no table rewrite; existing rows simply have no metadata
+    op.add_column("news", sa.Column("image_avif_url", sqlmodel.sql.sqltypes.AutoString(length=2048), nullable=True))
+    op.add_column("news", sa.Column("image_width", sa.Integer(), nullable=True))
+    op.add_column("news", sa.Column("image_height", sa.Integer(), nullable=True))
+    op.add_column("news", sa.Column("image_placeholder", sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("news", "image_placeholder")
+    op.drop_column("news", "image_height")
+    op.drop_column("news", "image_width")
+    op.drop_column("news", "image_avif_url")
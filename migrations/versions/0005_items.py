@@ -0,0 +1,47 @@
+"""Item table with indexes for the catalog listing
+
+Revision ID: 0005_items
+Revises: 0004_news_image_metadata
+Create Date: 2026-10-18 10:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005_items"
+down_revision: Union[str, Sequence[str], None] = "0004_news_image_metadata"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "item",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sqlmodel.sql.sqltypes.AutoString(length=255), nullable=False),
+        sa.Column("description", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("price", sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_item_price_id", "item", ["price", "id"], unique=False)
+    op.create_index("ix_item_name_id", "item", ["name", "id"], unique=False)
+    if op.get_context().dialect.name == "postgresql":
+        # Byte-order index for the name prefix filter (see app.models.items)
+        op.create_index(
+            "ix_item_name_pattern", "item", ["name"], unique=False, postgresql_ops={"name": "text_pattern_ops"}
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_context().dialect.name == "postgresql":
+        op.drop_index("ix_item_name_pattern", table_name="item")
+    op.drop_index("ix_item_name_id", table_name="item")
+    op.drop_index("ix_item_price_id", table_name="item")
+    op.drop_table("item")
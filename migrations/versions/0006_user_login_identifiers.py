@@ -0,0 +1,75 @@
+"""Normalized (lowercased) login identifiers on user
+
+Revision ID: 0006_user_login_identifiers
+Revises: 0005_items
+Create Date: 2026-10-18 10:25:00.000000
+
+Adds email_normalized / username_normalized, backfills them from the
+existing rows and makes them unique. Fails before creating the indexes if
+two accounts only differ by case; merge or rename those first.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0006_user_login_identifiers"
+down_revision: Union[str, Sequence[str], None] = "0005_items"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+user_table = sa.table(
+    "user",
+    sa.column("email", sa.String),
+    sa.column("username", sa.String),
+    sa.column("email_normalized", sa.String),
+    sa.column("username_normalized", sa.String),
+)
+
+
+def _check_unique(column_name: str) -> None:
+    if op.get_context().as_sql:
+        return  # Offline (--sql) mode: nothing to query; the unique index would fail instead
+    column = user_table.c[column_name]
+    duplicates = op.get_bind().execute(
+        sa.select(column, sa.func.count())
+        .where(column.is_not(None))
+        .group_by(column)
+        .having(sa.func.count() > 1)
+    ).all()
+    if duplicates:
+        listed = ", ".join(f"{value!r} ({count} accounts)" for value, count in duplicates[:20])
+        raise RuntimeError(f"Cannot make {column_name} unique, these values are shared: {listed}")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("user", sa.Column("email_normalized", sqlmodel.sql.sqltypes.AutoString(length=255), nullable=True))
+    op.add_column("user", sa.Column("username_normalized", sqlmodel.sql.sqltypes.AutoString(length=150), nullable=True))
+
+    # Same normalization as app.models.users.normalize_identifier (ASCII case folding on SQLite)
+    op.execute(
+        user_table.update().values(
+            email_normalized=sa.func.lower(sa.func.trim(user_table.c.email)),
+            username_normalized=sa.func.lower(sa.func.trim(user_table.c.username)),
+        )
+    )
+    _check_unique("email_normalized")
+    _check_unique("username_normalized")
+
+    op.create_index(op.f("ix_user_email_normalized"), "user", ["email_normalized"], unique=True)
+    op.create_index(op.f("ix_user_username_normalized"), "user", ["username_normalized"], unique=True)
+    with op.batch_alter_table("user") as batch_op:
+        batch_op.alter_column("email_normalized", existing_type=sqlmodel.sql.sqltypes.AutoString(length=255), nullable=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_user_username_normalized"), table_name="user")
+    op.drop_index(op.f("ix_user_email_normalized"), table_name="user")
+    with op.batch_alter_table("user") as batch_op:
+        batch_op.drop_column("username_normalized")
+        batch_op.drop_column("email_normalized")
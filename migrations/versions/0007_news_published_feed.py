@@ -0,0 +1,56 @@
+"""Partial indexes for the published news feed and the scheduled publisher
+
+Revision ID: 0007_news_published_feed
+Revises: 0006_user_login_identifiers
+Create Date: 2026-10-18 10:30:00.000000
+
+Both indexes only cover the rows their query reads: published articles for
+the feed, drafts for the publisher. Archived articles are in neither.
+
+publication_date used to default to the creation time, so every existing
+draft has one in the past and the scheduled publisher would publish them
+all. Only drafts given a publication_date from now on are scheduled.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0007_news_published_feed"
+down_revision: Union[str, Sequence[str], None] = "0006_user_login_identifiers"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Same predicates as app.models.news.IS_PUBLISHED / IS_DRAFT
+is_published = sa.column("is_published", sa.Boolean) == sa.true()
+is_draft = sa.and_(
+    sa.column("is_published", sa.Boolean) == sa.false(),
+    sa.column("status", sa.String) == sa.literal_column("'draft'"),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing drafts stay drafts. Not restored on downgrade: nothing read the
+    # publication_date of drafts before this revision
+    news = sa.table("news", sa.column("publication_date", sa.DateTime))
+    op.execute(news.update().where(is_draft).values(publication_date=None))
+
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_news_published_feed", "news", ["publication_date", "id"], unique=False,
+            postgresql_where=is_published, sqlite_where=is_published, postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_news_draft_publication_date", "news", ["publication_date"], unique=False,
+            postgresql_where=is_draft, sqlite_where=is_draft, postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_news_draft_publication_date", table_name="news")
+    op.drop_index("ix_news_published_feed", table_name="news")